@@ -0,0 +1,177 @@
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from database.migrations import index_exists
+
+# A scratch copy of the appointments columns the list queries touch; the real table is never written
+BENCH_TABLE = "appointments_bench"
+
+CREATE_BENCH_TABLE = f"""
+CREATE TABLE {BENCH_TABLE} (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    customer_id INT NOT NULL,
+    staff_id INT NULL,
+    service_type VARCHAR(100) NOT NULL,
+    appointment_date DATETIME NOT NULL,
+    duration_minutes INT NULL,
+    status VARCHAR(20) NOT NULL,
+    notes TEXT
+)
+"""
+
+COMPOSITE_INDEXES = [
+    ('idx_bench_status_date', '(status, appointment_date)'),
+    ('idx_bench_staff_date', '(staff_id, appointment_date)'),
+    ('idx_bench_customer_date', '(customer_id, appointment_date)'),
+]
+
+STATUSES = ['Pending', 'Approved', 'Completed', 'Cancelled']
+SERVICES = ["Grooming", "Vet Check-up", "Vaccination", "Spa", "Training"]
+
+ACTIVE = "status IN ('Pending', 'Approved')"
+
+# name -> (old predicate, new predicate); both select the same rows. DATE() is compared
+# with date parameters, the ranges with datetimes, so neither side relies on coercion
+QUERIES = {
+    'day list': (
+        f"DATE(appointment_date) = %(date)s AND {ACTIVE}",
+        f"appointment_date >= %(day)s AND appointment_date < %(next_day)s AND {ACTIVE}",
+    ),
+    'week by staff': (
+        f"DATE(appointment_date) BETWEEN %(date)s AND %(week_end)s AND {ACTIVE} AND staff_id = %(staff_id)s",
+        f"appointment_date >= %(day)s AND appointment_date < %(week_after)s AND {ACTIVE} "
+        f"AND staff_id = %(staff_id)s",
+    ),
+    'upcoming for customer': (
+        f"customer_id = %(customer_id)s AND DATE(appointment_date) BETWEEN %(date)s AND %(week_end)s AND {ACTIVE}",
+        f"customer_id = %(customer_id)s AND appointment_date >= %(day)s "
+        f"AND appointment_date < %(week_after)s AND {ACTIVE}",
+    ),
+    'month stats': (
+        "DATE(appointment_date) BETWEEN %(date)s AND %(month_end)s",
+        "appointment_date >= %(day)s AND appointment_date < %(month_after)s",
+    ),
+}
+
+
+def statement(db, sql, params=None):
+    # EXPLAIN and ANALYZE return rows that execute_query would leave unread
+    with db.transaction() as cursor:
+        cursor.execute(sql, params or ())
+        return cursor.fetchall() if cursor.with_rows else []
+
+
+def seed(db, rows, days=730, staff=20, customers=5000, batch_size=5000):
+    db.execute_query(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    db.execute_query(CREATE_BENCH_TABLE)
+    db.execute_query(f"CREATE INDEX idx_bench_date ON {BENCH_TABLE} (appointment_date)")
+    first = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days // 2)
+    rng = random.Random(42)
+    query = (f"INSERT INTO {BENCH_TABLE} (customer_id, staff_id, service_type, appointment_date, "
+             "duration_minutes, status, notes) VALUES (%s, %s, %s, %s, %s, %s, %s)")
+    written = 0
+    while written < rows:
+        batch = []
+        for _ in range(min(batch_size, rows - written)):
+            start = first + timedelta(days=rng.randrange(days), hours=rng.randrange(9, 17),
+                                      minutes=rng.choice((0, 30)))
+            batch.append((rng.randint(1, customers), rng.choice([None] + list(range(1, staff + 1))),
+                          rng.choice(SERVICES), start, rng.choice((15, 30, 60, 90)),
+                          rng.choice(STATUSES), ''))
+        if db.execute_many(query, batch) is False:
+            raise RuntimeError("seeding the benchmark table failed")
+        written += len(batch)
+        print(f"  seeded {written}/{rows}", end='\r')
+    print()
+    statement(db, f"ANALYZE TABLE {BENCH_TABLE}")
+
+
+def parameters():
+    day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        'date': day.date(),
+        'day': day,
+        'next_day': day + timedelta(days=1),
+        'week_end': (day + timedelta(days=6)).date(),
+        'week_after': day + timedelta(days=7),
+        'month_end': (day + timedelta(days=29)).date(),
+        'month_after': day + timedelta(days=30),
+        'staff_id': 7,
+        'customer_id': 1234,
+    }
+
+
+def explain(db, where, params):
+    plan = statement(db, f"EXPLAIN SELECT * FROM {BENCH_TABLE} WHERE {where}", params)
+    if getattr(db, 'backend', 'mysql') == 'sqlite':
+        # EXPLAIN QUERY PLAN: one line per step, e.g. "SEARCH ... USING INDEX ..."
+        return "; ".join(row['detail'] for row in plan)
+    row = plan[0] if plan else {}
+    return f"type={row.get('type')} key={row.get('key')} rows={row.get('rows')}"
+
+
+def time_query(db, where, params, runs):
+    timings = []
+    count = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = db.execute_query(f"SELECT * FROM {BENCH_TABLE} WHERE {where}", params)
+        timings.append((time.perf_counter() - started) * 1000)
+        if result is False:
+            raise RuntimeError(f"benchmark query failed: {where}")
+        count = len(result)
+    return statistics.median(timings), count
+
+
+def run(db, runs):
+    params = parameters()
+    for name, (old, new) in QUERIES.items():
+        counts = []
+        for label, where in (('DATE()', old), ('range', new)):
+            median, count = time_query(db, where, params, runs)
+            counts.append(count)
+            print(f"  {name:<22} {label:<7} {median:9.2f} ms  {count:>6} rows  {explain(db, where, params)}")
+        # Timings are only comparable if both predicates found the same appointments
+        if counts[0] != counts[1]:
+            raise RuntimeError(f"'{name}': DATE() matched {counts[0]} rows but the range matched {counts[1]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare DATE() filters with half-open ranges on a seeded appointments table, "
+                    "before and after the composite indexes")
+    parser.add_argument('--rows', type=int, default=500000, help="appointments to seed (default 500000)")
+    parser.add_argument('--runs', type=int, default=5, help="timed runs per query; the median is shown")
+    parser.add_argument('--reuse', action='store_true', help="keep an already seeded table")
+    parser.add_argument('--keep', action='store_true', help="leave the table behind afterwards")
+    args = parser.parse_args(argv)
+
+    from database.db_connection import DatabaseConnection
+    db = DatabaseConnection()
+    try:
+        # Inside the try, so a seed that fails half way does not leave a partial table behind
+        if not args.reuse:
+            print(f"Seeding {args.rows} appointments into {BENCH_TABLE}...")
+            seed(db, args.rows)
+        else:
+            # Start from the pre-change state even if a kept table still has the indexes
+            for index, columns in COMPOSITE_INDEXES:
+                if index_exists(db, BENCH_TABLE, index):
+                    statement(db, f"DROP INDEX {index} ON {BENCH_TABLE}")
+
+        print("Before (appointment_date index only):")
+        run(db, args.runs)
+        for index, columns in COMPOSITE_INDEXES:
+            db.execute_query(f"CREATE INDEX {index} ON {BENCH_TABLE} {columns}")
+        statement(db, f"ANALYZE TABLE {BENCH_TABLE}")
+        print("After (composite indexes added):")
+        run(db, args.runs)
+    finally:
+        if not args.keep:
+            db.execute_query(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+
+
+if __name__ == '__main__':
+    main()
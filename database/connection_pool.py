@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Fixed-size pool of database connections with checkout/return semantics"""
+
+    def __init__(self, factory, size=5, timeout=30.0, idle_check_after=60.0, validate=None):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.idle_check_after = idle_check_after
+        self.validate = validate or (lambda connection: connection.is_connected())
+
+        self._idle = deque()  # (connection, returned_at)
+        self._created = 0
+        self._condition = threading.Condition()
+
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._replaced = 0
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = started + timeout if timeout is not None else None
+        waited = False
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    # Reserve the slot now, open the connection outside the lock
+                    self._created += 1
+                    connection, returned_at = None, None
+                    break
+
+                waited = True
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(pool size {self.size})"
+                    )
+                self._condition.wait(remaining)
+
+        try:
+            if connection is None:
+                connection = self.factory()
+            elif time.monotonic() - returned_at > self.idle_check_after:
+                connection = self._check_idle(connection)
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._condition:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            self._total_wait += elapsed
+            self._max_wait = max(self._max_wait, elapsed)
+        return connection
+
+    def release(self, connection, discard=False):
+        with self._condition:
+            if discard or connection is None:
+                self._created -= 1
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        connection = self.acquire(timeout)
+        discard = False
+        try:
+            yield connection
+        except Exception:
+            # A connection that failed mid-use may be broken; let the next
+            # checkout decide instead of trusting it blindly.
+            discard = not self._is_alive(connection)
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def _check_idle(self, connection):
+        # Only connections that sat idle long enough get a round trip
+        if self._is_alive(connection):
+            return connection
+        self._close_quietly(connection)
+        with self._condition:
+            self._replaced += 1
+        return self.factory()
+
+    def _is_alive(self, connection):
+        try:
+            return bool(self.validate(connection))
+        except Exception:
+            return False
+
+    def _close_quietly(self, connection):
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'size': self.size,
+                'open': self._created,
+                'idle': idle,
+                'in_use': self._created - idle,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'replaced': self._replaced,
+                'total_wait_ms': self._total_wait * 1000,
+                'avg_wait_ms': (self._total_wait / self._checkouts * 1000) if self._checkouts else 0.0,
+                'max_wait_ms': self._max_wait * 1000,
+            }
+
+    def close_all(self):
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._created -= 1
+                self._close_quietly(connection)
+            self._condition.notify_all()
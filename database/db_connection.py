@@ -1,96 +1,253 @@
-import mysql.connector
-from mysql.connector import Error
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+from database.query_stats import QueryStats, caller_tag
+from database import migrations
 
 load_dotenv()
 
+# The driver is imported on first connect (see load_driver) to keep it off the startup
+# path. Until then nothing can raise a driver error, so this stand-in is never hit
+mysql = None
+
+class Error(Exception):
+    pass
+
+def load_driver(backend='mysql'):
+    global mysql, Error
+    if backend == 'sqlite':
+        # Single-till shops: an embedded database file instead of a MySQL server
+        from database import sqlite_backend
+        Error = sqlite_backend.Error
+        return sqlite_backend
+    if mysql is None:
+        import mysql.connector
+        Error = mysql.connector.Error
+    return mysql.connector
+
 class DatabaseConnection:
     _instance = None
-    
+    _instance_lock = threading.Lock()
+
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            cls._instance.connection = None
-            cls._instance.connect()
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super(DatabaseConnection, cls).__new__(cls)
+                instance.pool = None
+                instance.backend = os.getenv('DB_BACKEND', 'mysql').lower()
+                instance._connected = False
+                instance._connect_lock = threading.RLock()
+                instance.query_stats = QueryStats(
+                    slow_threshold_ms=float(os.getenv('DB_SLOW_QUERY_MS', '250')),
+                    slow_log_path=os.getenv('DB_SLOW_QUERY_LOG', 'slow_queries.log')
+                )
+                cls._instance = instance
         return cls._instance
-    
+
+    def ensure_connected(self):
+        # Connect on first use, so constructing the singleton stays cheap; callers racing
+        # the first connect wait for it instead of opening a second pool. A failed connect
+        # leaves nothing behind, so the next call tries again
+        if self._connected:
+            return True
+        with self._connect_lock:
+            if not self._connected:
+                self.connect()
+        return self._connected
+
+    def _checked_pool(self):
+        if not self.ensure_connected():
+            raise Error("Not connected to the database")
+        return self.pool
+
+    def _open_connection(self):
+        if self.backend == 'sqlite':
+            return load_driver('sqlite').connect(
+                os.getenv('DB_PATH', 'cuddle_corner.db'),
+                timeout=float(os.getenv('DB_POOL_TIMEOUT', '30'))
+            )
+        return load_driver().connect(
+            host=os.getenv('DB_HOST', 'localhost'),
+            user=os.getenv('DB_USER', 'root'),
+            password=os.getenv('DB_PASSWORD', ''),
+            database=os.getenv('DB_NAME', 'cuddle_corner'),
+            port=os.getenv('DB_PORT', '3306'),
+            autocommit=True
+        )
+
     def connect(self):
+        # Pool settings are tuned per till through the environment
+        self.pool = ConnectionPool(
+            self._open_connection,
+            size=int(os.getenv('DB_POOL_SIZE', '5')),
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', '30')),
+            idle_check_after=float(os.getenv('DB_POOL_IDLE_CHECK', '60'))
+        )
         try:
-            self.connection = mysql.connector.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                user=os.getenv('DB_USER', 'root'),
-                password=os.getenv('DB_PASSWORD', ''),
-                database=os.getenv('DB_NAME', 'cuddle_corner'),
-                port=os.getenv('DB_PORT', '3306')
-            )
-        except Error as e:
+            # Open the first connection eagerly so a missing database is created now
+            self.pool.release(self.pool.acquire())
+        except (Error, PoolTimeoutError) as e:
+            if self.backend == 'sqlite':
+                # The file is created on open, so this is a real failure (permissions, disk)
+                print(f"Error opening database file: {e}")
             # Try to create database if it doesn't exist
-            self.create_database()
-    
+            elif self.create_database():
+                return True
+            self.pool.close_all()
+            self.pool = None
+            return False
+        # Live from here on, so the migrations can run their queries through the pool
+        self._connected = True
+        self._migrate()
+        return True
+
+    def _migrate(self):
+        # Bring the schema up to date; tables, columns and indexes all ship as migrations
+        try:
+            migrations.migrate(self)
+        except (Error, PoolTimeoutError, migrations.MigrationError) as e:
+            print(f"Error migrating database schema: {e}")
+
     def create_database(self):
         try:
-            temp_conn = mysql.connector.connect(
+            temp_conn = load_driver().connect(
                 host=os.getenv('DB_HOST', 'localhost'),
                 user=os.getenv('DB_USER', 'root'),
                 password=os.getenv('DB_PASSWORD', ''),
                 port=os.getenv('DB_PORT', '3306')
             )
             cursor = temp_conn.cursor()
-            
+
             # Create database
             cursor.execute("CREATE DATABASE IF NOT EXISTS cuddle_corner")
-            
-            # Use the database
-            cursor.execute("USE cuddle_corner")
-            
-            # Read and execute schema file
-            schema_file = os.path.join(os.path.dirname(__file__), 'schema.sql')
-            if os.path.exists(schema_file):
-                with open(schema_file, 'r') as file:
-                    schema_sql = file.read()
-                
-                # Execute each statement separately
-                for statement in schema_sql.split(';'):
-                    if statement.strip():
-                        cursor.execute(statement)
-            
+
             temp_conn.commit()
             cursor.close()
             temp_conn.close()
-            
-            # Reconnect with database
-            self.connect()
-            
-        except Error as e:
-            pass
-    
-    def get_connection(self):
-        if self.connection is None or not self.connection.is_connected():
-            self.connect()
-        return self.connection
-    
+
+            # Reconnect with database; the empty database gets schema.sql as migration 1
+            self.pool.release(self.pool.acquire())
+            self._connected = True
+            self._migrate()
+            return True
+
+        except (Error, PoolTimeoutError) as e:
+            print(f"Error connecting to database: {e}")
+            return False
+
+    def get_pool_stats(self):
+        return self._checked_pool().stats()
+
+    def dump_query_stats(self, path=None, limit=None):
+        return self.query_stats.dump(path, limit)
+
     def execute_query(self, query, params=None):
+        started = time.perf_counter()
+        rows = 0
         try:
-            connection = self.get_connection()
+            with self._checked_pool().connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                cursor.execute(query, params or ())
+
+                query_type = query.strip().upper()
+
+                # Pooled connections run in autocommit mode, so writes are
+                # already durable and reads never see a stale snapshot
+                if query_type.startswith('SELECT'):
+                    result = cursor.fetchall()
+                    rows = len(result)
+                else:
+                    rows = max(cursor.rowcount, 0)
+                    result = cursor.rowcount > 0
+                    if query_type.startswith('INSERT'):
+                        result = cursor.lastrowid or True
+
+                cursor.close()
+        except (Error, PoolTimeoutError) as e:
+            self.query_stats.record(query, time.perf_counter() - started,
+                                    caller=caller_tag(), error=e)
+            return False
+
+        self.query_stats.record(query, time.perf_counter() - started, rows, caller_tag())
+        return result
+
+    @contextmanager
+    def transaction(self):
+        # Run several statements atomically on one pooled connection: commits
+        # when the block finishes and rolls back if it raises
+        with self._checked_pool().connection() as connection:
+            connection.start_transaction()
             cursor = connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-        
-            query_type = query.strip().upper()
-        
-            if query_type.startswith('SELECT'):
-                result = cursor.fetchall()
-            else:
+            try:
+                yield cursor
                 connection.commit()
-                result = cursor.rowcount > 0
-                if query_type.startswith('INSERT'):
-                    result = cursor.lastrowid or True
-        
-            cursor.close()
-            return result
-        except Error:
+            except Exception:
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    def execute_many(self, query, seq_params):
+        # Bulk write in one transaction; multi-row INSERTs go out as a single statement
+        seq_params = list(seq_params)
+        if not seq_params:
+            return 0
+        started = time.perf_counter()
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(query, seq_params)
+                rowcount = cursor.rowcount
+        except (Error, PoolTimeoutError) as e:
+            self.query_stats.record(query, time.perf_counter() - started,
+                                    caller=caller_tag(), error=e)
             return False
-    
+
+        self.query_stats.record(query, time.perf_counter() - started, rowcount, caller_tag())
+        return rowcount
+
+    def iter_query(self, query, params=None, chunk_size=500):
+        # Stream a large SELECT in batches of rows through an unbuffered cursor,
+        # holding one pooled connection only for as long as the caller iterates.
+        # A failure part way through is raised to the caller after it is recorded
+        caller = caller_tag()
+        elapsed = 0.0
+        row_count = 0
+        try:
+            with self._checked_pool().connection() as connection:
+                cursor = connection.cursor(dictionary=True, buffered=False)
+                exhausted = False
+                try:
+                    # Only time spent on the wire counts, not the caller's work between batches
+                    started = time.perf_counter()
+                    cursor.execute(query, params or ())
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        elapsed += time.perf_counter() - started
+                        if not rows:
+                            exhausted = True
+                            break
+                        row_count += len(rows)
+                        yield rows
+                        started = time.perf_counter()
+                finally:
+                    if not exhausted:
+                        # Caller stopped early; drain the wire so the connection is reusable
+                        connection.consume_results()
+                    cursor.close()
+        except (Error, PoolTimeoutError) as e:
+            # Unlike execute_query this raises: rows already handed out would otherwise pass
+            # for a complete result
+            self.query_stats.record(query, elapsed, row_count, caller, error=e)
+            raise
+
+        self.query_stats.record(query, elapsed, row_count, caller)
+
     def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        if self.pool:
+            self.pool.close_all()
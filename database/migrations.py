@@ -0,0 +1,308 @@
+import argparse
+import os
+from database import rollups
+
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), 'schema.sql')
+
+CREATE_SCHEMA_VERSION = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class MigrationError(Exception):
+    pass
+
+
+def split_statements(sql):
+    """Split a SQL script on the semicolons that end statements, skipping quotes and comments"""
+    statements, current = [], []
+    quote = None
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            current.append(char)
+            if char == '\\' and i + 1 < len(sql):
+                current.append(sql[i + 1])
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in ("'", '"', '`'):
+            quote = char
+            current.append(char)
+        elif sql.startswith('-- ', i) or sql.startswith('--\n', i) or char == '#':
+            end = sql.find('\n', i)
+            i = len(sql) if end == -1 else end
+            continue
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = len(sql) if end == -1 else end + 2
+            continue
+        elif char == ';':
+            statements.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statements.append(''.join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def _run(db, *statements):
+    # Unlike execute_query, errors propagate so a failed step stops the migration
+    with db.transaction() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def _count(db, query, params):
+    result = db.execute_query(query, params)
+    if result is False:
+        raise MigrationError(f"could not read the schema: {query}")
+    return result[0]['n']
+
+
+def _sqlite(db):
+    return getattr(db, 'backend', 'mysql') == 'sqlite'
+
+
+def table_exists(db, table):
+    if _sqlite(db):
+        return _count(db, "SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'table' AND name = %s",
+                      (table,)) > 0
+    return _count(db, "SELECT COUNT(*) AS n FROM information_schema.TABLES "
+                      "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,)) > 0
+
+
+def column_exists(db, table, column):
+    if _sqlite(db):
+        return _count(db, "SELECT COUNT(*) AS n FROM pragma_table_info(%s) WHERE name = %s",
+                      (table, column)) > 0
+    return _count(db, "SELECT COUNT(*) AS n FROM information_schema.COLUMNS "
+                      "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+                  (table, column)) > 0
+
+
+def index_exists(db, table, index):
+    if _sqlite(db):
+        return _count(db, "SELECT COUNT(*) AS n FROM sqlite_master "
+                          "WHERE type = 'index' AND tbl_name = %s AND name = %s", (table, index)) > 0
+    return _count(db, "SELECT COUNT(*) AS n FROM information_schema.STATISTICS "
+                      "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+                  (table, index)) > 0
+
+
+# Steps check the live schema first, so a migration that stopped halfway can simply be run
+# again, and databases that were patched by hand end up in the same place
+
+def add_column(db, table, column, definition):
+    if not column_exists(db, table, column):
+        _run(db, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def rename_column(db, table, old, new, definition):
+    if column_exists(db, table, old) and not column_exists(db, table, new):
+        if _sqlite(db):
+            _run(db, f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}")
+        else:
+            # CHANGE rather than RENAME COLUMN, which older MySQL servers lack
+            _run(db, f"ALTER TABLE {table} CHANGE {old} {new} {definition}")
+
+
+def modify_column(db, table, column, definition):
+    if not column_exists(db, table, column):
+        return
+    if _sqlite(db):
+        with db.pool.connection() as connection:
+            connection.rebuild_column(table, column, definition)
+    else:
+        _run(db, f"ALTER TABLE {table} MODIFY {column} {definition}")
+
+
+def add_index(db, table, index, columns, unique=False):
+    if index_exists(db, table, index):
+        return
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if _sqlite(db):
+        _run(db, f"CREATE {kind} {index} ON {table} {columns}")
+        return
+    try:
+        # Built online, so the shop can keep reading and writing the table meanwhile
+        _run(db, f"ALTER TABLE {table} ADD {kind} {index} {columns}, ALGORITHM=INPLACE, LOCK=NONE")
+    except Exception as e:
+        print(f"Online build of {index} not possible ({e}); building it with a table lock")
+        _run(db, f"ALTER TABLE {table} ADD {kind} {index} {columns}")
+
+
+def _baseline(db):
+    with open(SCHEMA_FILE, 'r') as file:
+        _run(db, *split_statements(file.read()))
+
+
+def _match_model_columns(db):
+    # schema.sql predates the models: owners are customer_id, products count quantity, and
+    # statuses are the ones the panels offer
+    for table in ('cart', 'orders', 'adoption_requests', 'surrender_requests', 'appointments'):
+        rename_column(db, table, 'user_id', 'customer_id', "INT NOT NULL")
+    for table in ('cart', 'order_items'):
+        modify_column(db, table, 'item_type', "ENUM('pet', 'product') NULL")
+
+    add_column(db, 'orders', 'staff_id', "INT NULL")
+    add_column(db, 'orders', 'payment_status', "VARCHAR(20) DEFAULT 'Pending'")
+    add_column(db, 'orders', 'notes', "TEXT")
+    modify_column(db, 'orders', 'status', "ENUM('Pending', 'Confirmed', 'Shipped', 'Delivered', "
+                                          "'Completed', 'Cancelled') DEFAULT 'Pending'")
+
+    rename_column(db, 'products', 'stock_quantity', 'quantity', "INT NOT NULL DEFAULT 0")
+    add_column(db, 'products', 'reorder_level', "INT NOT NULL DEFAULT 5")
+
+    add_column(db, 'pets', 'vaccination_status', "VARCHAR(100)")
+    add_column(db, 'pets', 'created_by', "INT NULL")
+    modify_column(db, 'pets', 'gender', "ENUM('Male', 'Female', 'Unknown') NOT NULL")
+    modify_column(db, 'pets', 'status', "ENUM('Available', 'Sold', 'Reserved', 'Adopted', 'Pending', "
+                                        "'Not Available', 'Archived') DEFAULT 'Available'")
+
+    add_column(db, 'users', 'profile_image', "VARCHAR(255) NULL")
+    add_column(db, 'adoption_requests', 'approved_by', "INT NULL")
+    add_column(db, 'surrender_requests', 'approved_by', "INT NULL")
+    add_column(db, 'surrender_requests', 'pet_id', "INT NULL")
+    modify_column(db, 'surrender_requests', 'gender', "ENUM('Male', 'Female', 'Unknown') NULL")
+    modify_column(db, 'surrender_requests', 'status',
+                  "ENUM('Pending', 'Approved', 'Rejected', 'Completed', 'Cancelled') DEFAULT 'Pending'")
+
+    add_column(db, 'appointments', 'staff_id', "INT NULL")
+    # Through VARCHAR so the old statuses can be mapped before the new list is enforced
+    modify_column(db, 'appointments', 'status', "VARCHAR(20) NOT NULL DEFAULT 'Pending'")
+    _run(db, "UPDATE appointments SET status = 'Approved' WHERE status = 'Scheduled'",
+         "UPDATE appointments SET status = 'Cancelled' WHERE status = 'No-show'")
+    modify_column(db, 'appointments', 'status',
+                  "ENUM('Pending', 'Approved', 'Completed', 'Cancelled') NOT NULL DEFAULT 'Pending'")
+
+    _run(db, """
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        staff_id INT NOT NULL,
+        date DATE NOT NULL,
+        check_in DATETIME NULL,
+        check_out DATETIME NULL,
+        hours_worked DECIMAL(5,2) NULL,
+        FOREIGN KEY (staff_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    """)
+    add_index(db, 'attendance', 'idx_attendance_staff_date', '(staff_id, date)')
+
+
+def _product_sku(db):
+    add_column(db, 'products', 'sku', "VARCHAR(64) NULL")
+    add_index(db, 'products', 'idx_products_sku', '(sku)', unique=True)
+
+
+def _sales_rollups(db):
+    # Backfilled by migration 8, once order lines carry their category
+    rollups.ensure_tables(db)
+
+
+def _appointment_durations(db):
+    # Left NULL on old rows, which the scheduler reads as the default duration
+    add_column(db, 'appointments', 'duration_minutes', "INT NULL")
+
+
+def _appointment_indexes(db):
+    add_index(db, 'appointments', 'idx_appointments_status_date', '(status, appointment_date)')
+    add_index(db, 'appointments', 'idx_appointments_staff_date', '(staff_id, appointment_date)')
+    add_index(db, 'appointments', 'idx_appointments_customer_date', '(customer_id, appointment_date)')
+
+
+def _order_indexes(db):
+    # Order history pages by customer and date; sales reports scan dates, optionally by status
+    add_index(db, 'orders', 'idx_orders_order_date', '(order_date)')
+    add_index(db, 'orders', 'idx_orders_customer_date', '(customer_id, order_date, id)')
+    add_index(db, 'orders', 'idx_orders_status_date', '(status, order_date)')
+
+
+def _order_item_categories(db):
+    # Past lines take the product's current category, the best record there is of it;
+    # OrderModel writes the category at sale time from here on
+    add_column(db, 'order_items', 'category', "VARCHAR(100) NULL")
+    _run(db, """
+    UPDATE order_items SET category = (
+        SELECT p.category FROM products p WHERE p.id = order_items.product_id
+    ) WHERE product_id IS NOT NULL AND category IS NULL
+    """, "UPDATE order_items SET category = 'Pets' WHERE pet_id IS NOT NULL AND category IS NULL")
+    rollups.rebuild(db)
+
+
+# Applied in order and never edited once released; new changes get the next number
+MIGRATIONS = [
+    (1, "Baseline schema from schema.sql", _baseline),
+    (2, "Match column names and statuses used by the models", _match_model_columns),
+    (3, "Product SKU column and unique index", _product_sku),
+    (4, "Daily sales rollup tables", _sales_rollups),
+    (5, "Appointment durations", _appointment_durations),
+    (6, "Appointment status, staff and customer date indexes", _appointment_indexes),
+    (7, "Order date, customer and status indexes", _order_indexes),
+    (8, "Category snapshot on order lines", _order_item_categories),
+]
+
+
+def applied_versions(db):
+    _run(db, CREATE_SCHEMA_VERSION)
+    result = db.execute_query("SELECT version FROM schema_version")
+    if result is False:
+        raise MigrationError("could not read schema_version")
+    versions = {row['version'] for row in result}
+    if not versions and table_exists(db, 'users'):
+        # A database made before migrations existed already has the baseline tables
+        _record(db, *MIGRATIONS[0][:2])
+        versions.add(MIGRATIONS[0][0])
+    return versions
+
+
+def _record(db, version, description):
+    with db.transaction() as cursor:
+        cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                       (version, description))
+
+
+def pending(db):
+    versions = applied_versions(db)
+    return [migration for migration in MIGRATIONS if migration[0] not in versions]
+
+
+def migrate(db, target=None, log=print):
+    """Apply every pending migration up to target (default: all); returns how many ran"""
+    count = 0
+    for version, description, step in pending(db):
+        if target is not None and version > target:
+            break
+        log(f"Applying migration {version}: {description}")
+        step(db)
+        _record(db, version, description)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or apply database schema migrations")
+    parser.add_argument('command', nargs='?', choices=['status', 'migrate'], default='status')
+    parser.add_argument('--to', dest='target', type=int,
+                        help="stop after this version (migrate only); default: latest")
+    args = parser.parse_args(argv)
+
+    from database.db_connection import DatabaseConnection
+    db = DatabaseConnection()
+    if args.command == 'migrate':
+        count = migrate(db, args.target)
+        print(f"Applied {count} migration(s)")
+    versions = applied_versions(db)
+    for version, description, step in MIGRATIONS:
+        state = "applied" if version in versions else "pending"
+        print(f"{version:>4}  {state:<8} {description}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+def keyset_predicate(key_columns, after, descending=True):
+    # (a, b) < (x, y) spelled out as OR/AND so MySQL can range-scan the index
+    operator = '<' if descending else '>'
+    clauses = []
+    params = []
+    for position, column in enumerate(key_columns):
+        equalities = [f"{previous} = %s" for previous in key_columns[:position]]
+        clauses.append("(" + " AND ".join(equalities + [f"{column} {operator} %s"]) + ")")
+        params.extend(after[:position])
+        params.append(after[position])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def fetch_page(db, select_sql, key_columns, row_keys, conditions=(), params=(),
+               page_size=50, after=None, descending=True, count_table=None):
+    """Run one keyset page of select_sql and return rows plus the cursor for the next page
+
+    key_columns are the SQL expressions to order by (ending in a unique column),
+    row_keys the matching keys in the result rows. Pass count_table to also get a
+    total estimate for the filtered list.
+    """
+    conditions = list(conditions)
+    params = list(params)
+    filter_conditions, filter_params = list(conditions), list(params)
+
+    if after:
+        predicate, predicate_params = keyset_predicate(key_columns, after, descending)
+        conditions.append(predicate)
+        params.extend(predicate_params)
+
+    query = select_sql
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    direction = 'DESC' if descending else 'ASC'
+    query += " ORDER BY " + ", ".join(f"{column} {direction}" for column in key_columns)
+    # One extra row tells us whether another page exists without a COUNT
+    query += " LIMIT %s"
+    params.append(int(page_size) + 1)
+
+    rows = db.execute_query(query, tuple(params)) or []
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = tuple(rows[-1][key] for key in row_keys)
+
+    page = {'rows': rows, 'next_cursor': next_cursor, 'total': None}
+    if count_table:
+        page['total'] = estimate_total(db, count_table, filter_conditions, filter_params)
+    return page
+
+
+def estimate_total(db, from_sql, conditions=(), params=()):
+    # Unfiltered lists use the table statistics; filtered ones (and SQLite, which keeps
+    # no row estimate) need a real count
+    if not conditions and getattr(db, 'backend', 'mysql') == 'mysql':
+        table = from_sql.split()[0]
+        result = db.execute_query(
+            "SELECT TABLE_ROWS as total FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        if result and result[0]['total'] is not None:
+            return int(result[0]['total'])
+
+    query = f"SELECT COUNT(*) as total FROM {from_sql}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    result = db.execute_query(query, tuple(params))
+    return int(result[0]['total']) if result else None
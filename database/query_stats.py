@@ -0,0 +1,149 @@
+import logging
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)')
+_CASE_ARMS = re.compile(r'(?:WHEN (?:%s|\?) THEN (?:%s|\?) ?)+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query):
+    # Collapse literals and variable-length lists so one statement shape is one key
+    sql = _WHITESPACE.sub(' ', query).strip()
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    sql = _CASE_ARMS.sub('WHEN ... ', sql)
+    return sql
+
+
+def caller_tag(skip_module='database'):
+    # First frame outside the database layer, as "Class.method" or "module.function"
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not (module == skip_module or module.startswith(skip_module + '.')
+                or module == 'contextlib'):
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class _StatementStats:
+    __slots__ = ('calls', 'errors', 'rows', 'total', 'max', 'samples', 'callers')
+
+    def __init__(self, sample_size):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=sample_size)
+        self.callers = {}
+
+
+class QueryStats:
+    """Per-statement latency/row counters plus a slow-query log"""
+
+    def __init__(self, slow_threshold_ms=250, slow_log_path=None, sample_size=1024):
+        self.slow_threshold = slow_threshold_ms / 1000.0
+        self.sample_size = sample_size
+        self._statements = {}
+        self._lock = threading.Lock()
+
+        self.slow_log = logging.getLogger('cuddle_corner.slow_queries')
+        if slow_log_path and not self.slow_log.handlers:
+            # Opened on the first slow query, so a quiet till never creates the file
+            handler = logging.FileHandler(slow_log_path, encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self.slow_log.addHandler(handler)
+            self.slow_log.setLevel(logging.INFO)
+            self.slow_log.propagate = False
+
+    def record(self, query, elapsed, rows=0, caller=None, error=None):
+        key = normalize_sql(query)
+        caller = caller or 'unknown'
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = _StatementStats(self.sample_size)
+            stats.calls += 1
+            stats.rows += rows or 0
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.samples.append(elapsed)
+            stats.callers[caller] = stats.callers.get(caller, 0) + 1
+            if error is not None:
+                stats.errors += 1
+
+        if error is not None:
+            self.slow_log.warning("ERROR %s [%s] %s", caller, error, key)
+        elif elapsed >= self.slow_threshold:
+            self.slow_log.info("SLOW %.1fms rows=%s %s %s", elapsed * 1000, rows, caller, key)
+
+    def snapshot(self):
+        with self._lock:
+            items = [(key, stats.calls, stats.errors, stats.rows, stats.total,
+                      stats.max, sorted(stats.samples), dict(stats.callers))
+                     for key, stats in self._statements.items()]
+
+        report = []
+        for key, calls, errors, rows, total, max_elapsed, samples, callers in items:
+            report.append({
+                'statement': key,
+                'calls': calls,
+                'errors': errors,
+                'rows': rows,
+                'total_ms': total * 1000,
+                'avg_ms': total / calls * 1000,
+                'p50_ms': _percentile(samples, 0.50) * 1000,
+                'p95_ms': _percentile(samples, 0.95) * 1000,
+                'max_ms': max_elapsed * 1000,
+                'callers': callers,
+            })
+        report.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return report
+
+    def dump(self, path=None, limit=None):
+        report = self.snapshot()
+        if limit:
+            report = report[:limit]
+
+        lines = [f"Query stats as of {datetime.now():%Y-%m-%d %H:%M:%S}"]
+        for entry in report:
+            callers = ", ".join(f"{name} x{count}" for name, count in
+                                sorted(entry['callers'].items(), key=lambda item: -item[1]))
+            lines.append(
+                f"{entry['calls']:>7} calls {entry['total_ms']:>10.1f}ms total "
+                f"p50 {entry['p50_ms']:.1f}ms p95 {entry['p95_ms']:.1f}ms "
+                f"max {entry['max_ms']:.1f}ms rows {entry['rows']} errors {entry['errors']}"
+            )
+            lines.append(f"        {entry['statement']}")
+            lines.append(f"        from: {callers}")
+        text = "\n".join(lines) + "\n"
+
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        return text
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+
+def _percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
@@ -0,0 +1,118 @@
+import argparse
+from datetime import datetime, timedelta
+
+# Orders that count towards revenue; cancelled orders drop out of the rollup
+COUNTED_ORDER = "o.status <> 'Cancelled'"
+
+CREATE_DAILY_SALES = """
+CREATE TABLE IF NOT EXISTS daily_sales (
+    sales_date DATE NOT NULL,
+    payment_method VARCHAR(50) NOT NULL DEFAULT '',
+    order_count INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (sales_date, payment_method)
+)
+"""
+
+CREATE_DAILY_SALES_CATEGORIES = """
+CREATE TABLE IF NOT EXISTS daily_sales_categories (
+    sales_date DATE NOT NULL,
+    payment_method VARCHAR(50) NOT NULL DEFAULT '',
+    category VARCHAR(100) NOT NULL,
+    units INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (sales_date, payment_method, category)
+)
+"""
+
+ORDER_TOTALS_SELECT = f"""
+SELECT DATE(o.order_date), COALESCE(o.payment_method, ''),
+       {{sign}} * COUNT(*), {{sign}} * SUM(o.total_amount)
+FROM orders o
+WHERE {{where}} AND {COUNTED_ORDER}
+GROUP BY DATE(o.order_date), COALESCE(o.payment_method, '')
+"""
+
+# Grouped on the category each line was sold under, so recategorising a product later
+# does not move its past sales, and cancelling an old order takes back what it added
+CATEGORY_TOTALS_SELECT = f"""
+SELECT DATE(o.order_date), COALESCE(o.payment_method, ''),
+       COALESCE(oi.category, 'Pets'),
+       {{sign}} * SUM(oi.quantity), {{sign}} * SUM(oi.quantity * oi.unit_price)
+FROM orders o
+JOIN order_items oi ON oi.order_id = o.id
+WHERE {{where}} AND {COUNTED_ORDER}
+GROUP BY DATE(o.order_date), COALESCE(o.payment_method, ''), COALESCE(oi.category, 'Pets')
+"""
+
+
+def _upsert_statements(where, sign):
+    sales = (
+        "INSERT INTO daily_sales (sales_date, payment_method, order_count, revenue) "
+        + ORDER_TOTALS_SELECT.format(sign=sign, where=where)
+        + " ON DUPLICATE KEY UPDATE order_count = order_count + VALUES(order_count),"
+        " revenue = revenue + VALUES(revenue)"
+    )
+    categories = (
+        "INSERT INTO daily_sales_categories (sales_date, payment_method, category, units, revenue) "
+        + CATEGORY_TOTALS_SELECT.format(sign=sign, where=where)
+        + " ON DUPLICATE KEY UPDATE units = units + VALUES(units),"
+        " revenue = revenue + VALUES(revenue)"
+    )
+    return sales, categories
+
+
+def apply_order(cursor, order_id, sign):
+    # Add (sign=1) or remove (sign=-1) one order's contribution inside the caller's transaction
+    for statement in _upsert_statements("o.id = %s", int(sign)):
+        cursor.execute(statement, (order_id,))
+
+
+def ensure_tables(db):
+    # Returns True when the rollup tables had to be created (and so need a backfill)
+    existing = db.execute_query("SHOW TABLES LIKE 'daily_sales'")
+    with db.transaction() as cursor:
+        cursor.execute(CREATE_DAILY_SALES)
+        cursor.execute(CREATE_DAILY_SALES_CATEGORIES)
+    return not existing
+
+
+def rebuild(db, start_date=None, end_date=None):
+    # Recompute the rollup from raw orders, for the whole history or an inclusive date range
+    ensure_tables(db)
+
+    if start_date or end_date:
+        start = start_date or datetime(1970, 1, 1).date()
+        end = (end_date or datetime.now().date()) + timedelta(days=1)
+        delete_where, params = "sales_date >= %s AND sales_date < %s", (start, end)
+        order_where = "o.order_date >= %s AND o.order_date < %s"
+    else:
+        delete_where, params = "1 = 1", ()
+        order_where = "1 = 1"
+
+    with db.transaction() as cursor:
+        cursor.execute(f"DELETE FROM daily_sales WHERE {delete_where}", params)
+        cursor.execute(f"DELETE FROM daily_sales_categories WHERE {delete_where}", params)
+        for statement in _upsert_statements(order_where, 1):
+            cursor.execute(statement, params)
+
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill or rebuild the daily sales rollup")
+    parser.add_argument('--from', dest='start_date', type=_parse_date,
+                        help="first day to rebuild (YYYY-MM-DD); default: all history")
+    parser.add_argument('--to', dest='end_date', type=_parse_date,
+                        help="last day to rebuild (YYYY-MM-DD); default: today")
+    args = parser.parse_args(argv)
+
+    from database.db_connection import DatabaseConnection
+    rebuild(DatabaseConnection(), args.start_date, args.end_date)
+    print("Daily sales rollup rebuilt")
+
+
+if __name__ == '__main__':
+    main()
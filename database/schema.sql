@@ -1,4 +1,6 @@
 -- Cuddle Corner Pet Shop Database Schema
+-- Baseline (migration 1). Do not edit: later changes are numbered migrations in
+-- database/migrations.py, applied on connect or with python -m database.migrations migrate
 
 -- Users table for authentication and user management
 CREATE TABLE IF NOT EXISTS users (
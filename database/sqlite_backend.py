@@ -0,0 +1,337 @@
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+# Caught by DatabaseConnection in place of the MySQL driver's Error
+Error = sqlite3.Error
+
+# Readers never block the writer (or each other) in WAL mode; NORMAL sync is safe with WAL
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+]
+
+# Compiled statements kept per connection; translated query text is stable, so repeats hit it
+STATEMENT_CACHE_SIZE = 512
+
+
+# Values go in and come out as the MySQL driver would hand them over
+def _adapt_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _convert_datetime(raw):
+    text = raw.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _convert_date(raw):
+    text = raw.decode()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return text
+
+
+def _convert_decimal(raw):
+    try:
+        return Decimal(raw.decode())
+    except InvalidOperation:
+        return raw.decode()
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DECIMAL", _convert_decimal)
+
+
+_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\")", re.S)
+
+# Applied to the whole statement, string literals included
+STATEMENT_REWRITES = [
+    (re.compile(r"\bENUM\s*\((?:\s*'[^']*'\s*,?)*\)", re.I), "TEXT"),
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b", re.I), ""),
+    (re.compile(r"\bDEFAULT\s+CURRENT_TIMESTAMP\b", re.I), "DEFAULT (datetime('now', 'localtime'))"),
+]
+
+# Applied outside string literals only
+CODE_REWRITES = [
+    (re.compile(r"%\((\w+)\)s"), r":\1"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"%%"), "%"),
+    (re.compile(r"\bNOW\(\)", re.I), "datetime('now', 'localtime')"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "date('now', 'localtime')"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    # A write transaction already holds the database's only write lock
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    # Only takes effect outside a transaction; inside one, constraints stay enforced
+    (re.compile(r"\bSET\s+FOREIGN_KEY_CHECKS\s*=\s*(\d)", re.I), r"PRAGMA foreign_keys = \1"),
+    (re.compile(r"\bSHOW\s+TABLES\s+LIKE\b", re.I), "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE"),
+    (re.compile(r"\bANALYZE\s+TABLE\b", re.I), "ANALYZE"),
+    (re.compile(r"\bEXPLAIN\s+SELECT\b", re.I), "EXPLAIN QUERY PLAN SELECT"),
+    (re.compile(r"\bDROP\s+INDEX\s+(\w+)\s+ON\s+\w+", re.I), r"DROP INDEX IF EXISTS \1"),
+]
+
+_UPSERT = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I)
+_UPSERT_VALUE = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.I)
+
+
+def _matching_paren(sql, start):
+    # Index of the ')' closing the '(' at start, skipping string literals
+    depth = 0
+    i = start
+    while i < len(sql):
+        char = sql[i]
+        if char in ("'", '"'):
+            match = _LITERAL.match(sql, i)
+            i = match.end() if match else i + 1
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError(f"unbalanced parentheses in: {sql}")
+
+
+def split_top_level(text, separator=','):
+    """Split text on separators that are not inside parentheses or string literals"""
+    parts, depth, current = [], 0, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in ("'", '"'):
+            match = _LITERAL.match(text, i)
+            end = match.end() if match else i + 1
+            current.append(text[i:end])
+            i = end
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if depth == 0 and text.startswith(separator, i):
+            parts.append(''.join(current).strip())
+            current = []
+            i += len(separator)
+            continue
+        current.append(char)
+        i += 1
+    parts.append(''.join(current).strip())
+    return parts
+
+
+def _concat(arguments):
+    return "(" + " || ".join(arguments) + ")"
+
+
+def _group_concat(arguments):
+    # GROUP_CONCAT(expr [ORDER BY ...] [SEPARATOR 'x']); SQLite before 3.44 cannot order it
+    body = ", ".join(arguments)
+    separator = "','"
+    parts = re.split(r"\s+SEPARATOR\s+", body, flags=re.I)
+    if len(parts) == 2:
+        body, separator = parts
+    body = re.split(r"\s+ORDER\s+BY\s+", body, flags=re.I)[0]
+    return f"GROUP_CONCAT({body}, {separator})"
+
+
+FUNCTION_REWRITES = {'GROUP_CONCAT': _group_concat, 'CONCAT': _concat}
+_FUNCTION = re.compile(r"\b(GROUP_CONCAT|CONCAT)\s*\(", re.I)
+
+
+def _rewrite_functions(sql):
+    result = []
+    position = 0
+    for match in _FUNCTION.finditer(sql):
+        if match.start() < position or _inside_literal(sql, match.start()):
+            continue
+        opening = match.end() - 1
+        closing = _matching_paren(sql, opening)
+        arguments = [_rewrite_functions(argument) for argument in split_top_level(sql[opening + 1:closing])]
+        result.append(sql[position:match.start()])
+        result.append(FUNCTION_REWRITES[match.group(1).upper()](arguments))
+        position = closing + 1
+    result.append(sql[position:])
+    return ''.join(result)
+
+
+def _inside_literal(sql, index):
+    return any(match.start() < index < match.end() for match in _LITERAL.finditer(sql))
+
+
+@lru_cache(maxsize=1024)
+def translate(query):
+    """Rewrite a MySQL statement, as written throughout the models, for SQLite"""
+    for pattern, replacement in STATEMENT_REWRITES:
+        query = pattern.sub(replacement, query)
+    query = _rewrite_functions(query)
+
+    pieces = _LITERAL.split(query)
+    for index in range(0, len(pieces), 2):
+        for pattern, replacement in CODE_REWRITES:
+            pieces[index] = pattern.sub(replacement, pieces[index])
+    query = ''.join(pieces)
+
+    upsert = _UPSERT.search(query)
+    if upsert:
+        update = _UPSERT_VALUE.sub(r"excluded.\1", query[upsert.end():])
+        query = query[:upsert.start()] + "ON CONFLICT DO UPDATE SET" + update
+    return query
+
+
+def _params(params):
+    if params is None:
+        return ()
+    return params if isinstance(params, dict) else tuple(params)
+
+
+class SQLiteCursor:
+    """The slice of the MySQL cursor API that DatabaseConnection and the models use"""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self.dictionary = dictionary
+
+    def execute(self, query, params=None):
+        self._cursor.execute(translate(query), _params(params))
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate(query), [_params(params) for params in seq_params])
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def fetchmany(self, size):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """An SQLite file opened to behave like a pooled mysql.connector connection"""
+
+    def __init__(self, path, timeout=30.0):
+        # Autocommit unless a transaction is started; the pool hands a connection to one
+        # thread at a time, so it may move between threads
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in PRAGMAS:
+            self._connection.execute(pragma)
+
+    @property
+    def autocommit(self):
+        return self._connection.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self._connection.isolation_level = None if value else 'DEFERRED'
+
+    def cursor(self, dictionary=False, buffered=True):
+        return SQLiteCursor(self._connection, dictionary)
+
+    def start_transaction(self):
+        # Take the write lock up front so two writers never deadlock upgrading a read lock
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        try:
+            self._connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def consume_results(self):
+        # Results are read from the file on demand; there is nothing left on a wire
+        pass
+
+    def close(self):
+        self._connection.close()
+
+    def rebuild_column(self, table, column, definition):
+        """Redefine one column by copying the table, since SQLite cannot ALTER it in place"""
+        row = self._connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if row is None:
+            return
+        create_sql = row[0]
+        indexes = [index_sql for (index_sql,) in self._connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,)
+        )]
+        opening = create_sql.index('(')
+        closing = _matching_paren(create_sql, opening)
+        parts = split_top_level(create_sql[opening + 1:closing])
+        for index, part in enumerate(parts):
+            if part.split(None, 1)[0].strip('"`') == column:
+                parts[index] = translate(f"{column} {definition}")
+        temporary = f"{table}__rebuild"
+
+        # Foreign keys can only be switched off outside a transaction
+        self._connection.execute("PRAGMA foreign_keys = OFF")
+        try:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(f'CREATE TABLE "{temporary}" (\n    ' + ",\n    ".join(parts) + "\n)")
+                self._connection.execute(f'INSERT INTO "{temporary}" SELECT * FROM "{table}"')
+                self._connection.execute(f'DROP TABLE "{table}"')
+                self._connection.execute(f'ALTER TABLE "{temporary}" RENAME TO "{table}"')
+                for index_sql in indexes:
+                    self._connection.execute(index_sql)
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+        finally:
+            self._connection.execute("PRAGMA foreign_keys = ON")
+
+
+def connect(path, timeout=30.0):
+    return SQLiteConnection(path, timeout)
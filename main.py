@@ -1,20 +1,16 @@
+import startup_trace
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QFontDatabase, QIcon
-from ui.login_window import LoginWindow
-from ui.admin_dashboard import AdminDashboard
-from ui.staff_dashboard import StaffDashboard
-from ui.customer_dashboard import CustomerDashboard
-from database.db_connection import DatabaseConnection
-from ui.panels.sales_panel import SalesPanel
-from ui.panels.adoption_panel import AdoptionPanel
-from ui.panels.profile_panel import ProfilePanel
-from ui.panels.order_history_panel import OrderHistoryPanel
-from ui.panels.surrender_panel import SurrenderPanel
-import mysql.connector
-from mysql.connector import Error
+import threading
+with startup_trace.span("import PyQt6"):
+    from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget
+    from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+    from PyQt6.QtGui import QFontDatabase, QIcon
+# Only the login path is imported up front; dashboards, their panels, matplotlib and
+# the MySQL driver are loaded after first paint or when first needed
+with startup_trace.span("import login window"):
+    from ui.login_window import LoginWindow
+    from database.db_connection import DatabaseConnection
 
 class MainWindow(QMainWindow):
     cart_updated = pyqtSignal()
@@ -23,7 +19,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Cuddle Corner")
         self.showMaximized()
         
-        # Initialize database
+        # Initialize database; it connects on first use or when preload() warms it up
         self.db = DatabaseConnection()
         
         # Create stacked widget
@@ -31,7 +27,8 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.stacked_widget)
         
         # Create windows
-        self.login_window = LoginWindow(self.db)
+        with startup_trace.span("build LoginWindow"):
+            self.login_window = LoginWindow(self.db)
         self.admin_dashboard = None
         self.staff_dashboard = None
         self.customer_dashboard = None
@@ -42,6 +39,22 @@ class MainWindow(QMainWindow):
         # Connect signals
         self.login_window.login_successful.connect(self.handle_login_success)
         self.login_window.register_requested.connect(self.show_register)
+        
+        QTimer.singleShot(0, self.preload)
+    
+    def preload(self):
+        # Runs once the login window has painted
+        startup_trace.mark("first paint")
+        threading.Thread(target=self.preload_in_background, daemon=True).start()
+    
+    def preload_in_background(self):
+        # Connect and import the dashboards while the user is typing their password
+        with startup_trace.span("connect to database"):
+            self.db.ensure_connected()
+        with startup_trace.span("import dashboards"):
+            import ui.admin_dashboard
+            import ui.staff_dashboard
+            import ui.customer_dashboard
     
     def handle_login_success(self, user_data):
         user_id, username, role = user_data
@@ -54,19 +67,27 @@ class MainWindow(QMainWindow):
         
         # Create appropriate dashboard
         if role == 'admin':
-            self.admin_dashboard = AdminDashboard(self.db, user_id, username.capitalize())
+            from ui.admin_dashboard import AdminDashboard
+            with startup_trace.span("build AdminDashboard"):
+                self.admin_dashboard = AdminDashboard(self.db, user_id, username.capitalize())
             self.admin_dashboard.logout_signal.connect(self.show_login)
             self.stacked_widget.addWidget(self.admin_dashboard)
         elif role == 'staff':
-            self.staff_dashboard = StaffDashboard(self.db, user_id, username.capitalize())
+            from ui.staff_dashboard import StaffDashboard
+            with startup_trace.span("build StaffDashboard"):
+                self.staff_dashboard = StaffDashboard(self.db, user_id, username.capitalize())
             self.staff_dashboard.logout_signal.connect(self.show_login)
             self.stacked_widget.addWidget(self.staff_dashboard)
         else:  # customer
-            self.customer_dashboard = CustomerDashboard(self.db, user_id, username.capitalize())
+            from ui.customer_dashboard import CustomerDashboard
+            with startup_trace.span("build CustomerDashboard"):
+                self.customer_dashboard = CustomerDashboard(self.db, user_id, username.capitalize())
             self.customer_dashboard.logout_signal.connect(self.show_login)
             self.stacked_widget.addWidget(self.customer_dashboard)
         
         self.stacked_widget.setCurrentIndex(1)
+        startup_trace.mark("dashboard shown")
+        startup_trace.report()
     
     def show_login(self):
         # Clear any existing dashboards
@@ -85,13 +106,15 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    with startup_trace.span("create QApplication"):
+        app = QApplication(sys.argv)
     
     # Set application style
     app.setStyle('Fusion')
     
     # Create and show main window
-    window = MainWindow()
+    with startup_trace.span("build MainWindow"):
+        window = MainWindow()
     window.showMaximized() 
     window.show()
     
@@ -1,3 +1,5 @@
+from database.pagination import fetch_page
+
 class AdoptionModel:
     def __init__(self, db):
         self.db = db
@@ -30,6 +32,22 @@ class AdoptionModel:
             """
             return self.db.execute_query(query)
     
+    def get_adoption_requests_page(self, page_size=50, after=None, status=None, with_total=False):
+        # Keyset page on (request_date, id), newest first
+        query = """
+        SELECT ar.*, u.first_name, u.last_name, u.email, p.name as pet_name, p.species
+        FROM adoption_requests ar
+        JOIN users u ON ar.customer_id = u.id
+        JOIN pets p ON ar.pet_id = p.id
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("ar.status = %s")
+            params.append(status)
+        return fetch_page(self.db, query, ['ar.request_date', 'ar.id'], ['request_date', 'id'],
+                          conditions, params, page_size, after,
+                          count_table='adoption_requests ar' if with_total else None)
+    
     def update_adoption_status(self, request_id, status, approved_by=None):
         query = "UPDATE adoption_requests SET status = %s, approved_by = %s WHERE id = %s"
         return self.db.execute_query(query, (status, approved_by, request_id))
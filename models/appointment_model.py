@@ -1,20 +1,30 @@
 from datetime import datetime, timedelta
+from itertools import islice
+from database.pagination import fetch_page
+from models.schedule import (ACTIVE_STATUSES, DEFAULT_DURATION, day_bounds, day_start, iter_free_slots,
+                             schedule_cache, service_duration, to_datetime)
 
 class AppointmentModel:
     def __init__(self, db):
         self.db = db
     
     def create_appointment(self, appointment_data):
-        # Check if appointment slot is available
+        duration = (appointment_data.get('duration_minutes')
+                    or service_duration(appointment_data['service_type']))
+        
+        # Check if appointment slot is available, against a fresh copy of the day
         if not self.check_appointment_availability(
             appointment_data['appointment_date'], 
-            appointment_data.get('staff_id')
+            appointment_data.get('staff_id'),
+            duration,
+            refresh=True
         ):
             return False  # Slot not available
         
         query = """
-        INSERT INTO appointments (customer_id, staff_id, service_type, appointment_date, notes, status)
-        VALUES (%s, %s, %s, %s, %s, 'Pending')
+        INSERT INTO appointments (customer_id, staff_id, service_type, appointment_date,
+                                  duration_minutes, notes, status)
+        VALUES (%s, %s, %s, %s, %s, %s, 'Pending')
         """
         
         params = (
@@ -22,10 +32,15 @@ class AppointmentModel:
             appointment_data.get('staff_id'),
             appointment_data['service_type'],
             appointment_data['appointment_date'],
+            duration,
             appointment_data.get('notes', '')
         )
         
-        return self.db.execute_query(query, params)
+        result = self.db.execute_query(query, params)
+        if result and result is not True:
+            schedule_cache.add(result, appointment_data.get('staff_id'),
+                               to_datetime(appointment_data['appointment_date']), duration)
+        return result
     
     def get_appointments_by_customer(self, customer_id):
         query = """
@@ -42,7 +57,31 @@ class AppointmentModel:
         """
         return self.db.execute_query(query, (customer_id,))
     
+    APPOINTMENT_LIST_SELECT = """
+        SELECT a.*, 
+               c.first_name as customer_first_name, c.last_name as customer_last_name,
+               s.first_name as staff_first_name, s.last_name as staff_last_name
+        FROM appointments a
+        LEFT JOIN users c ON a.customer_id = c.id
+        LEFT JOIN users s ON a.staff_id = s.id
+        """
+    
     def get_all_appointments(self):
+        query = self.APPOINTMENT_LIST_SELECT + " ORDER BY a.appointment_date DESC"
+        return self.db.execute_query(query)
+    
+    def get_appointments_page(self, page_size=50, after=None, status=None, with_total=False):
+        # Keyset page on (appointment_date, id), newest first
+        conditions, params = [], []
+        if status:
+            conditions.append("a.status = %s")
+            params.append(status)
+        return fetch_page(self.db, self.APPOINTMENT_LIST_SELECT, ['a.appointment_date', 'a.id'],
+                          ['appointment_date', 'id'], conditions, params, page_size, after,
+                          count_table='appointments a' if with_total else None)
+    
+    def iter_all_appointments(self, chunk_size=500):
+        # Same rows as get_all_appointments(), streamed in batches
         query = """
         SELECT a.*, 
                c.first_name as customer_first_name, c.last_name as customer_last_name,
@@ -52,7 +91,7 @@ class AppointmentModel:
         LEFT JOIN users s ON a.staff_id = s.id
         ORDER BY a.appointment_date DESC
         """
-        return self.db.execute_query(query)
+        return self.db.iter_query(query, chunk_size=chunk_size)
     
     def get_appointment_by_id(self, appointment_id):
         query = """
@@ -69,7 +108,10 @@ class AppointmentModel:
     
     def update_appointment_status(self, appointment_id, new_status):
         query = "UPDATE appointments SET status = %s WHERE id = %s"
-        return self.db.execute_query(query, (new_status, appointment_id))
+        result = self.db.execute_query(query, (new_status, appointment_id))
+        if result:
+            self.refresh_schedule(appointment_id)
+        return result
     
     def update_appointment(self, appointment_id, update_data):
         if not update_data:
@@ -89,112 +131,85 @@ class AppointmentModel:
         params.append(appointment_id)
         query = f"UPDATE appointments SET {', '.join(set_clauses)} WHERE id = %s"
         
-        return self.db.execute_query(query, tuple(params))
+        result = self.db.execute_query(query, tuple(params))
+        if result:
+            self.refresh_schedule(appointment_id)
+        return result
     
     def assign_staff(self, appointment_id, staff_id):
         query = "UPDATE appointments SET staff_id = %s WHERE id = %s"
-        return self.db.execute_query(query, (staff_id, appointment_id))
+        result = self.db.execute_query(query, (staff_id, appointment_id))
+        if result:
+            self.refresh_schedule(appointment_id)
+        return result
     
-    def check_appointment_availability(self, appointment_date, staff_id=None, duration_minutes=30):
-        # Parse the appointment date
-        if isinstance(appointment_date, str):
-            appointment_datetime = datetime.strptime(appointment_date, '%Y-%m-%d %H:%M:%S')
-        else:
-            appointment_datetime = appointment_date
-        
-        end_time = appointment_datetime + timedelta(minutes=duration_minutes)
-        
-        query = """
-        SELECT * FROM appointments 
-        WHERE (
-            (appointment_date <= %s AND DATE_ADD(appointment_date, INTERVAL %s MINUTE) > %s) OR
-            (appointment_date < %s AND DATE_ADD(appointment_date, INTERVAL %s MINUTE) >= %s) OR
-            (appointment_date >= %s AND appointment_date < %s)
+    def refresh_schedule(self, appointment_id):
+        # Move a changed booking in the loaded schedules, or drop it once it no longer holds a slot
+        schedule_cache.remove(appointment_id)
+        result = self.db.execute_query(
+            "SELECT staff_id, appointment_date, duration_minutes, status FROM appointments WHERE id = %s",
+            (appointment_id,)
         )
-        AND status IN ('Pending', 'Approved')
-        """
-        
-        if staff_id:
-            query += " AND (staff_id = %s OR staff_id IS NULL)"
-            params = (appointment_datetime, duration_minutes, appointment_datetime, 
-                      end_time, duration_minutes, end_time,
-                      appointment_datetime, end_time, staff_id)
-        else:
-            params = (appointment_datetime, duration_minutes, appointment_datetime, 
-                      end_time, duration_minutes, end_time,
-                      appointment_datetime, end_time)
-        
-        conflicting_appointments = self.db.execute_query(query, params)
-        return len(conflicting_appointments) == 0
+        if result and result[0]['status'] in ACTIVE_STATUSES:
+            booking = result[0]
+            schedule_cache.add(appointment_id, booking['staff_id'],
+                               to_datetime(booking['appointment_date']), booking['duration_minutes'])
     
-    def get_available_time_slots(self, date, staff_id=None, business_hours=(9, 17)):
-        # Parse date
-        if isinstance(date, str):
-            base_date = datetime.strptime(date, '%Y-%m-%d')
-        else:
-            base_date = date
-        
-        date_str = base_date.strftime('%Y-%m-%d')
-        
-        # Get existing appointments
-        if staff_id:
-            query = """
-            SELECT appointment_date FROM appointments 
-            WHERE DATE(appointment_date) = %s 
-            AND staff_id = %s 
-            AND status IN ('Pending', 'Approved')
-            """
-            params = (date_str, staff_id)
-        else:
-            query = """
-            SELECT appointment_date FROM appointments 
-            WHERE DATE(appointment_date) = %s 
-            AND status IN ('Pending', 'Approved')
-            """
-            params = (date_str,)
-        
-        existing_appointments = self.db.execute_query(query, params)
-        
-        # Generate time slots (every 30 minutes during business hours)
-        start_hour, end_hour = business_hours
-        time_slots = []
+    def check_appointment_availability(self, appointment_date, staff_id=None, duration_minutes=DEFAULT_DURATION,
+                                       ignore_id=None, refresh=False):
+        appointment_datetime = to_datetime(appointment_date)
         
-        current_time = base_date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-        end_time = base_date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
-        
-        while current_time < end_time:
-            time_slots.append(current_time)
-            current_time += timedelta(minutes=30)
-        
-        # Filter out booked slots
-        booked_times = []
-        for apt in existing_appointments:
-            try:
-                if isinstance(apt['appointment_date'], str):
-                    booked_time = datetime.strptime(apt['appointment_date'], '%Y-%m-%d %H:%M:%S')
-                else:
-                    booked_time = apt['appointment_date']
-                booked_times.append(booked_time)
-            except:
-                continue
+        # The day's bookings are loaded once and searched in memory
+        schedules = schedule_cache.get_days(self.db, appointment_datetime, refresh=refresh)
+        if schedules is None:
+            return False
         
-        # Remove slots that overlap with existing appointments
-        available_slots = []
-        for slot in time_slots:
-            slot_end = slot + timedelta(minutes=30)
-            is_available = True
-            
-            for booked in booked_times:
-                booked_end = booked + timedelta(minutes=30)
-                # Check for overlap
-                if (slot < booked_end and slot_end > booked):
-                    is_available = False
-                    break
-            
-            if is_available:
-                available_slots.append(slot)
+        return schedules[0].is_free(appointment_datetime, duration_minutes, staff_id, ignore_id)
+    
+    def get_available_time_slots(self, date, staff_id=None, business_hours=(9, 17),
+                                 duration_minutes=DEFAULT_DURATION, step_minutes=30):
+        schedules = schedule_cache.get_days(self.db, date)
+        if schedules is None:
+            return []
         
-        return available_slots
+        return schedules[0].free_slots(duration_minutes, staff_id, business_hours, step_minutes)
+    
+    def get_staff_ids(self):
+        result = self.db.execute_query(
+            "SELECT id FROM users WHERE role = 'staff' AND is_active = TRUE ORDER BY id"
+        )
+        return [row['id'] for row in result] if result else []
+    
+    def iter_free_slots(self, start_date=None, days=7, duration_minutes=DEFAULT_DURATION, staff_ids=None,
+                        business_hours=(9, 17), step_minutes=30):
+        # Every day in the range comes from a single bookings query
+        now = datetime.now()
+        schedules = schedule_cache.get_days(self.db, start_date or now, days)
+        if schedules is None:
+            return iter(())
+        if staff_ids is None:
+            staff_ids = self.get_staff_ids()
+        return iter_free_slots(schedules, staff_ids or [None], duration_minutes,
+                               business_hours, step_minutes, not_before=now)
+    
+    def get_availability_grid(self, start_date=None, days=7, duration_minutes=DEFAULT_DURATION, staff_ids=None,
+                              business_hours=(9, 17), step_minutes=30):
+        """{date: [(slot start, [free staff ids]), ...]} for each of the next days"""
+        grid = {}
+        # str, date or datetime, like the schedule cache accepts
+        first = day_start(start_date or datetime.now())
+        for offset in range(days):
+            grid[(first + timedelta(days=offset)).date()] = []
+        for slot, free in self.iter_free_slots(start_date, days, duration_minutes, staff_ids,
+                                               business_hours, step_minutes):
+            grid[slot.date()].append((slot, free))
+        return grid
+    
+    def find_next_free_slots(self, count=5, days=7, duration_minutes=DEFAULT_DURATION, staff_ids=None,
+                             start_date=None):
+        """The earliest count (slot start, staff id) pairings, stopping as soon as they are found"""
+        slots = self.iter_free_slots(start_date, days, duration_minutes, staff_ids)
+        return [(slot, free[0]) for slot, free in islice(slots, count)]
     
     def get_appointments_by_date_range(self, start_date, end_date, staff_id=None):
         query = """
@@ -204,15 +219,17 @@ class AppointmentModel:
         FROM appointments a
         LEFT JOIN users c ON a.customer_id = c.id
         LEFT JOIN users s ON a.staff_id = s.id
-        WHERE DATE(a.appointment_date) BETWEEN %s AND %s
+        WHERE a.appointment_date >= %s AND a.appointment_date < %s
         AND a.status IN ('Pending', 'Approved')
         """
         
+        # Whole days as a half-open range, so the (status, appointment_date) index is usable
+        start, end = day_bounds(start_date, end_date)
         if staff_id:
             query += " AND (a.staff_id = %s OR a.staff_id IS NULL)"
-            params = (start_date, end_date, staff_id)
+            params = (start, end, staff_id)
         else:
-            params = (start_date, end_date)
+            params = (start, end)
         
         query += " ORDER BY a.appointment_date ASC"
         return self.db.execute_query(query, params)
@@ -229,8 +246,8 @@ class AppointmentModel:
         """
         
         if start_date and end_date:
-            query = base_query + " WHERE DATE(appointment_date) BETWEEN %s AND %s"
-            params = (start_date, end_date)
+            query = base_query + " WHERE appointment_date >= %s AND appointment_date < %s"
+            params = day_bounds(start_date, end_date)
         else:
             query = base_query
             params = ()
@@ -248,7 +265,7 @@ class AppointmentModel:
         return self.db.execute_query(query)
     
     def get_todays_appointments(self):
-        today = datetime.now().strftime('%Y-%m-%d')
+        today = datetime.now()
         query = """
         SELECT a.*, 
                c.first_name as customer_first_name, c.last_name as customer_last_name,
@@ -256,15 +273,14 @@ class AppointmentModel:
         FROM appointments a
         LEFT JOIN users c ON a.customer_id = c.id
         LEFT JOIN users s ON a.staff_id = s.id
-        WHERE DATE(a.appointment_date) = %s
+        WHERE a.appointment_date >= %s AND a.appointment_date < %s
         AND a.status IN ('Pending', 'Approved')
         ORDER BY a.appointment_date ASC
         """
-        return self.db.execute_query(query, (today,))
+        return self.db.execute_query(query, day_bounds(today, today))
     
     def get_upcoming_appointments(self, customer_id=None, days=7):
-        today = datetime.now().strftime('%Y-%m-%d')
-        end_date = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+        start, end = day_bounds(datetime.now(), datetime.now() + timedelta(days=days))
         
         if customer_id:
             query = """
@@ -273,11 +289,11 @@ class AppointmentModel:
             FROM appointments a
             LEFT JOIN users s ON a.staff_id = s.id
             WHERE a.customer_id = %s
-            AND DATE(a.appointment_date) BETWEEN %s AND %s
+            AND a.appointment_date >= %s AND a.appointment_date < %s
             AND a.status IN ('Pending', 'Approved')
             ORDER BY a.appointment_date ASC
             """
-            params = (customer_id, today, end_date)
+            params = (customer_id, start, end)
         else:
             query = """
             SELECT a.*, 
@@ -286,21 +302,30 @@ class AppointmentModel:
             FROM appointments a
             LEFT JOIN users c ON a.customer_id = c.id
             LEFT JOIN users s ON a.staff_id = s.id
-            WHERE DATE(a.appointment_date) BETWEEN %s AND %s
+            WHERE a.appointment_date >= %s AND a.appointment_date < %s
             AND a.status IN ('Pending', 'Approved')
             ORDER BY a.appointment_date ASC
             """
-            params = (today, end_date)
+            params = (start, end)
         
         return self.db.execute_query(query, params)
     
     def delete_appointment(self, appointment_id):
         query = "DELETE FROM appointments WHERE id = %s"
-        return self.db.execute_query(query, (appointment_id,))
+        result = self.db.execute_query(query, (appointment_id,))
+        if result:
+            schedule_cache.remove(appointment_id)
+        return result
     
     def reschedule_appointment(self, appointment_id, new_datetime, staff_id=None):
-        # Check if new slot is available
-        if not self.check_appointment_availability(new_datetime, staff_id):
+        current = self.get_appointment_by_id(appointment_id)
+        if not current:
+            return False
+        duration = current['duration_minutes'] or service_duration(current['service_type'])
+        
+        # Check if new slot is available; the booking being moved does not block itself
+        if not self.check_appointment_availability(new_datetime, staff_id or current['staff_id'],
+                                                   duration, ignore_id=appointment_id, refresh=True):
             return False
         
         # Update the appointment
@@ -0,0 +1,349 @@
+import csv
+import json
+import os
+from decimal import Decimal, InvalidOperation
+from models.image_store import ingest_images
+from models.product_model import normalize_sku, sku_lookup
+
+# Rows written per transaction
+BATCH_SIZE = 500
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+
+# Largest values the columns hold; anything bigger would make the database reject the batch
+MAX_PRICE = Decimal('99999999.99')
+MAX_AGE = Decimal('999.9')
+MAX_INTEGER = 2147483647
+
+
+def _decimal(maximum):
+    def parse(value):
+        try:
+            number = Decimal(_text(value))
+        except InvalidOperation:
+            raise ValueError(f"'{value}' is not a number")
+        # NaN and Infinity parse, but cannot be compared or stored
+        if not number.is_finite():
+            raise ValueError(f"'{value}' is not a number")
+        if number < 0:
+            raise ValueError("cannot be negative")
+        if number > maximum:
+            raise ValueError(f"cannot be more than {maximum}")
+        return number
+    return parse
+
+
+def _integer(value):
+    try:
+        number = int(_text(value))
+    except ValueError:
+        raise ValueError(f"'{value}' is not a whole number")
+    if number < 0:
+        raise ValueError("cannot be negative")
+    if number > MAX_INTEGER:
+        raise ValueError(f"cannot be more than {MAX_INTEGER}")
+    return number
+
+
+def _choice(options):
+    def parse(value):
+        for option in options:
+            if _text(value).lower() == option.lower():
+                return option
+        raise ValueError(f"must be one of {', '.join(options)}")
+    return parse
+
+
+# (field, parser, required, default) in file column order; parser None keeps the text
+CATALOG_FIELDS = {
+    'products': [
+        ('sku', None, False, None),
+        ('name', None, True, None),
+        ('category', _choice(["Food", "Accessories", "Medicine", "Toys", "Grooming"]), True, None),
+        ('description', None, False, ''),
+        ('price', _decimal(MAX_PRICE), True, None),
+        ('quantity', _integer, False, 0),
+        ('reorder_level', _integer, False, 5),
+        ('image_path', None, False, None),
+    ],
+    'pets': [
+        ('name', None, True, None),
+        ('species', None, True, None),
+        ('breed', None, False, ''),
+        ('age', _decimal(MAX_AGE), True, None),
+        ('gender', _choice(["Male", "Female", "Unknown"]), True, None),
+        ('price', _decimal(MAX_PRICE), True, None),
+        ('status', _choice(["Available", "Sold", "Reserved", "Adopted"]), False, 'Available'),
+        ('health_status', None, False, ''),
+        ('vaccination_status', None, False, ''),
+        ('description', None, False, ''),
+        ('image_path', None, False, None),
+    ],
+}
+
+PRODUCT_INSERT = """
+INSERT INTO products (sku, name, category, description, price, quantity, reorder_level, image_path)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+PET_INSERT = """
+INSERT INTO pets (name, species, breed, age, gender, price, status, health_status,
+                  vaccination_status, description, image_path, created_by)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+IMAGE_DIRS = {'products': ("product_images", "product"), 'pets': ("pet_images", "pet")}
+
+
+def file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.json', '.jsonl', '.ndjson'):
+        return extension[1:]
+    return 'csv'
+
+
+def count_rows(path):
+    # Cheap pre-pass so progress can be shown as a fraction
+    fmt = file_format(path)
+    if fmt == 'json':
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                rows = json.load(file)
+        except ValueError:
+            # read_rows reports the broken file
+            return 0
+        return len(rows) if isinstance(rows, list) else 0
+    with open(path, 'rb') as file:
+        lines = sum(1 for line in file if line.strip())
+    return max(lines - 1, 0) if fmt == 'csv' else lines
+
+
+def _decoded_lines(file, bad_lines):
+    # Decode line by line, so one bad line does not stop the rest of the file being read
+    for number, line in enumerate(file, 1):
+        if number == 1 and line.startswith(b'\xef\xbb\xbf'):
+            line = line[3:]
+        try:
+            yield line.decode('utf-8')
+        except UnicodeDecodeError:
+            bad_lines.add(number)
+            yield line.decode('utf-8', 'replace')
+
+
+def read_rows(path):
+    """Yield (line number, raw dict) from a CSV, JSON array or JSON lines file.
+
+    A line that cannot be read yields a ValueError in place of the dict, so it is reported
+    like any other bad row instead of ending the import.
+    """
+    fmt = file_format(path)
+    if fmt == 'csv':
+        bad_lines = set()
+        with open(path, 'rb') as file:
+            reader = csv.DictReader(_decoded_lines(file, bad_lines))
+            first_line = 1
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield reader.line_num, ValueError(f"line cannot be read: {e}")
+                    first_line = reader.line_num + 1
+                    continue
+                # A quoted field can span lines; the row is bad if any of them was
+                if any(first_line <= number <= reader.line_num for number in bad_lines):
+                    yield reader.line_num, ValueError("line is not valid UTF-8")
+                else:
+                    yield reader.line_num, row
+                first_line = reader.line_num + 1
+    elif fmt == 'json':
+        # A JSON array has to be parsed whole; use .jsonl for very large files
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                rows = json.load(file)
+        except UnicodeDecodeError:
+            yield 1, ValueError("file is not valid UTF-8")
+            return
+        except json.JSONDecodeError as e:
+            yield e.lineno, ValueError(f"file is not valid JSON: {e.msg}")
+            return
+        if not isinstance(rows, list):
+            yield 1, ValueError("file is not a JSON array")
+            return
+        for number, row in enumerate(rows, 1):
+            yield number, row
+    else:
+        bad_lines = set()
+        with open(path, 'rb') as file:
+            for number, line in enumerate(_decoded_lines(file, bad_lines), 1):
+                if not line.strip():
+                    continue
+                if number in bad_lines:
+                    yield number, ValueError("line is not valid UTF-8")
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, ValueError(f"line is not valid JSON: {e.msg}")
+
+
+def product_upsert(present):
+    """PRODUCT_INSERT that updates a product whose SKU already exists.
+
+    Only fields the row actually gave are overwritten: re-importing a price list without
+    a quantity column must not reset stock to the default. Pets have no natural key.
+    """
+    updates = [f"{field} = VALUES({field})" for field, parser, required, default in CATALOG_FIELDS['products']
+               if field in present and field not in ('sku', 'image_path')]
+    # A photo that could not be read keeps the one already stored
+    updates.append("image_path = COALESCE(VALUES(image_path), image_path)")
+    return PRODUCT_INSERT + "ON DUPLICATE KEY UPDATE " + ", ".join(updates)
+
+
+def present_fields(kind, raw):
+    # Fields given a value in this row; blank cells count as absent
+    return frozenset(field for field, parser, required, default in CATALOG_FIELDS[kind]
+                     if _text(raw.get(field)) != '')
+
+
+def validate_row(kind, raw, base_dir):
+    # Returns the cleaned row, or raises ValueError naming the bad field
+    if isinstance(raw, ValueError):
+        raise raw
+    if not isinstance(raw, dict):
+        raise ValueError("row is not an object")
+    row = {}
+    for field, parser, required, default in CATALOG_FIELDS[kind]:
+        value = raw.get(field)
+        if _text(value) == '':
+            if required:
+                raise ValueError(f"{field} is required")
+            row[field] = default
+            continue
+        try:
+            row[field] = parser(value) if parser else _text(value)
+        except ValueError as e:
+            raise ValueError(f"{field} {e}")
+
+    if kind == 'products':
+        row['sku'] = normalize_sku(row['sku'])
+    if row['image_path'] and not os.path.isabs(row['image_path']):
+        # Relative image paths are relative to the file being imported
+        row['image_path'] = os.path.join(base_dir, row['image_path'])
+    return row
+
+
+def import_catalog(db, kind, path, created_by=None, progress=None, batch_size=BATCH_SIZE):
+    """Import products or pets from a file in batched transactions.
+
+    progress(done, total) is called after every batch. Returns a dict with the number of
+    rows read and written and a list of (line, message) errors; bad rows are skipped, and
+    a batch the database rejects is rolled back whole.
+    """
+    total = count_rows(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    result = {'read': 0, 'written': 0, 'errors': []}
+    batch = []
+
+    for line, raw in read_rows(path):
+        result['read'] += 1
+        try:
+            row = validate_row(kind, raw, base_dir)
+            batch.append((line, row, present_fields(kind, raw)))
+        except ValueError as e:
+            result['errors'].append((line, str(e)))
+        if len(batch) >= batch_size:
+            _write_batch(db, kind, batch, created_by, result)
+            batch = []
+            if progress:
+                progress(result['read'], total)
+
+    if batch:
+        _write_batch(db, kind, batch, created_by, result)
+    if progress:
+        progress(result['read'], total)
+    if kind == 'products':
+        # SKUs may have been added or moved; reload the scan lookup on next use
+        sku_lookup.invalidate()
+    return result
+
+
+def _write_batch(db, kind, batch, created_by, result):
+    image_dir, prefix = IMAGE_DIRS[kind]
+    sources = [row['image_path'] for line, row, present in batch if row['image_path']]
+    stored = ingest_images(sources, image_dir, prefix) if sources else {}
+
+    # Rows giving the same fields share a statement; a CSV file is always one group
+    groups = {}
+    for line, row, present in batch:
+        if row['image_path']:
+            image_path = stored.get(row['image_path'])
+            if not image_path:
+                result['errors'].append((line, f"image {row['image_path']} could not be read"))
+            row['image_path'] = image_path
+        values = [row[field] for field, parser, required, default in CATALOG_FIELDS[kind]]
+        if kind == 'pets':
+            values.append(created_by)
+            present = None
+        groups.setdefault(present, []).append((line, tuple(values)))
+
+    for present, rows in groups.items():
+        query = product_upsert(present) if kind == 'products' else PET_INSERT
+        if db.execute_many(query, [values for line, values in rows]) is False:
+            first, last = rows[0][0], rows[-1][0]
+            result['errors'].append((first, f"lines {first}-{last} were rejected by the database"))
+        else:
+            result['written'] += len(rows)
+
+
+def export_catalog(db, kind, path, progress=None):
+    """Stream every product or pet to a CSV, JSON or JSON lines file; returns the row count.
+
+    Raises if the rows cannot all be read, leaving any existing file at path untouched.
+    """
+    fields = [field for field, parser, required, default in CATALOG_FIELDS[kind]]
+    fmt = file_format(path)
+    total = db.execute_query(f"SELECT COUNT(*) as count FROM {kind}")
+    total = total[0]['count'] if total else 0
+    written = 0
+
+    # Written aside and moved into place, so a failed export never leaves a truncated file
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+            if fmt == 'csv':
+                writer = csv.DictWriter(file, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+            elif fmt == 'json':
+                file.write("[\n")
+
+            for rows in db.iter_query(f"SELECT {', '.join(fields)} FROM {kind} ORDER BY id"):
+                for row in rows:
+                    if row['image_path']:
+                        # Absolute, so the file can be imported again from anywhere
+                        row['image_path'] = os.path.abspath(row['image_path'])
+                    if fmt == 'csv':
+                        writer.writerow(row)
+                    else:
+                        text = json.dumps(row, default=str, ensure_ascii=False)
+                        if fmt == 'json':
+                            text = ("" if written == 0 else ",\n") + "  " + text
+                        else:
+                            text += "\n"
+                        file.write(text)
+                    written += 1
+                if progress:
+                    progress(written, total)
+
+            if fmt == 'json':
+                file.write("\n]\n" if written else "]\n")
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+    return written
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import shutil
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Qt is imported inside the functions that decode images, so the models (and the catalog
+# CLI) can be imported without a GUI toolkit installed
+
+# Scaled copies of product and pet photos, so cards never decode the full-size file
+THUMBNAIL_DIR = "image_thumbnails"
+# (width, height) boxes the UI shows photos in; ingest pre-renders each of them
+THUMBNAIL_SIZES = [(200, 200), (150, 150)]
+# Longest side kept for stored photos; phone cameras deliver far more than any card shows
+MAX_IMAGE_SIDE = 1600
+JPEG_QUALITY = 85
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_INGEST_MIN = 8
+
+
+def file_key(path):
+    # (path, mtime, size) identifies one version of a file; None if it is missing
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def thumbnail_path(key, width, height):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+    return os.path.join(THUMBNAIL_DIR, digest[:2], f"{digest}_{width}x{height}.png")
+
+
+def load_scaled(path, width, height):
+    # Decode straight to the target size; JPEG can skip most of the work this way
+    from PyQt6.QtCore import Qt, QSize
+    from PyQt6.QtGui import QImageReader
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(QSize(width, height), Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() > width or image.height() > height:
+        image = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+def get_thumbnail(path, width, height, key=None):
+    """Thumbnail QImage for path, from the store if present, otherwise rendered and stored"""
+    key = key or file_key(path)
+    if key is None:
+        return None
+
+    stored = thumbnail_path(key, width, height)
+    if os.path.exists(stored):
+        from PyQt6.QtGui import QImage
+        image = QImage(stored)
+        if not image.isNull():
+            return image
+
+    image = load_scaled(path, width, height)
+    if image is not None:
+        save_thumbnail(image, stored)
+    return image
+
+
+def save_thumbnail(image, stored):
+    try:
+        os.makedirs(os.path.dirname(stored), exist_ok=True)
+        # Write then rename so a reader never sees half a file
+        temp_path = f"{stored}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if image.save(temp_path, "PNG"):
+            os.replace(temp_path, stored)
+    except OSError as e:
+        print(f"Error saving thumbnail: {e}")
+
+
+def write_thumbnails(path):
+    # Called when a photo is ingested, so its first card render is already cheap
+    key = file_key(path)
+    if key is None:
+        return
+    for width, height in THUMBNAIL_SIZES:
+        get_thumbnail(path, width, height, key)
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ingest_image(source_path, base_dir, prefix):
+    """Store a photo under base_dir named by its content, downsized, with thumbnails.
+
+    The same photo uploaded twice maps to the same file, so it is only stored once.
+    Returns the stored path, or None if the file is not a readable image.
+    """
+    from PyQt6.QtCore import Qt, QSize
+    from PyQt6.QtGui import QImageReader
+    reader = QImageReader(source_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    source_format = bytes(reader.format()).decode('ascii', 'ignore').lower()
+    if not size.isValid():
+        return None
+
+    name = f"{prefix}_{content_hash(source_path)[:32]}"
+    # Stored files are JPEG unless they need transparency
+    for extension in ('.jpg', '.png'):
+        existing = os.path.join(base_dir, name + extension)
+        if os.path.exists(existing):
+            return existing
+
+    os.makedirs(base_dir, exist_ok=True)
+    if max(size.width(), size.height()) <= MAX_IMAGE_SIDE and source_format in ('jpeg', 'jpg', 'png'):
+        # Already small enough: keep the original bytes rather than recompressing
+        extension = '.png' if source_format == 'png' else '.jpg'
+        destination_path = os.path.join(base_dir, name + extension)
+        temp_path = f"{destination_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, temp_path)
+    else:
+        if max(size.width(), size.height()) > MAX_IMAGE_SIDE:
+            reader.setScaledSize(size.scaled(QSize(MAX_IMAGE_SIDE, MAX_IMAGE_SIDE),
+                                             Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return None
+        extension = '.png' if image.hasAlphaChannel() else '.jpg'
+        destination_path = os.path.join(base_dir, name + extension)
+        temp_path = f"{destination_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if extension == '.png':
+            saved = image.save(temp_path, "PNG")
+        else:
+            saved = image.save(temp_path, "JPEG", JPEG_QUALITY)
+        if not saved:
+            return None
+    os.replace(temp_path, destination_path)
+
+    write_thumbnails(destination_path)
+    return destination_path
+
+
+def _ingest_worker(job):
+    source_path, base_dir, prefix = job
+    try:
+        return ingest_image(source_path, base_dir, prefix)
+    except Exception as e:
+        print(f"Error ingesting image {source_path}: {e}")
+        return None
+
+
+def ingest_images(source_paths, base_dir, prefix, workers=None):
+    """Ingest many photos in parallel processes; returns {source path: stored path or None}"""
+    source_paths = list(dict.fromkeys(source_paths))
+    if len(source_paths) < PARALLEL_INGEST_MIN:
+        return {path: _ingest_worker((path, base_dir, prefix)) for path in source_paths}
+
+    workers = workers or min(len(source_paths), os.cpu_count() or 1, 4)
+    jobs = [(path, base_dir, prefix) for path in source_paths]
+    # Spawned rather than forked: the caller is usually a Qt worker thread
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        stored = list(executor.map(_ingest_worker, jobs, chunksize=4))
+    return dict(zip(source_paths, stored))
+
+
+def remove_image(path):
+    # Delete a stored photo and the thumbnails rendered from it
+    key = file_key(path)
+    if key is None:
+        return
+    try:
+        os.remove(path)
+    except OSError as e:
+        print(f"Warning: Could not delete image: {e}")
+        return
+    for width, height in THUMBNAIL_SIZES:
+        try:
+            os.remove(thumbnail_path(key, width, height))
+        except OSError:
+            pass
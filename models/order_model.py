@@ -1,3 +1,8 @@
+from datetime import datetime, timedelta
+from database import rollups
+from database.pagination import fetch_page
+from models.product_model import build_stock_adjustment
+
 class OrderModel:
     def __init__(self, db):
         self.db = db
@@ -5,73 +10,91 @@ class OrderModel:
     def create_order(self, customer_id, staff_id, items, total_amount, 
                      payment_method='Cash', order_status='Pending', notes=None):
         try:
-            connection = self.db.get_connection()
-            cursor = connection.cursor()
-            
-            # Create order with all columns
-            order_query = """
-            INSERT INTO orders (customer_id, staff_id, total_amount, status, 
-                               payment_method, payment_status, notes)
-            VALUES (%s, %s, %s, %s, %s, 'Paid', %s)
-            """
-            cursor.execute(order_query, (customer_id, staff_id, total_amount, 
-                                        order_status, payment_method, notes))
-            order_id = cursor.lastrowid
-            
-            # Add order items and update inventory
-            for item in items:
-                if 'product_id' in item:
-                    # Product order
-                    item_query = """
-                    INSERT INTO order_items (order_id, product_id, quantity, unit_price)
-                    VALUES (%s, %s, %s, %s)
-                    """
-                    cursor.execute(item_query, (order_id, item['product_id'], 
-                                               item['quantity'], item['price']))
-                    
-                    # Update product quantity
-                    update_query = "UPDATE products SET quantity = quantity - %s WHERE id = %s"
-                    cursor.execute(update_query, (item['quantity'], item['product_id']))
+            with self.db.transaction() as cursor:
+                # Create order with all columns
+                order_query = """
+                INSERT INTO orders (customer_id, staff_id, total_amount, status, 
+                                   payment_method, payment_status, notes)
+                VALUES (%s, %s, %s, %s, %s, 'Paid', %s)
+                """
+                cursor.execute(order_query, (customer_id, staff_id, total_amount, 
+                                            order_status, payment_method, notes))
+                order_id = cursor.lastrowid
+                
+                # Each line keeps the category it was sold under, for the sales rollup
+                product_ids = list({item['product_id'] for item in items if 'product_id' in item})
+                categories = {}
+                if product_ids:
+                    placeholders = ", ".join(["%s"] * len(product_ids))
+                    cursor.execute(f"SELECT id, category FROM products WHERE id IN ({placeholders})",
+                                   tuple(product_ids))
+                    categories = {row['id']: row['category'] for row in cursor.fetchall()}
                 
-                elif 'pet_id' in item:
-                    # Pet order
+                # Collect all lines first so each table is written once
+                item_rows = []
+                stock_deltas = {}
+                pet_ids = []
+                for item in items:
+                    if 'product_id' in item:
+                        item_rows.append((order_id, item['product_id'], None, item['quantity'],
+                                          item['price'], categories.get(item['product_id'])))
+                        stock_deltas[item['product_id']] = (
+                            stock_deltas.get(item['product_id'], 0) - item['quantity'])
+                    elif 'pet_id' in item:
+                        item_rows.append((order_id, None, item['pet_id'], 1, item['price'], 'Pets'))
+                        pet_ids.append(item['pet_id'])
+                
+                if item_rows:
                     item_query = """
-                    INSERT INTO order_items (order_id, pet_id, quantity, unit_price)
-                    VALUES (%s, %s, %s, %s)
+                    INSERT INTO order_items (order_id, product_id, pet_id, quantity, unit_price, category)
+                    VALUES (%s, %s, %s, %s, %s, %s)
                     """
-                    cursor.execute(item_query, (order_id, item['pet_id'], 1, item['price']))
-                    
-                    # Update pet status
-                    update_query = "UPDATE pets SET status = 'Sold' WHERE id = %s"
-                    cursor.execute(update_query, (item['pet_id'],))
+                    cursor.executemany(item_query, item_rows)
+                
+                # Update product quantities
+                update_query, update_params = build_stock_adjustment(stock_deltas)
+                if update_query:
+                    cursor.execute(update_query, update_params)
+                
+                # Update pet status
+                if pet_ids:
+                    placeholders = ", ".join(["%s"] * len(pet_ids))
+                    cursor.execute(f"UPDATE pets SET status = 'Sold' WHERE id IN ({placeholders})",
+                                   tuple(pet_ids))
+                
+                # Keep the daily sales rollup in step with the new order
+                rollups.apply_order(cursor, order_id, 1)
             
-            connection.commit()
-            cursor.close()
             return order_id
             
         except Exception as e:
-            connection.rollback()
             print(f"Error creating order: {e}")
             return None
     
     def update_order_status(self, order_id, status, staff_id=None):
         try:
-            connection = self.db.get_connection()
-            cursor = connection.cursor()
-            
-            if staff_id:
-                query = "UPDATE orders SET status = %s, staff_id = %s WHERE id = %s"
-                cursor.execute(query, (status, staff_id, order_id))
-            else:
-                query = "UPDATE orders SET status = %s WHERE id = %s"
-                cursor.execute(query, (status, order_id))
+            with self.db.transaction() as cursor:
+                cursor.execute("SELECT status FROM orders WHERE id = %s FOR UPDATE", (order_id,))
+                current = cursor.fetchone()
+                was_counted = bool(current) and current['status'] != 'Cancelled'
+                
+                # Cancelling (or reinstating) an order moves it out of (or back into) the rollup
+                if was_counted and status == 'Cancelled':
+                    rollups.apply_order(cursor, order_id, -1)
+                
+                if staff_id:
+                    query = "UPDATE orders SET status = %s, staff_id = %s WHERE id = %s"
+                    cursor.execute(query, (status, staff_id, order_id))
+                else:
+                    query = "UPDATE orders SET status = %s WHERE id = %s"
+                    cursor.execute(query, (status, order_id))
+                
+                if current and not was_counted and status != 'Cancelled':
+                    rollups.apply_order(cursor, order_id, 1)
             
-            connection.commit()
-            cursor.close()
             return True
             
         except Exception as e:
-            connection.rollback()
             print(f"Error updating order status: {e}")
             return False
     
@@ -100,7 +123,8 @@ class OrderModel:
         result = self.db.execute_query(query, (order_id,))
         return result[0] if result else None
     
-    def get_orders_by_customer(self, customer_id):
+    def get_orders_by_customer(self, customer_id, include_items=False, limit=None, after=None):
+        # after is the (order_date, id) of the last row already shown, for paging
         query = """
         SELECT o.*, 
                u.first_name as staff_first_name, 
@@ -108,9 +132,51 @@ class OrderModel:
         FROM orders o 
         LEFT JOIN users u ON o.staff_id = u.id 
         WHERE o.customer_id = %s 
-        ORDER BY o.order_date DESC
         """
-        return self.db.execute_query(query, (customer_id,))
+        params = [customer_id]
+        if after:
+            query += " AND (o.order_date < %s OR (o.order_date = %s AND o.id < %s))"
+            params.extend((after[0], after[0], after[1]))
+        query += " ORDER BY o.order_date DESC, o.id DESC"
+        if limit:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        
+        orders = self.db.execute_query(query, tuple(params))
+        if orders and include_items:
+            self.attach_item_summaries(orders)
+        return orders
+    
+    def get_item_summaries(self, order_ids):
+        # Item counts and a short line summary for many orders in one query
+        order_ids = list(dict.fromkeys(order_ids))
+        if not order_ids:
+            return {}
+        
+        placeholders = ", ".join(["%s"] * len(order_ids))
+        query = f"""
+        SELECT oi.order_id,
+               COUNT(*) as item_count,
+               SUM(oi.quantity) as unit_count,
+               GROUP_CONCAT(CONCAT(COALESCE(p.name, pt.name, 'Item'), ' x', oi.quantity)
+                            ORDER BY oi.id SEPARATOR ', ') as item_summary
+        FROM order_items oi
+        LEFT JOIN products p ON oi.product_id = p.id
+        LEFT JOIN pets pt ON oi.pet_id = pt.id
+        WHERE oi.order_id IN ({placeholders})
+        GROUP BY oi.order_id
+        """
+        rows = self.db.execute_query(query, tuple(order_ids)) or []
+        return {row['order_id']: row for row in rows}
+    
+    def attach_item_summaries(self, orders):
+        summaries = self.get_item_summaries(order['id'] for order in orders)
+        for order in orders:
+            summary = summaries.get(order['id'])
+            order['item_count'] = int(summary['item_count']) if summary else 0
+            order['unit_count'] = int(summary['unit_count'] or 0) if summary else 0
+            order['item_summary'] = summary['item_summary'] if summary else ''
+        return orders
     
     def get_order_details(self, order_id):
         query = """
@@ -128,100 +194,180 @@ class OrderModel:
         """
         return self.db.execute_query(query, (order_id,))
     
+    # Customer and staff names are joined in so list views need no per-row lookups
+    ORDER_LIST_SELECT = """
+        SELECT o.*, 
+               staff.first_name as staff_first_name, 
+               staff.last_name as staff_last_name,
+               customer.username as customer_username,
+               customer.first_name as customer_first_name,
+               customer.last_name as customer_last_name,
+               customer.email as customer_email
+        FROM orders o
+        LEFT JOIN users staff ON o.staff_id = staff.id
+        LEFT JOIN users customer ON o.customer_id = customer.id
+        """
+    
+    def _order_filters(self, status, customer_id):
+        conditions = []
+        params = []
+        if status:
+            conditions.append("o.status = %s")
+            params.append(status)
+        if customer_id:
+            conditions.append("o.customer_id = %s")
+            params.append(customer_id)
+        return conditions, params
+    
     def get_all_orders(self, status=None, customer_id=None):
-        if status and customer_id:
-            query = """
-            SELECT o.*, 
-                   staff.first_name as staff_first_name, 
-                   staff.last_name as staff_last_name,
-                   customer.username as customer_username
-            FROM orders o
-            LEFT JOIN users staff ON o.staff_id = staff.id
-            LEFT JOIN users customer ON o.customer_id = customer.id
-            WHERE o.status = %s AND o.customer_id = %s
-            ORDER BY o.order_date DESC
-            """
-            return self.db.execute_query(query, (status, customer_id))
-        elif status:
-            query = """
-            SELECT o.*, 
-                   staff.first_name as staff_first_name, 
-                   staff.last_name as staff_last_name,
-                   customer.username as customer_username
-            FROM orders o
-            LEFT JOIN users staff ON o.staff_id = staff.id
-            LEFT JOIN users customer ON o.customer_id = customer.id
-            WHERE o.status = %s
-            ORDER BY o.order_date DESC
-            """
-            return self.db.execute_query(query, (status,))
-        elif customer_id:
-            query = """
-            SELECT o.*, 
-                   staff.first_name as staff_first_name, 
-                   staff.last_name as staff_last_name,
-                   customer.username as customer_username
-            FROM orders o
-            LEFT JOIN users staff ON o.staff_id = staff.id
-            LEFT JOIN users customer ON o.customer_id = customer.id
-            WHERE o.customer_id = %s
-            ORDER BY o.order_date DESC
-            """
-            return self.db.execute_query(query, (customer_id,))
-        else:
-            query = """
-            SELECT o.*, 
-                   staff.first_name as staff_first_name, 
-                   staff.last_name as staff_last_name,
-                   customer.username as customer_username
-            FROM orders o
-            LEFT JOIN users staff ON o.staff_id = staff.id
-            LEFT JOIN users customer ON o.customer_id = customer.id
-            ORDER BY o.order_date DESC
-            """
-            return self.db.execute_query(query)
+        query = self.ORDER_LIST_SELECT
+        conditions, params = self._order_filters(status, customer_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY o.order_date DESC"
+        return self.db.execute_query(query, tuple(params))
+    
+    def get_orders_page(self, page_size=50, after=None, status=None, customer_id=None,
+                        with_total=False):
+        # Keyset page on (order_date, id); pass the previous page's next_cursor as after
+        conditions, params = self._order_filters(status, customer_id)
+        return fetch_page(self.db, self.ORDER_LIST_SELECT, ['o.order_date', 'o.id'],
+                          ['order_date', 'id'], conditions, params, page_size, after,
+                          count_table='orders o' if with_total else None)
+    
+    def get_order_stats(self):
+        query = """
+        SELECT COUNT(*) as total_orders,
+               COALESCE(SUM(total_amount), 0) as total_sales,
+               COALESCE(SUM(status = 'Pending'), 0) as pending_orders
+        FROM orders
+        """
+        result = self.db.execute_query(query)
+        row = result[0] if result else {}
+        return {
+            'total_orders': int(row.get('total_orders') or 0),
+            'total_sales': float(row.get('total_sales') or 0),
+            'pending_orders': int(row.get('pending_orders') or 0)
+        }
+    
+    def _date_bounds(self, start_date, end_date):
+        # Inclusive calendar dates -> half-open [start, end + 1 day) so order_date stays sargable
+        if isinstance(start_date, str):
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        if isinstance(end_date, str):
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        return start_date, end_date + timedelta(days=1)
+    
+    def get_orders_in_range(self, start_date, end_date, status=None):
+        start, end = self._date_bounds(start_date, end_date)
+        params = [start, end]
+        query = """
+        SELECT o.*, 
+               staff.first_name as staff_first_name, 
+               staff.last_name as staff_last_name,
+               customer.username as customer_username,
+               customer.first_name as customer_first_name,
+               customer.last_name as customer_last_name,
+               customer.email as customer_email
+        FROM orders o
+        LEFT JOIN users staff ON o.staff_id = staff.id
+        LEFT JOIN users customer ON o.customer_id = customer.id
+        WHERE o.order_date >= %s AND o.order_date < %s
+        """
+        if status:
+            query += " AND o.status = %s"
+            params.append(status)
+        query += " ORDER BY o.order_date DESC"
+        return self.db.execute_query(query, tuple(params)) or []
+    
+    def get_rollup_daily_sales(self, start_date, end_date, payment_method=None):
+        # Per-day totals from the daily_sales rollup (cancelled orders excluded)
+        start, end = self._date_bounds(start_date, end_date)
+        query = """
+        SELECT sales_date, SUM(order_count) as order_count, SUM(revenue) as revenue
+        FROM daily_sales
+        WHERE sales_date >= %s AND sales_date < %s
+        """
+        params = [start, end]
+        if payment_method:
+            query += " AND payment_method = %s"
+            params.append(payment_method)
+        query += " GROUP BY sales_date HAVING SUM(order_count) > 0 ORDER BY sales_date"
+        return self.db.execute_query(query, tuple(params)) or []
+    
+    def get_rollup_category_sales(self, start_date, end_date):
+        start, end = self._date_bounds(start_date, end_date)
+        query = """
+        SELECT category, SUM(units) as units, SUM(revenue) as revenue
+        FROM daily_sales_categories
+        WHERE sales_date >= %s AND sales_date < %s
+        GROUP BY category
+        ORDER BY revenue DESC
+        """
+        return self.db.execute_query(query, (start, end)) or []
+    
+    def rebuild_sales_rollup(self, start_date=None, end_date=None):
+        try:
+            if start_date or end_date:
+                start, end = self._date_bounds(start_date or '1970-01-01',
+                                               end_date or datetime.now().date())
+                rollups.rebuild(self.db, start, end - timedelta(days=1))
+            else:
+                rollups.rebuild(self.db)
+            return True
+        except Exception as e:
+            print(f"Error rebuilding sales rollup: {e}")
+            return False
     
     def delete_order(self, order_id):
         try:
-            connection = self.db.get_connection()
-            cursor = connection.cursor()
-            
-            # First, restore inventory from order items
-            items_query = """
-            SELECT product_id, pet_id, quantity 
-            FROM order_items 
-            WHERE order_id = %s
-            """
-            cursor.execute(items_query, (order_id,))
-            items = cursor.fetchall()
-            
-            for item in items:
-                if item['product_id']:
-                    # Restore product quantity
-                    restore_query = """
-                    UPDATE products 
-                    SET quantity = quantity + %s 
-                    WHERE id = %s
-                    """
-                    cursor.execute(restore_query, (item['quantity'], item['product_id']))
-                elif item['pet_id']:
-                    # Restore pet status
-                    restore_query = "UPDATE pets SET status = 'Available' WHERE id = %s"
-                    cursor.execute(restore_query, (item['pet_id'],))
-            
-            # Delete order items
-            delete_items_query = "DELETE FROM order_items WHERE order_id = %s"
-            cursor.execute(delete_items_query, (order_id,))
-            
-            # Delete the order
-            delete_order_query = "DELETE FROM orders WHERE id = %s"
-            cursor.execute(delete_order_query, (order_id,))
+            with self.db.transaction() as cursor:
+                # Take the order out of the sales rollup while its items still exist
+                rollups.apply_order(cursor, order_id, -1)
+                
+                # First, restore inventory from order items
+                items_query = """
+                SELECT product_id, pet_id, quantity 
+                FROM order_items 
+                WHERE order_id = %s
+                """
+                cursor.execute(items_query, (order_id,))
+                items = cursor.fetchall()
+                
+                stock_deltas = {}
+                pet_ids = []
+                for item in items:
+                    if item['product_id']:
+                        stock_deltas[item['product_id']] = (
+                            stock_deltas.get(item['product_id'], 0) + item['quantity'])
+                    elif item['pet_id']:
+                        pet_ids.append(item['pet_id'])
+                
+                # Restore product quantities
+                restore_query, restore_params = build_stock_adjustment(stock_deltas)
+                if restore_query:
+                    cursor.execute(restore_query, restore_params)
+                
+                # Restore pet status
+                if pet_ids:
+                    placeholders = ", ".join(["%s"] * len(pet_ids))
+                    cursor.execute(f"UPDATE pets SET status = 'Available' WHERE id IN ({placeholders})",
+                                   tuple(pet_ids))
+                
+                # Delete order items
+                delete_items_query = "DELETE FROM order_items WHERE order_id = %s"
+                cursor.execute(delete_items_query, (order_id,))
+                
+                # Delete the order
+                delete_order_query = "DELETE FROM orders WHERE id = %s"
+                cursor.execute(delete_order_query, (order_id,))
             
-            connection.commit()
-            cursor.close()
             return True
             
         except Exception as e:
-            connection.rollback()
             print(f"Error deleting order: {e}")
             return False
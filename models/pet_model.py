@@ -1,6 +1,6 @@
 import os
-import shutil
-from datetime import datetime
+from database.pagination import fetch_page
+from models.image_store import ingest_image, remove_image
 
 class PetModel:
     def __init__(self, db):
@@ -18,6 +18,16 @@ class PetModel:
             query = "SELECT * FROM pets ORDER BY created_at DESC"
             return self.db.execute_query(query)
     
+    def get_pets_page(self, page_size=50, after=None, status=None, with_total=False):
+        # Keyset page on (created_at, id), newest first
+        conditions, params = [], []
+        if status:
+            conditions.append("status = %s")
+            params.append(status)
+        return fetch_page(self.db, "SELECT * FROM pets", ['created_at', 'id'],
+                          ['created_at', 'id'], conditions, params, page_size, after,
+                          count_table='pets' if with_total else None)
+    
     def get_pet_by_id(self, pet_id):
         query = "SELECT * FROM pets WHERE id = %s"
         result = self.db.execute_query(query, (pet_id,))
@@ -48,9 +58,7 @@ class PetModel:
         
         image_path = current_pet['image_path']
         if pet_data.get('image_path') and pet_data['image_path'] != current_pet['image_path']:
-            if current_pet['image_path'] and os.path.exists(current_pet['image_path']):
-                os.remove(current_pet['image_path'])
-            image_path = self.save_image(pet_data['image_path'])
+            image_path = self.save_image(pet_data['image_path']) or image_path
         
         query = """
         UPDATE pets SET name = %s, species = %s, breed = %s, age = %s, gender = %s,
@@ -66,7 +74,10 @@ class PetModel:
             pet_data['health_status'], pet_data['vaccination_status'], pet_id
         )
         
-        return self.db.execute_query(query, params)
+        result = self.db.execute_query(query, params)
+        if result is not False and image_path != current_pet['image_path']:
+            self.remove_image_if_unused(current_pet['image_path'])
+        return result
     
     def delete_pet(self, pet_id):
         try:
@@ -105,13 +116,8 @@ class PetModel:
             result = self.db.execute_query(query, (pet_id,))
             
             if result:
-                # Delete image if it exists
-                if pet.get('image_path') and os.path.exists(pet['image_path']):
-                    try:
-                        os.remove(pet['image_path'])
-                        print(f"Deleted image: {pet['image_path']}")
-                    except Exception as e:
-                        print(f"Warning: Could not delete image: {e}")
+                # Delete image if nothing else uses it
+                self.remove_image_if_unused(pet.get('image_path'))
                 
                 print(f"Successfully deleted pet '{pet['name']}' (ID: {pet_id})")
                 return True
@@ -206,17 +212,26 @@ class PetModel:
     
     def save_image(self, source_path):
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"pet_{timestamp}_{os.path.basename(source_path)}"
-            destination_path = os.path.join(self.image_base_path, filename)
-            
-            shutil.copy2(source_path, destination_path)
+            # Downsized, named by content (so re-uploads are stored once) and thumbnailed
+            destination_path = ingest_image(source_path, self.image_base_path, "pet")
+            if not destination_path:
+                print(f"Error saving image: {source_path} is not a readable image")
             return destination_path
             
         except Exception as e:
             print(f"Error saving image: {e}")
             return None
     
+    def remove_image_if_unused(self, image_path):
+        # Identical photos share one file, so only delete it once no pet points at it
+        if not image_path:
+            return
+        result = self.db.execute_query(
+            "SELECT COUNT(*) as count FROM pets WHERE image_path = %s", (image_path,)
+        )
+        if result and result[0]['count'] == 0:
+            remove_image(image_path)
+    
     def search_pets(self, search_term):
         query = """
         SELECT * FROM pets 
@@ -235,25 +250,22 @@ class PetModel:
             
             print(f"WARNING: Force deleting pet '{pet['name']}' (ID: {pet_id})")
             
-            # Disable foreign key checks
-            disable_fk = "SET FOREIGN_KEY_CHECKS = 0"
-            self.db.execute_query(disable_fk)
-            
-            # Delete the pet
-            query = "DELETE FROM pets WHERE id = %s"
-            result = self.db.execute_query(query, (pet_id,))
-            
-            # Re-enable foreign key checks
-            enable_fk = "SET FOREIGN_KEY_CHECKS = 1"
-            self.db.execute_query(enable_fk)
+            # FOREIGN_KEY_CHECKS is per session, so all three statements
+            # must run on the same pooled connection
+            with self.db.transaction() as cursor:
+                # Disable foreign key checks
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+                try:
+                    # Delete the pet
+                    cursor.execute("DELETE FROM pets WHERE id = %s", (pet_id,))
+                    result = cursor.rowcount > 0
+                finally:
+                    # Re-enable foreign key checks
+                    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
             
             if result:
-                # Delete image if it exists
-                if pet.get('image_path') and os.path.exists(pet['image_path']):
-                    try:
-                        os.remove(pet['image_path'])
-                    except:
-                        pass
+                # Delete image if nothing else uses it
+                self.remove_image_if_unused(pet.get('image_path'))
                 
                 print(f"Force deleted pet '{pet['name']}' (ID: {pet_id})")
                 print("WARNING: This may have left orphaned records in other tables!")
@@ -263,6 +275,5 @@ class PetModel:
                 return False
                 
         except Exception as e:
-            self.db.execute_query("SET FOREIGN_KEY_CHECKS = 1")
             print(f"Error in force_delete_pet: {e}")
             return False
@@ -1,6 +1,72 @@
 import os
-import shutil
-from datetime import datetime
+import threading
+from models.image_store import ingest_image, remove_image
+
+def build_stock_adjustment(deltas):
+    # One UPDATE for any number of products: quantity += delta per id
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return None, ()
+    
+    cases = " ".join("WHEN %s THEN %s" for _ in deltas)
+    placeholders = ", ".join(["%s"] * len(deltas))
+    query = f"""
+    UPDATE products SET quantity = quantity + CASE id {cases} ELSE 0 END
+    WHERE id IN ({placeholders})
+    """
+    
+    params = []
+    for product_id, delta in deltas.items():
+        params.extend((product_id, delta))
+    params.extend(deltas.keys())
+    return query, tuple(params)
+
+def normalize_sku(sku):
+    # Scanners and people disagree on case and stray whitespace
+    sku = (sku or '').strip().upper()
+    return sku or None
+
+class SkuLookup:
+    """SKU -> product id, shared by every ProductModel so a scan never waits on the database"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = {}
+        self.skus = {}
+        self.loaded = False
+    
+    def replace(self, products):
+        ids = {}
+        for product in products:
+            sku = normalize_sku(product.get('sku'))
+            if sku:
+                ids[sku] = product['id']
+        with self.lock:
+            self.ids = ids
+            self.skus = {product_id: sku for sku, product_id in ids.items()}
+            self.loaded = True
+    
+    def get(self, sku):
+        return self.ids.get(normalize_sku(sku))
+    
+    def set(self, product_id, sku):
+        sku = normalize_sku(sku)
+        with self.lock:
+            old = self.skus.pop(product_id, None)
+            if old and self.ids.get(old) == product_id:
+                del self.ids[old]
+            if sku:
+                self.ids[sku] = product_id
+                self.skus[product_id] = sku
+    
+    def discard(self, product_id):
+        self.set(product_id, None)
+    
+    def invalidate(self):
+        # Many rows changed at once; the next lookup reloads the whole map
+        self.loaded = False
+
+sku_lookup = SkuLookup()
 
 class ProductModel:
     def __init__(self, db):
@@ -17,31 +83,65 @@ class ProductModel:
             return self.db.execute_query(query, (category,))
         else:
             query = "SELECT * FROM products ORDER BY name"
-            return self.db.execute_query(query)
+            products = self.db.execute_query(query)
+            if products is not False:
+                # A full listing is a free refresh of the scan lookup
+                sku_lookup.replace(products)
+            return products
     
     def get_product_by_id(self, product_id):
         query = "SELECT * FROM products WHERE id = %s"
         result = self.db.execute_query(query, (product_id,))
         return result[0] if result else None
     
+    def get_products_by_ids(self, product_ids):
+        if not product_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        query = f"SELECT * FROM products WHERE id IN ({placeholders})"
+        return self.db.execute_query(query, tuple(product_ids))
+    
+    def get_product_by_sku(self, sku):
+        sku = normalize_sku(sku)
+        if not sku:
+            return None
+        result = self.db.execute_query("SELECT * FROM products WHERE sku = %s", (sku,))
+        return result[0] if result else None
+    
+    def find_product_id_by_sku(self, sku):
+        # In-memory lookup; falls back to the sku index for codes added on another till
+        if not sku_lookup.loaded:
+            self.get_all_products()
+        product_id = sku_lookup.get(sku)
+        if product_id is None:
+            product = self.get_product_by_sku(sku)
+            if product:
+                product_id = product['id']
+                sku_lookup.set(product_id, product['sku'])
+        return product_id
+    
     def add_product(self, product_data):
         # Handle image upload
         image_path = None
         if product_data.get('image_path'):
             image_path = self.save_image(product_data['image_path'])
         
+        sku = normalize_sku(product_data.get('sku'))
         query = """
-        INSERT INTO products (name, category, description, price, quantity, reorder_level, image_path)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        INSERT INTO products (name, category, description, price, quantity, reorder_level, image_path, sku)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
         
         params = (
             product_data['name'], product_data['category'], product_data['description'],
             product_data['price'], product_data['quantity'], product_data['reorder_level'],
-            image_path
+            image_path, sku
         )
         
-        return self.db.execute_query(query, params)
+        product_id = self.db.execute_query(query, params)
+        if product_id:
+            sku_lookup.set(product_id, sku)
+        return product_id
     
     def update_product(self, product_id, product_data):
         # Get current product data
@@ -50,53 +150,73 @@ class ProductModel:
         # Handle image update
         image_path = current_product['image_path']
         if product_data.get('image_path') and product_data['image_path'] != current_product['image_path']:
-            # Delete old image if exists
-            if current_product['image_path'] and os.path.exists(current_product['image_path']):
-                os.remove(current_product['image_path'])
-            image_path = self.save_image(product_data['image_path'])
+            image_path = self.save_image(product_data['image_path']) or image_path
         
+        sku = normalize_sku(product_data.get('sku', current_product.get('sku')))
         query = """
         UPDATE products SET name = %s, category = %s, description = %s, price = %s,
-                       quantity = %s, reorder_level = %s, image_path = %s
+                       quantity = %s, reorder_level = %s, image_path = %s, sku = %s
         WHERE id = %s
         """
         
         params = (
             product_data['name'], product_data['category'], product_data['description'],
             product_data['price'], product_data['quantity'], product_data['reorder_level'],
-            image_path, product_id
+            image_path, sku, product_id
         )
         
-        return self.db.execute_query(query, params)
+        result = self.db.execute_query(query, params)
+        if result is not False:
+            sku_lookup.set(product_id, sku)
+            if image_path != current_product['image_path']:
+                self.remove_image_if_unused(current_product['image_path'])
+        return result
     
     def delete_product(self, product_id):
         # Get product data to delete image
         product = self.get_product_by_id(product_id)
-        if product and product['image_path'] and os.path.exists(product['image_path']):
-            os.remove(product['image_path'])
         
         query = "DELETE FROM products WHERE id = %s"
-        return self.db.execute_query(query, (product_id,))
+        result = self.db.execute_query(query, (product_id,))
+        if result:
+            sku_lookup.discard(product_id)
+            if product:
+                self.remove_image_if_unused(product['image_path'])
+        return result
     
     def update_quantity(self, product_id, new_quantity):
         query = "UPDATE products SET quantity = %s WHERE id = %s"
         return self.db.execute_query(query, (new_quantity, product_id))
     
+    def restock_products(self, deltas):
+        # Bulk restock/adjustment: {product_id: quantity_change} in a single statement
+        query, params = build_stock_adjustment(deltas)
+        if not query:
+            return True
+        return self.db.execute_query(query, params) is not False
+    
     def get_low_stock_products(self):
         query = "SELECT * FROM products WHERE quantity <= reorder_level ORDER BY quantity ASC"
         return self.db.execute_query(query)
     
     def save_image(self, source_path):
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"product_{timestamp}_{os.path.basename(source_path)}"
-            destination_path = os.path.join(self.image_base_path, filename)
-            
-            # Copy file
-            shutil.copy2(source_path, destination_path)
+            # Downsized, named by content (so re-uploads are stored once) and thumbnailed
+            destination_path = ingest_image(source_path, self.image_base_path, "product")
+            if not destination_path:
+                print(f"Error saving image: {source_path} is not a readable image")
             return destination_path
             
         except Exception as e:
             print(f"Error saving image: {e}")
             return None
+    
+    def remove_image_if_unused(self, image_path):
+        # Identical photos share one file, so only delete it once no product points at it
+        if not image_path:
+            return
+        result = self.db.execute_query(
+            "SELECT COUNT(*) as count FROM products WHERE image_path = %s", (image_path,)
+        )
+        if result and result[0]['count'] == 0:
+            remove_image(image_path)
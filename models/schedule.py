@@ -0,0 +1,209 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+# Statuses that hold a slot
+ACTIVE_STATUSES = ('Pending', 'Approved')
+
+# Minutes each service takes; anything else gets DEFAULT_DURATION
+SERVICE_DURATIONS = {
+    "Grooming": 60,
+    "Vet Check-up": 30,
+    "Vaccination": 15,
+    "Spa": 90,
+    "Training": 60,
+}
+DEFAULT_DURATION = 30
+
+# Bookings starting this long before a day can still run into it
+LOOKBACK = timedelta(hours=8)
+
+# Seconds a loaded day is trusted before bookings made elsewhere are fetched again
+SCHEDULE_TTL = 30
+
+
+def service_duration(service_type):
+    return SERVICE_DURATIONS.get(service_type, DEFAULT_DURATION)
+
+
+def to_datetime(value, fmt='%Y-%m-%d %H:%M:%S'):
+    return datetime.strptime(value, fmt) if isinstance(value, str) else value
+
+
+def day_start(value):
+    value = to_datetime(value, '%Y-%m-%d') if isinstance(value, str) else value
+    return datetime(value.year, value.month, value.day)
+
+
+def day_bounds(first_day, last_day):
+    # [first_day 00:00, the day after last_day 00:00), for index-friendly date filters
+    return day_start(first_day), day_start(last_day) + timedelta(days=1)
+
+
+class BookingIntervals:
+    """One staff member's bookings as (start, end, id), sorted by start"""
+
+    def __init__(self):
+        self.starts = []
+        self.entries = []
+        # Longest booking held, so a lookup knows how far back an overlap can start
+        self.longest = timedelta(0)
+
+    def add(self, appointment_id, start, end):
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.entries.insert(position, (start, end, appointment_id))
+        self.longest = max(self.longest, end - start)
+
+    def remove(self, appointment_id, start):
+        position = bisect_left(self.starts, start)
+        while position < len(self.entries) and self.starts[position] == start:
+            if self.entries[position][2] == appointment_id:
+                del self.starts[position]
+                del self.entries[position]
+                return
+            position += 1
+
+    def overlaps(self, start, end, ignore_id=None):
+        # Only bookings starting in [start - longest, end) can overlap: O(log n) to find them
+        position = bisect_left(self.starts, start - self.longest)
+        stop = bisect_left(self.starts, end)
+        while position < stop:
+            booked_start, booked_end, appointment_id = self.entries[position]
+            if booked_end > start and appointment_id != ignore_id:
+                return True
+            position += 1
+        return False
+
+
+class DaySchedule:
+    """Active bookings that touch one day, per staff member and shop-wide"""
+
+    def __init__(self, day):
+        self.day = day_start(day)
+        self.window_start = self.day - LOOKBACK
+        self.window_end = self.day + timedelta(days=1)
+        self.loaded_at = time.monotonic()
+        # staff_id -> intervals; None holds bookings nobody is assigned to yet
+        self.by_staff = {}
+        self.everyone = BookingIntervals()
+        self.bookings = {}
+
+    def touches(self, start, end):
+        return start < self.window_end and end > self.day
+
+    def add(self, appointment_id, staff_id, start, duration_minutes):
+        end = start + timedelta(minutes=duration_minutes or DEFAULT_DURATION)
+        if not self.touches(start, end) or appointment_id in self.bookings:
+            return
+        self.bookings[appointment_id] = (staff_id, start)
+        self.by_staff.setdefault(staff_id, BookingIntervals()).add(appointment_id, start, end)
+        self.everyone.add(appointment_id, start, end)
+
+    def remove(self, appointment_id):
+        booking = self.bookings.pop(appointment_id, None)
+        if booking is None:
+            return
+        staff_id, start = booking
+        self.by_staff[staff_id].remove(appointment_id, start)
+        self.everyone.remove(appointment_id, start)
+
+    def is_free(self, start, duration_minutes, staff_id=None, ignore_id=None):
+        # Without a staff member the shop is one resource; with one, unassigned bookings
+        # still count against them, as either could end up with the job
+        end = start + timedelta(minutes=duration_minutes)
+        if staff_id is None:
+            return not self.everyone.overlaps(start, end, ignore_id)
+        for key in (staff_id, None):
+            intervals = self.by_staff.get(key)
+            if intervals is not None and intervals.overlaps(start, end, ignore_id):
+                return False
+        return True
+
+    def slot_starts(self, business_hours=(9, 17), duration_minutes=DEFAULT_DURATION, step_minutes=30):
+        start_hour, end_hour = business_hours
+        current = self.day.replace(hour=start_hour)
+        closing = self.day.replace(hour=end_hour)
+        step = timedelta(minutes=step_minutes)
+        while current + timedelta(minutes=duration_minutes) <= closing:
+            yield current
+            current += step
+
+    def free_slots(self, duration_minutes=DEFAULT_DURATION, staff_id=None, business_hours=(9, 17),
+                   step_minutes=30):
+        return [slot for slot in self.slot_starts(business_hours, duration_minutes, step_minutes)
+                if self.is_free(slot, duration_minutes, staff_id)]
+
+
+def iter_free_slots(schedules, staff_ids, duration_minutes=DEFAULT_DURATION, business_hours=(9, 17),
+                    step_minutes=30, not_before=None):
+    """Yield (slot start, staff ids free for it) through the given days, earliest first.
+
+    A staff id of None stands for the shop as a whole, for when nobody is on the rota.
+    """
+    for schedule in schedules:
+        for slot in schedule.slot_starts(business_hours, duration_minutes, step_minutes):
+            if not_before is not None and slot < not_before:
+                continue
+            free = [staff_id for staff_id in staff_ids
+                    if schedule.is_free(slot, duration_minutes, staff_id)]
+            if free:
+                yield slot, free
+
+
+def fetch_bookings(db, start, end):
+    # Plain range on appointment_date so the index can be used
+    query = """
+    SELECT id, staff_id, appointment_date, duration_minutes FROM appointments
+    WHERE appointment_date >= %s AND appointment_date < %s
+    AND status IN ('Pending', 'Approved')
+    """
+    return db.execute_query(query, (start, end))
+
+
+class ScheduleCache:
+    """Loaded day schedules shared by every AppointmentModel, kept current by its writes"""
+
+    def __init__(self, ttl=SCHEDULE_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.days = {}
+
+    def get_days(self, db, first_day, count=1, refresh=False):
+        # One range query loads every day that is missing or stale; None if it failed
+        days = [day_start(first_day) + timedelta(days=offset) for offset in range(count)]
+        now = time.monotonic()
+        with self.lock:
+            stale = [day for day in days
+                     if refresh or day not in self.days or now - self.days[day].loaded_at > self.ttl]
+        if stale:
+            rows = fetch_bookings(db, stale[0] - LOOKBACK, stale[-1] + timedelta(days=1))
+            if rows is False:
+                return None
+            fresh = {day: DaySchedule(day) for day in stale}
+            for row in rows:
+                start = to_datetime(row['appointment_date'])
+                for schedule in fresh.values():
+                    schedule.add(row['id'], row['staff_id'], start, row['duration_minutes'])
+            with self.lock:
+                self.days.update(fresh)
+        with self.lock:
+            return [self.days[day] for day in days]
+
+    def add(self, appointment_id, staff_id, start, duration_minutes):
+        with self.lock:
+            for schedule in self.days.values():
+                schedule.add(appointment_id, staff_id, start, duration_minutes)
+
+    def remove(self, appointment_id):
+        with self.lock:
+            for schedule in self.days.values():
+                schedule.remove(appointment_id)
+
+    def clear(self):
+        with self.lock:
+            self.days = {}
+
+
+schedule_cache = ScheduleCache()
@@ -1,3 +1,5 @@
+from database.pagination import fetch_page
+
 class SurrenderModel:
     def __init__(self, db):
         self.db = db
@@ -46,6 +48,21 @@ class SurrenderModel:
             """
             return self.db.execute_query(query)
     
+    def get_surrender_requests_page(self, page_size=50, after=None, status=None, with_total=False):
+        # Keyset page on (request_date, id), newest first
+        query = """
+        SELECT sr.*, u.first_name, u.last_name, u.email
+        FROM surrender_requests sr
+        JOIN users u ON sr.customer_id = u.id
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("sr.status = %s")
+            params.append(status)
+        return fetch_page(self.db, query, ['sr.request_date', 'sr.id'], ['request_date', 'id'],
+                          conditions, params, page_size, after,
+                          count_table='surrender_requests sr' if with_total else None)
+    
     def update_surrender_status(self, request_id, status, approved_by=None):
         query = "UPDATE surrender_requests SET status = %s, approved_by = %s WHERE id = %s"
         return self.db.execute_query(query, (status, approved_by, request_id))
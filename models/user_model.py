@@ -1,64 +1,73 @@
 # models/user_model.py
-import mysql.connector
-from mysql.connector import Error
+import threading
 from datetime import datetime
+from database.db_connection import DatabaseConnection
+from database.pagination import fetch_page
 
 class UserModel:
     def __init__(self, db=None):
-        self.db = db
-        self.connection = None
-        self.cursor = None
-        self._connect()
+        # Share the application's pooled connection instead of dialing our own
+        self.db = db or DatabaseConnection()
+        # Names/emails already looked up this session, keyed by user id. Panels call
+        # get_users_by_ids from DataLoader workers, so the cache is only touched under the lock
+        self._identity_cache = {}
+        self._identity_lock = threading.Lock()
     
-    def _connect(self):
-        try:
-            self.connection = mysql.connector.connect(
-                host='localhost',
-                user='root',
-                password='',
-                database='cuddle_corner',
-                autocommit=False
-            )
-            self.cursor = self.connection.cursor(dictionary=True)
-            return True
-        except Error:
-            # Try alternative database name
-            try:
-                self.connection = mysql.connector.connect(
-                    host='localhost',
-                    user='root',
-                    password='',
-                    database='petshop_db',
-                    autocommit=False
-                )
-                self.cursor = self.connection.cursor(dictionary=True)
-                return True
-            except Error:
-                return False
+    def _fetch_one(self, query, params):
+        result = self.db.execute_query(query, params)
+        return result[0] if result else None
     
-    def _ensure_connection(self):
-        if self.connection is None or not self.connection.is_connected():
-            if not self._connect():
-                raise Exception("Failed to establish database connection")
-        if self.cursor is None:
-            self.cursor = self.connection.cursor(dictionary=True)
+    def _update(self, query, params, user_id):
+        # MySQL counts only rows whose value changed, so re-saving the same value affects
+        # none; that is still a success as long as the user exists. execute_query reports
+        # both an error and no rows as False, so run it on a cursor of our own
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, params)
+                if cursor.rowcount > 0:
+                    return True
+                cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
+                return cursor.fetchone() is not None
+        except Exception as e:
+            print(f"Error updating user: {e}")
+            return False
     
     def get_user_by_id(self, user_id):
-        try:
-            self._ensure_connection()
-            query = "SELECT * FROM users WHERE id = %s"
-            self.cursor.execute(query, (user_id,))
-            return self.cursor.fetchone()
-        except Error:
-            return None
+        query = "SELECT * FROM users WHERE id = %s"
+        return self._fetch_one(query, (user_id,))
+    
+    def get_users_by_ids(self, user_ids):
+        # Resolve many users' identities with at most one query, reusing the session cache
+        user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id]
+        with self._identity_lock:
+            found = {user_id: self._identity_cache[user_id]
+                     for user_id in user_ids if user_id in self._identity_cache}
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        
+        if missing:
+            # Queried outside the lock; a racing lookup of the same ids only repeats the work
+            placeholders = ", ".join(["%s"] * len(missing))
+            query = f"""
+                SELECT id, username, email, first_name, last_name, role
+                FROM users WHERE id IN ({placeholders})
+            """
+            users = self.db.execute_query(query, tuple(missing)) or []
+            with self._identity_lock:
+                for user in users:
+                    self._identity_cache[user['id']] = user
+                    found[user['id']] = user
+        
+        return {user_id: found[user_id] for user_id in user_ids if user_id in found}
+    
+    def forget_user(self, user_id):
+        with self._identity_lock:
+            self._identity_cache.pop(user_id, None)
     
     def update_user(self, user_id, update_data):
         try:
             if not update_data:
                 return False
         
-            self._ensure_connection()
-        
             # Build the SET clause
             set_parts = []
             values = []
@@ -79,53 +88,30 @@ class UserModel:
             set_clause = ", ".join(set_parts)
             query = f"UPDATE users SET {set_clause} WHERE id = %s"
         
-            self.cursor.execute(query, values)
-            self.connection.commit()
-        
-            return self.cursor.rowcount > 0
+            updated = self._update(query, tuple(values), user_id)
+            # After the write, so a lookup racing it cannot cache the old name again
+            self.forget_user(user_id)
+            return updated
             
         except Exception:
-            try:
-                if self.connection:
-                    self.connection.rollback()
-            except:
-                pass
             return False
     
     def update_profile_image(self, user_id, image_path):
-        try:
-            self._ensure_connection()
-            query = "UPDATE users SET profile_image = %s WHERE id = %s"
-            self.cursor.execute(query, (image_path, user_id))
-            self.connection.commit()
-            return True
-        except Exception:
-            return False
+        query = "UPDATE users SET profile_image = %s WHERE id = %s"
+        return self._update(query, (image_path, user_id), user_id)
     
     def update_password(self, user_id, new_password):
-        try:
-            self._ensure_connection()
-            query = "UPDATE users SET password = %s WHERE id = %s"
-            self.cursor.execute(query, (new_password, user_id))
-            self.connection.commit()
-            return True
-        except Exception:
-            return False
+        query = "UPDATE users SET password = %s WHERE id = %s"
+        return self._update(query, (new_password, user_id), user_id)
     
     def authenticate(self, username, password):
         try:
-            self._ensure_connection()
-            
             # First try to get user by username
-            query = "SELECT * FROM users WHERE username = %s"
-            self.cursor.execute(query, (username,))
-            user = self.cursor.fetchone()
+            user = self.get_user_by_username(username)
             
             if not user:
                 # Try by email
-                query = "SELECT * FROM users WHERE email = %s"
-                self.cursor.execute(query, (username,))
-                user = self.cursor.fetchone()
+                user = self.get_user_by_email(username)
             
             if user:
                 # Check password (in production, use hashed password comparison)
@@ -140,27 +126,15 @@ class UserModel:
             return None
     
     def get_user_by_email(self, email):
-        try:
-            self._ensure_connection()
-            query = "SELECT * FROM users WHERE email = %s"
-            self.cursor.execute(query, (email,))
-            return self.cursor.fetchone()
-        except Error:
-            return None
+        query = "SELECT * FROM users WHERE email = %s"
+        return self._fetch_one(query, (email,))
     
     def get_user_by_username(self, username):
-        try:
-            self._ensure_connection()
-            query = "SELECT * FROM users WHERE username = %s"
-            self.cursor.execute(query, (username,))
-            return self.cursor.fetchone()
-        except Error:
-            return None
+        query = "SELECT * FROM users WHERE username = %s"
+        return self._fetch_one(query, (username,))
     
     def create_user(self, user_data):
         try:
-            self._ensure_connection()
-            
             # Check if username already exists
             if self.get_user_by_username(user_data.get('username')):
                 return None
@@ -188,61 +162,45 @@ class UserModel:
                 user_data.get('is_active', 1)
             )
             
-            self.cursor.execute(query, values)
-            self.connection.commit()
-            return self.cursor.lastrowid
+            user_id = self.db.execute_query(query, values)
+            return user_id or None
             
         except Exception:
-            try:
-                if self.connection:
-                    self.connection.rollback()
-            except:
-                pass
             return None
     
     def toggle_user_status(self, user_id, is_active):
-        try:
-            self._ensure_connection()
-            query = "UPDATE users SET is_active = %s WHERE id = %s"
-            self.cursor.execute(query, (1 if is_active else 0, user_id))
-            self.connection.commit()
-            return self.cursor.rowcount > 0
-        except Exception:
-            if self.connection:
-                self.connection.rollback()
-            return False
+        query = "UPDATE users SET is_active = %s WHERE id = %s"
+        return self._update(query, (1 if is_active else 0, user_id), user_id)
     
     def get_all_users(self, role_filter=None):
-        try:
-            self._ensure_connection()
-            
-            if role_filter:
-                query = "SELECT * FROM users WHERE role = %s ORDER BY id"
-                self.cursor.execute(query, (role_filter,))
-            else:
-                query = "SELECT * FROM users ORDER BY id"
-                self.cursor.execute(query)
-            
-            return self.cursor.fetchall()
-        except Exception:
-            return []
+        if role_filter:
+            query = "SELECT * FROM users WHERE role = %s ORDER BY id"
+            result = self.db.execute_query(query, (role_filter,))
+        else:
+            query = "SELECT * FROM users ORDER BY id"
+            result = self.db.execute_query(query)
+        
+        return result or []
+    
+    def get_users_page(self, role_filter=None, page_size=50, after=None, search=None,
+                       with_total=False):
+        # Keyset page on id; search matches username, name and email
+        conditions, params = [], []
+        if role_filter:
+            conditions.append("role = %s")
+            params.append(role_filter)
+        if search:
+            pattern = f"%{search}%"
+            conditions.append("(username LIKE %s OR first_name LIKE %s OR last_name LIKE %s OR email LIKE %s)")
+            params.extend([pattern] * 4)
+        return fetch_page(self.db, "SELECT * FROM users", ['id'], ['id'], conditions, params,
+                          page_size, after, descending=False,
+                          count_table='users' if with_total else None)
     
     def refresh_user(self, user_id):
-        try:
-            # Close and reopen connection
-            self.close()
-            self._connect()
-        
-            # Fetch fresh user data
-            return self.get_user_by_id(user_id)
-        except Exception:
-            return None
+        # Pooled connections autocommit, so a plain read already sees fresh data
+        return self.get_user_by_id(user_id)
     
     def close(self):
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.connection and self.connection.is_connected():
-                self.connection.close()
-        except Exception:
-            pass
+        # Connections belong to the shared pool; nothing to tear down here
+        pass
@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Import this module first so timings start as close to process start as possible
+_started = time.perf_counter()
+_enabled = os.getenv('STARTUP_TRACE', '') not in ('', '0') or '--trace-startup' in sys.argv
+_events = []
+# Spans are also recorded from the preload thread
+_lock = threading.Lock()
+_reported = False
+
+
+def enabled():
+    return _enabled
+
+
+def elapsed_ms():
+    return (time.perf_counter() - _started) * 1000
+
+
+def mark(label):
+    # A point in time, e.g. "first paint"
+    if _enabled:
+        with _lock:
+            _events.append((elapsed_ms(), 0.0, label))
+
+
+@contextmanager
+def span(label):
+    # Time an import or a constructor
+    if not _enabled:
+        yield
+        return
+    started = elapsed_ms()
+    try:
+        yield
+    finally:
+        with _lock:
+            _events.append((started, elapsed_ms() - started, label))
+
+
+def report(budget_ms=None):
+    # Printed once per process, from a snapshot of whatever has been recorded so far
+    global _reported
+    if not _enabled:
+        return None
+    with _lock:
+        if _reported:
+            return None
+        _reported = True
+        events = list(_events)
+    if budget_ms is None:
+        budget_ms = float(os.getenv('STARTUP_BUDGET_MS', '0')) or None
+
+    lines = ["Startup trace (ms since launch)"]
+    for at, duration, label in sorted(events):
+        if duration:
+            lines.append(f"  {at:8.1f}  {duration:8.1f}  {label}")
+        else:
+            lines.append(f"  {at:8.1f}            {label}")
+
+    first_paint = next((at for at, duration, label in events if label == 'first paint'), None)
+    if budget_ms and first_paint is not None:
+        verdict = "within" if first_paint <= budget_ms else "OVER"
+        lines.append(f"First paint at {first_paint:.1f}ms, {verdict} the {budget_ms:.0f}ms budget")
+
+    text = "\n".join(lines)
+    path = os.getenv('STARTUP_TRACE_LOG')
+    if path:
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text, file=sys.stderr)
+    return text
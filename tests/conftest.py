@@ -0,0 +1,57 @@
+import os
+import sys
+import pytest
+
+# Run from anywhere: the packages live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import sqlite_backend
+
+
+class SQLiteDatabase:
+    """A single SQLite connection with DatabaseConnection's execute_query, for pure-SQL helpers"""
+
+    backend = 'sqlite'
+
+    def __init__(self, path):
+        self.connection = sqlite_backend.connect(path)
+
+    def execute_query(self, query, params=None):
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(query, params)
+        result = cursor.fetchall() if cursor.with_rows else cursor.rowcount > 0
+        cursor.close()
+        return result
+
+    def iter_query(self, query, params=None, chunk_size=500):
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
+
+    def execute_many(self, query, seq_params):
+        # One transaction per call; False if the database rejected it, as in DatabaseConnection
+        self.connection.start_transaction()
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, list(seq_params))
+            self.connection.commit()
+            return cursor.rowcount
+        except sqlite_backend.Error:
+            self.connection.rollback()
+            return False
+        finally:
+            cursor.close()
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "test.db"))
+    yield db
+    db.connection.close()
@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import pytest
+from models.catalog_io import export_catalog, import_catalog
+
+
+@pytest.fixture
+def products(sqlite_db):
+    sqlite_db.execute_query("""
+    CREATE TABLE products (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        sku VARCHAR(64) NULL UNIQUE,
+        name VARCHAR(100) NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        description TEXT,
+        price DECIMAL(10,2) NOT NULL,
+        quantity INT NOT NULL DEFAULT 0,
+        reorder_level INT NOT NULL DEFAULT 5,
+        image_path VARCHAR(255)
+    )
+    """)
+    return sqlite_db
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def stock(db):
+    return {row['sku']: row for row in db.execute_query("SELECT * FROM products")}
+
+
+def test_reimport_without_quantity_keeps_stock(products, tmp_path):
+    full = write(tmp_path, "full.csv",
+                 "sku,name,category,description,price,quantity,reorder_level\n"
+                 "DOG-1,Dog Food,Food,Kibble,10.00,40,8\n"
+                 "CAT-1,Cat Toy,Toys,Mouse,3.50,12,2\n")
+    assert import_catalog(products, 'products', full)['written'] == 2
+
+    prices = write(tmp_path, "prices.csv",
+                   "sku,name,category,price\n"
+                   "DOG-1,Dog Food,Food,11.25\n"
+                   "NEW-1,Leash,Accessories,7.00\n")
+    result = import_catalog(products, 'products', prices)
+    assert result['written'] == 2 and result['errors'] == []
+
+    rows = stock(products)
+    assert float(rows['DOG-1']['price']) == 11.25
+    assert rows['DOG-1']['quantity'] == 40
+    assert rows['DOG-1']['reorder_level'] == 8
+    assert rows['DOG-1']['description'] == "Kibble"
+    assert rows['CAT-1']['quantity'] == 12
+    # New products still get the defaults
+    assert rows['NEW-1']['quantity'] == 0
+    assert rows['NEW-1']['reorder_level'] == 5
+
+
+def test_blank_cells_and_missing_json_keys_leave_fields_alone(products, tmp_path):
+    import_catalog(products, 'products', write(
+        tmp_path, "full.csv", "sku,name,category,price,quantity\nDOG-1,Dog Food,Food,10,40\nCAT-1,Cat Toy,Toys,3,12\n"))
+    import_catalog(products, 'products', write(
+        tmp_path, "update.jsonl",
+        '{"sku": "DOG-1", "name": "Dog Food", "category": "Food", "price": 9, "quantity": 5}\n'
+        '{"sku": "CAT-1", "name": "Cat Toy", "category": "Toys", "price": 4, "quantity": ""}\n'))
+    rows = stock(products)
+    assert rows['DOG-1']['quantity'] == 5
+    assert rows['CAT-1']['quantity'] == 12
+    assert float(rows['CAT-1']['price']) == 4
+
+
+@pytest.mark.parametrize('price', ["NaN", "Infinity", "-Infinity", "1e400", "abc", "-1"])
+def test_bad_prices_are_one_bad_line(products, tmp_path, price):
+    path = write(tmp_path, "prices.csv",
+                 f"sku,name,category,price\nA-1,Good,Food,2\nB-1,Bad,Food,{price}\nC-1,Good too,Toys,3\n")
+    result = import_catalog(products, 'products', path)
+    assert result['written'] == 2
+    assert [line for line, message in result['errors']] == [3]
+    assert result['errors'][0][1].startswith("price")
+    assert set(stock(products)) == {'A-1', 'C-1'}
+
+
+def test_unreadable_lines_are_reported_and_skipped(products, tmp_path):
+    jsonl = tmp_path / "rows.jsonl"
+    jsonl.write_bytes(b'{"sku": "A-1", "name": "Good", "category": "Food", "price": 2}\n'
+                      b'{"sku": "B-1", "name": \n'
+                      b'{"sku": "C-1", "name": "Caf\xe9", "category": "Food", "price": 2}\n'
+                      b'{"sku": "D-1", "name": "Good too", "category": "Toys", "price": 3}\n')
+    result = import_catalog(products, 'products', str(jsonl))
+    assert result['written'] == 2
+    assert [line for line, message in result['errors']] == [2, 3]
+
+    csv_file = tmp_path / "rows.csv"
+    csv_file.write_bytes(b'\xef\xbb\xbfsku,name,category,price\n'
+                         b'E-1,Caf\xe9,Food,2\n'
+                         b'F-1,"Two\nlines",Toys,3\n')
+    result = import_catalog(products, 'products', str(csv_file))
+    assert result['written'] == 1
+    assert [line for line, message in result['errors']] == [2]
+    assert stock(products)['F-1']['name'] == "Two\nlines"
+
+
+def test_broken_json_array_is_one_error(products, tmp_path):
+    path = write(tmp_path, "rows.json", '[{"sku": "A-1", "name": "Good", "category": "Food", "price": 2},\n{oops}]')
+    result = import_catalog(products, 'products', path)
+    assert result['written'] == 0
+    assert [line for line, message in result['errors']] == [2]
+
+
+def test_export_round_trips(products, tmp_path):
+    source = write(tmp_path, "full.csv", "sku,name,category,price,quantity\nDOG-1,Dog Food,Food,10,40\n")
+    import_catalog(products, 'products', source)
+    exported = str(tmp_path / "out.jsonl")
+    assert export_catalog(products, 'products', exported) == 1
+    assert json.loads(open(exported, encoding='utf-8').read())['quantity'] == 40
+
+
+def test_failed_export_keeps_the_old_file(products, tmp_path, monkeypatch):
+    import_catalog(products, 'products', write(
+        tmp_path, "full.csv", "sku,name,category,price\nA-1,One,Food,1\nB-1,Two,Food,2\n"))
+    target = write(tmp_path, "out.csv", "previous export\n")
+
+    def broken_stream(query, params=None, chunk_size=500):
+        yield products.execute_query(query)[:1]
+        raise sqlite3.OperationalError("connection lost")
+
+    monkeypatch.setattr(products, 'iter_query', broken_stream)
+    with pytest.raises(sqlite3.OperationalError):
+        export_catalog(products, 'products', target)
+    assert open(target, encoding='utf-8').read() == "previous export\n"
+    assert not os.path.exists(target + ".tmp")
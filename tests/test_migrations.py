@@ -0,0 +1,55 @@
+from database.migrations import MIGRATIONS, SCHEMA_FILE, split_statements
+
+
+def test_splits_on_statement_ends():
+    assert split_statements("SELECT 1; SELECT 2;\n\nSELECT 3") == ["SELECT 1", "SELECT 2", "SELECT 3"]
+
+
+def test_semicolons_inside_literals_are_kept():
+    sql = "INSERT INTO t VALUES ('a;b', \"c;d\"); UPDATE t SET x = `we;ird`"
+    assert split_statements(sql) == [
+        "INSERT INTO t VALUES ('a;b', \"c;d\")",
+        "UPDATE t SET x = `we;ird`",
+    ]
+
+
+def test_escaped_and_doubled_quotes_do_not_end_a_literal():
+    sql = r"INSERT INTO t VALUES ('it\'s; fine'); INSERT INTO t VALUES ('it''s; fine too')"
+    assert split_statements(sql) == [
+        r"INSERT INTO t VALUES ('it\'s; fine')",
+        "INSERT INTO t VALUES ('it''s; fine too')",
+    ]
+
+
+def test_comments_are_dropped_with_their_semicolons():
+    sql = """
+    -- first; not a statement end
+    CREATE TABLE a (id INT); # hash comment; also ignored
+    /* block; comment */ CREATE TABLE b (id INT);
+    """
+    assert split_statements(sql) == ["CREATE TABLE a (id INT)", "CREATE TABLE b (id INT)"]
+
+
+def test_double_dash_needs_whitespace_to_start_a_comment():
+    assert split_statements("SELECT 5--1; SELECT 2") == ["SELECT 5--1", "SELECT 2"]
+
+
+def test_empty_statements_are_skipped():
+    assert split_statements(" ;; \n -- only a comment\n ;") == []
+
+
+def test_baseline_schema_runs_statement_by_statement(sqlite_db):
+    with open(SCHEMA_FILE, 'r') as file:
+        statements = split_statements(file.read())
+    # A statement split in the wrong place raises here
+    for statement in statements:
+        sqlite_db.execute_query(statement)
+    tables = {row['name'] for row in sqlite_db.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'users', 'pets', 'products', 'orders', 'order_items', 'appointments'} <= tables
+
+
+def test_migration_versions_are_unique_and_increasing():
+    versions = [version for version, description, step in MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+import pytest
+from database.pagination import fetch_page, keyset_predicate
+
+SELECT = "SELECT id, customer_id, order_date FROM orders_page"
+
+
+@pytest.fixture
+def orders(sqlite_db):
+    sqlite_db.execute_query("""
+    CREATE TABLE orders_page (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        customer_id INT NOT NULL,
+        order_date DATETIME NOT NULL
+    )
+    """)
+    # Runs of identical timestamps, so pages must break ties on id
+    first = datetime(2025, 1, 1, 9, 0)
+    for number in range(23):
+        sqlite_db.execute_query(
+            "INSERT INTO orders_page (customer_id, order_date) VALUES (%s, %s)",
+            (number % 2, first + timedelta(minutes=number // 5))
+        )
+    return sqlite_db
+
+
+def all_pages(db, page_size, **kwargs):
+    pages, after = [], None
+    while True:
+        page = fetch_page(db, SELECT, ['order_date', 'id'], ['order_date', 'id'],
+                          page_size=page_size, after=after, **kwargs)
+        pages.append(page['rows'])
+        after = page['next_cursor']
+        if after is None:
+            return pages
+
+
+def test_predicate_spells_out_row_comparison():
+    predicate, params = keyset_predicate(['a', 'b', 'c'], (1, 2, 3))
+    assert predicate == "((a < %s) OR (a = %s AND b < %s) OR (a = %s AND b = %s AND c < %s))"
+    assert params == [1, 1, 2, 1, 2, 3]
+    predicate, params = keyset_predicate(['a', 'b'], (1, 2), descending=False)
+    assert predicate == "((a > %s) OR (a = %s AND b > %s))"
+    assert params == [1, 1, 2]
+
+
+@pytest.mark.parametrize('page_size', [1, 3, 5, 7, 23, 50])
+def test_pages_cover_tied_keys_exactly_once(orders, page_size):
+    pages = all_pages(orders, page_size)
+    rows = [row for page in pages for row in page]
+    expected = sorted(orders.execute_query(SELECT), key=lambda row: (row['order_date'], row['id']), reverse=True)
+    assert [row['id'] for row in rows] == [row['id'] for row in expected]
+    assert all(len(page) == page_size for page in pages[:-1])
+
+
+def test_ascending_pages(orders):
+    rows = [row for page in all_pages(orders, 4, descending=False) for row in page]
+    assert [row['id'] for row in rows] == list(range(1, 24))
+
+
+def test_cursor_only_when_more_rows_exist(orders):
+    page = fetch_page(orders, SELECT, ['order_date', 'id'], ['order_date', 'id'], page_size=23)
+    assert len(page['rows']) == 23
+    assert page['next_cursor'] is None
+    page = fetch_page(orders, SELECT, ['order_date', 'id'], ['order_date', 'id'], page_size=22)
+    assert page['next_cursor'] == (page['rows'][-1]['order_date'], page['rows'][-1]['id'])
+
+
+def test_filters_apply_to_every_page_and_the_total(orders):
+    pages = all_pages(orders, 4, conditions=["customer_id = %s"], params=[1],
+                      count_table="orders_page")
+    rows = [row for page in pages for row in page]
+    assert {row['customer_id'] for row in rows} == {1}
+    assert len(rows) == 11
+    page = fetch_page(orders, SELECT, ['order_date', 'id'], ['order_date', 'id'], ["customer_id = %s"], [1],
+                      page_size=4, count_table="orders_page")
+    assert page['total'] == 11
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta
+from models.schedule import BookingIntervals, DaySchedule, day_bounds, day_start, iter_free_slots
+
+DAY = datetime(2025, 3, 10)
+
+
+def at(hour, minute=0):
+    return DAY.replace(hour=hour, minute=minute)
+
+
+def test_intervals_are_half_open():
+    intervals = BookingIntervals()
+    intervals.add(1, at(10), at(11))
+    # Touching either end is not an overlap
+    assert not intervals.overlaps(at(11), at(11, 30))
+    assert not intervals.overlaps(at(9, 30), at(10))
+    # One minute into the booking is
+    assert intervals.overlaps(at(10, 59), at(11, 30))
+    assert intervals.overlaps(at(9, 30), at(10, 1))
+    assert intervals.overlaps(at(10, 15), at(10, 45))
+    assert intervals.overlaps(at(9), at(12))
+
+
+def test_long_booking_found_from_far_behind():
+    # Only starts within the longest booking's length are scanned, so that must cover it
+    intervals = BookingIntervals()
+    intervals.add(1, at(9), at(9, 15))
+    intervals.add(2, at(9, 30), at(12, 30))
+    assert intervals.overlaps(at(12), at(12, 15))
+    assert not intervals.overlaps(at(12, 30), at(13))
+
+
+def test_ignore_id_and_remove():
+    intervals = BookingIntervals()
+    intervals.add(1, at(10), at(11))
+    intervals.add(2, at(10), at(10, 30))
+    assert intervals.overlaps(at(10), at(10, 30), ignore_id=1)
+    intervals.remove(2, at(10))
+    assert not intervals.overlaps(at(10), at(10, 30), ignore_id=1)
+    assert intervals.overlaps(at(10), at(10, 30))
+
+
+def test_day_keeps_bookings_running_in_from_the_night_before():
+    schedule = DaySchedule(DAY)
+    schedule.add(1, None, DAY - timedelta(minutes=30), 90)
+    schedule.add(2, None, DAY - timedelta(hours=2), 60)
+    assert 1 in schedule.bookings
+    assert 2 not in schedule.bookings
+    assert not schedule.is_free(at(0, 30), 30)
+    assert schedule.is_free(at(1), 30)
+
+
+def test_staff_is_busy_with_their_own_and_unassigned_bookings():
+    schedule = DaySchedule(DAY)
+    schedule.add(1, 7, at(10), 60)
+    schedule.add(2, None, at(14), 30)
+    assert not schedule.is_free(at(10, 30), 30, staff_id=7)
+    assert schedule.is_free(at(10, 30), 30, staff_id=8)
+    assert not schedule.is_free(at(14), 30, staff_id=8)
+    assert not schedule.is_free(at(10, 30), 30)
+    assert schedule.is_free(at(11), 60, staff_id=7)
+
+
+def test_removed_booking_frees_the_slot():
+    schedule = DaySchedule(DAY)
+    schedule.add(1, 7, at(10), 60)
+    schedule.remove(1)
+    assert schedule.is_free(at(10), 60, staff_id=7)
+    schedule.remove(1)
+
+
+def test_free_slots_fit_before_closing():
+    schedule = DaySchedule(DAY)
+    schedule.add(1, None, at(9), 60)
+    slots = schedule.free_slots(duration_minutes=60, business_hours=(9, 12), step_minutes=30)
+    assert slots == [at(10), at(10, 30), at(11)]
+
+
+def test_iter_free_slots_lists_free_staff_earliest_first():
+    first, second = DaySchedule(DAY), DaySchedule(DAY + timedelta(days=1))
+    first.add(1, 7, at(9), 60)
+    slots = list(iter_free_slots([first, second], [7, 8], 60, business_hours=(9, 11), step_minutes=60,
+                                 not_before=at(9)))
+    assert slots == [
+        (at(9), [8]),
+        (at(10), [7, 8]),
+        (at(9) + timedelta(days=1), [7, 8]),
+        (at(10) + timedelta(days=1), [7, 8]),
+    ]
+
+
+def test_day_helpers_accept_str_date_and_datetime():
+    for value in ("2025-03-10", date(2025, 3, 10), at(15, 45)):
+        assert day_start(value) == DAY
+    assert day_bounds(date(2025, 3, 10), "2025-03-12") == (DAY, DAY + timedelta(days=3))
@@ -0,0 +1,64 @@
+from ui.panels.search_index import SearchIndex, tokenize
+
+ITEMS = [
+    ('product', 1, {'name': "Premium Dog Food", 'category': "Food"}),
+    ('product', 2, {'name': "Dog Leash", 'category': "Accessories"}),
+    ('product', 3, {'name': "Cat Toy Mouse", 'category': "Toys"}),
+    ('pet', 1, {'name': "Buddy", 'species': "Dog", 'breed': "Golden Retriever"}),
+]
+
+
+def build():
+    index = SearchIndex()
+    index.rebuild(((kind, item_id), record) for kind, item_id, record in ITEMS)
+    return index
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation():
+    assert tokenize("Cat-Toy, MOUSE!") == ['cat', 'toy', 'mouse']
+
+
+def test_blank_search_means_no_filter():
+    assert build().search("   ") is None
+
+
+def test_prefix_matches_token_starts_only():
+    index = build()
+    assert index.search("do") == {('product', 1), ('product', 2), ('pet', 1)}
+    assert index.search("og") == set()
+
+
+def test_every_term_must_match():
+    index = build()
+    assert index.search("dog food") == {('product', 1)}
+    assert index.search("golden dog") == {('pet', 1)}
+    assert index.search("dog toy") == set()
+
+
+def test_search_looks_at_category_and_breed():
+    index = build()
+    assert index.search("accessories") == {('product', 2)}
+    assert index.search("retr") == {('pet', 1)}
+
+
+def test_update_replaces_old_tokens():
+    index = build()
+    index.update(('product', 2), {'name': "Cat Leash", 'category': "Accessories"})
+    assert index.search("dog leash") == set()
+    assert index.search("cat leash") == {('product', 2)}
+
+
+def test_update_adds_new_key_with_new_tokens():
+    index = build()
+    index.update(('product', 4), {'name': "Zebra Finch Seed", 'category': "Food"})
+    assert index.search("zeb") == {('product', 4)}
+    assert index.search("food") == {('product', 1), ('product', 4)}
+
+
+def test_discard_removes_key():
+    index = build()
+    index.discard(('pet', 1))
+    assert index.search("buddy") == set()
+    assert index.search("dog") == {('product', 1), ('product', 2)}
+    # Unknown keys are ignored
+    index.discard(('pet', 99))
@@ -0,0 +1,80 @@
+from database.sqlite_backend import split_top_level, translate
+
+
+def test_positional_and_named_placeholders():
+    assert translate("SELECT * FROM t WHERE a = %s AND b = %s") == "SELECT * FROM t WHERE a = ? AND b = ?"
+    assert translate("UPDATE t SET a = %(a)s WHERE id = %(id)s") == "UPDATE t SET a = :a WHERE id = :id"
+    assert translate("SELECT * FROM t WHERE name LIKE '%s' OR a LIKE %s") == \
+        "SELECT * FROM t WHERE name LIKE '%s' OR a LIKE ?"
+    assert translate("SELECT 100 %% 7 AS r WHERE a = %s") == "SELECT 100 % 7 AS r WHERE a = ?"
+
+
+def test_on_duplicate_key_becomes_upsert():
+    query = ("INSERT INTO daily_sales (sales_date, revenue) VALUES (%s, %s) "
+             "ON DUPLICATE KEY UPDATE revenue = revenue + VALUES(revenue), order_count = VALUES(order_count)")
+    assert translate(query) == (
+        "INSERT INTO daily_sales (sales_date, revenue) VALUES (?, ?) "
+        "ON CONFLICT DO UPDATE SET revenue = revenue + excluded.revenue, order_count = excluded.order_count"
+    )
+
+
+def test_group_concat_separator_and_order_by():
+    assert translate("SELECT GROUP_CONCAT(name ORDER BY name SEPARATOR ', ') FROM t") == \
+        "SELECT GROUP_CONCAT(name, ', ') FROM t"
+    assert translate("SELECT GROUP_CONCAT(name) FROM t") == "SELECT GROUP_CONCAT(name, ',') FROM t"
+
+
+def test_concat_becomes_operator_including_nested():
+    assert translate("SELECT CONCAT(first_name, ' ', last_name) AS full_name FROM users") == \
+        "SELECT (first_name || ' ' || last_name) AS full_name FROM users"
+    assert translate("SELECT GROUP_CONCAT(CONCAT(quantity, 'x ', name) SEPARATOR '; ') FROM items") == \
+        "SELECT GROUP_CONCAT((quantity || 'x ' || name), '; ') FROM items"
+
+
+def test_function_names_inside_literals_are_left_alone():
+    assert translate("SELECT 'CONCAT(a, b) FOR UPDATE' AS note") == "SELECT 'CONCAT(a, b) FOR UPDATE' AS note"
+
+
+def test_for_update_is_dropped():
+    assert translate("SELECT quantity FROM products WHERE id = %s FOR UPDATE") == \
+        "SELECT quantity FROM products WHERE id = ?"
+
+
+def test_show_tables_reads_sqlite_master():
+    assert translate("SHOW TABLES LIKE %s") == \
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?"
+
+
+def test_mysql_dialect_statements():
+    assert translate("SELECT NOW(), CURDATE()") == "SELECT datetime('now', 'localtime'), date('now', 'localtime')"
+    assert translate("INSERT IGNORE INTO t (a) VALUES (%s)") == "INSERT OR IGNORE INTO t (a) VALUES (?)"
+    assert translate("SET FOREIGN_KEY_CHECKS = 0") == "PRAGMA foreign_keys = 0"
+    assert translate("ANALYZE TABLE t") == "ANALYZE t"
+    assert translate("EXPLAIN SELECT * FROM t") == "EXPLAIN QUERY PLAN SELECT * FROM t"
+    assert translate("DROP INDEX idx_a ON t") == "DROP INDEX IF EXISTS idx_a"
+
+
+def test_table_definitions():
+    query = ("CREATE TABLE t (id INT AUTO_INCREMENT PRIMARY KEY, "
+             "status ENUM('Pending', 'Done') DEFAULT 'Pending', "
+             "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP)")
+    assert translate(query) == (
+        "CREATE TABLE t (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "status TEXT DEFAULT 'Pending', "
+        "updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')))"
+    )
+
+
+def test_split_top_level_skips_parentheses_and_literals():
+    assert split_top_level("a, f(b, c), 'd, e', \"(\", g") == ["a", "f(b, c)", "'d, e'", "\"(\"", "g"]
+
+
+def test_translated_upsert_runs(sqlite_db):
+    sqlite_db.execute_query("CREATE TABLE totals (day DATE PRIMARY KEY, amount DECIMAL(10,2) NOT NULL)")
+    query = ("INSERT INTO totals (day, amount) VALUES (%s, %s) "
+             "ON DUPLICATE KEY UPDATE amount = amount + VALUES(amount)")
+    sqlite_db.execute_query(query, ('2025-01-01', 5))
+    sqlite_db.execute_query(query, ('2025-01-01', 7))
+    rows = sqlite_db.execute_query("SELECT day, amount FROM totals")
+    assert len(rows) == 1
+    assert float(rows[0]['amount']) == 12
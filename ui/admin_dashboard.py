@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QStackedWidget, QFrame,
+                             QLabel, QPushButton, QFrame,
                              QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QIcon, QPixmap
@@ -13,6 +13,7 @@ from ui.panels.sales_panel import SalesPanel
 from ui.panels.reports_panel import ReportsPanel
 from ui.panels.adoption_panel import AdoptionPanel
 from ui.panels.surrender_management_panel import SurrenderManagementPanel
+from ui.lazy_panel_stack import LazyPanelStack
 
 class AdminDashboard(QMainWindow):
     logout_signal = pyqtSignal()
@@ -214,7 +215,7 @@ class AdminDashboard(QMainWindow):
     
     def create_main_content(self, main_layout):
         # Create stacked widget for panels
-        self.stacked_panels = QStackedWidget()
+        self.stacked_panels = LazyPanelStack()
         self.stacked_panels.setStyleSheet("""
             QStackedWidget {
                 background: #f8f9fa;
@@ -222,26 +223,19 @@ class AdminDashboard(QMainWindow):
             }
         """)
         
-        # Create and add panels
-        self.pet_panel = PetManagementPanel(self.db, self.user_id)
-        self.inventory_panel = InventoryPanel(self.db, 'admin')
-        self.staff_panel = StaffManagementPanel(self.db)
-        self.customer_panel = CustomerManagementPanel(self.db)
-        self.appointment_panel = AppointmentPanel(self.db, 'admin')
-        self.sales_panel = SalesPanel(self.db, 'admin')
-        self.adoption_panel = AdoptionPanel(self.db, 'admin')
-        self.surrender_panel = SurrenderManagementPanel(self.db, self.user_id)
-        self.reports_panel = ReportsPanel(self.db)
+        # Panels are built on first visit, so login only waits for the landing panel
+        self.stacked_panels.register('pet_management', lambda: PetManagementPanel(self.db, self.user_id))
+        self.stacked_panels.register('inventory', lambda: InventoryPanel(self.db, 'admin'))
+        self.stacked_panels.register('staff_management', lambda: StaffManagementPanel(self.db))
+        self.stacked_panels.register('customer_management', lambda: CustomerManagementPanel(self.db))
+        self.stacked_panels.register('appointments', lambda: AppointmentPanel(self.db, 'admin'))
+        self.stacked_panels.register('sales', lambda: SalesPanel(self.db, 'admin'))
+        self.stacked_panels.register('adoption', lambda: AdoptionPanel(self.db, 'admin'))
+        self.stacked_panels.register('surrender', lambda: SurrenderManagementPanel(self.db, self.user_id))
+        self.stacked_panels.register('reports', lambda: ReportsPanel(self.db))
         
-        self.stacked_panels.addWidget(self.pet_panel)
-        self.stacked_panels.addWidget(self.inventory_panel)
-        self.stacked_panels.addWidget(self.staff_panel)
-        self.stacked_panels.addWidget(self.customer_panel)
-        self.stacked_panels.addWidget(self.appointment_panel)
-        self.stacked_panels.addWidget(self.sales_panel)
-        self.stacked_panels.addWidget(self.adoption_panel)
-        self.stacked_panels.addWidget(self.surrender_panel)
-        self.stacked_panels.addWidget(self.reports_panel)
+        self.stacked_panels.show_panel('pet_management')
+        self.stacked_panels.prefetch(['sales', 'inventory'])
         
         main_layout.addWidget(self.stacked_panels, 1)
     
@@ -257,20 +251,7 @@ class AdminDashboard(QMainWindow):
         button.setChecked(True)
         
         # Switch to corresponding panel
-        panel_map = {
-            'pet_management': 0,
-            'inventory': 1,
-            'staff_management': 2,
-            'customer_management': 3,
-            'appointments': 4,
-            'sales': 5,
-            'adoption': 6,
-            'surrender': 7,
-            'reports': 8
-        }
-        
-        if panel_name in panel_map:
-            self.stacked_panels.setCurrentIndex(panel_map[panel_name])
+        self.stacked_panels.show_panel(panel_name)
     
     def logout(self):
         reply = QMessageBox.question(self, 'Confirm Logout', 
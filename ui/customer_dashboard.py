@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QStackedWidget, QFrame,
+                             QLabel, QPushButton, QFrame,
                              QMessageBox)
 import os
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
@@ -12,6 +12,7 @@ from ui.panels.adoption_request_panel import AdoptionRequestPanel
 from ui.panels.profile_panel import ProfilePanel
 from ui.panels.order_history_panel import OrderHistoryPanel
 from ui.panels.surrender_panel import SurrenderPanel
+from ui.lazy_panel_stack import LazyPanelStack
 
 class CustomerDashboard(QMainWindow):
     logout_signal = pyqtSignal()
@@ -236,7 +237,7 @@ class CustomerDashboard(QMainWindow):
             sidebar.setStyleSheet("background: #8e44ad;")
     
     def create_main_content(self, main_layout):
-        self.stacked_panels = QStackedWidget()
+        self.stacked_panels = LazyPanelStack()
         self.stacked_panels.setStyleSheet("""
             QStackedWidget {
                 background: #f8f9fa;
@@ -244,23 +245,18 @@ class CustomerDashboard(QMainWindow):
             }
         """)
         
-        self.pets_panel = CustomerPetsPanel(self.db, self.user_id)
-        self.products_panel = CustomerProductsPanel(self.db, self.user_id)
-        self.cart_panel = CartPanel(self.db, self.user_id)
-        self.adoption_panel = AdoptionRequestPanel(self.db, self.user_id)
-        self.surrender_panel = SurrenderPanel(self.db, self.user_id)
-        self.appointments_panel = CustomerAppointmentsPanel(self.db, self.user_id)
-        self.order_history_panel = OrderHistoryPanel(self.db, self.user_id)
-        self.profile_panel = ProfilePanel(self.db, self.user_id)
+        # Panels are built on first visit, so login only waits for the landing panel
+        self.stacked_panels.register('pets', lambda: CustomerPetsPanel(self.db, self.user_id))
+        self.stacked_panels.register('products', lambda: CustomerProductsPanel(self.db, self.user_id))
+        self.stacked_panels.register('cart', lambda: CartPanel(self.db, self.user_id))
+        self.stacked_panels.register('adoption', lambda: AdoptionRequestPanel(self.db, self.user_id))
+        self.stacked_panels.register('surrender', lambda: SurrenderPanel(self.db, self.user_id))
+        self.stacked_panels.register('appointments', lambda: CustomerAppointmentsPanel(self.db, self.user_id))
+        self.stacked_panels.register('order_history', lambda: OrderHistoryPanel(self.db, self.user_id))
+        self.stacked_panels.register('profile', lambda: ProfilePanel(self.db, self.user_id))
         
-        self.stacked_panels.addWidget(self.pets_panel)
-        self.stacked_panels.addWidget(self.products_panel)
-        self.stacked_panels.addWidget(self.cart_panel)
-        self.stacked_panels.addWidget(self.adoption_panel)
-        self.stacked_panels.addWidget(self.surrender_panel)
-        self.stacked_panels.addWidget(self.appointments_panel)
-        self.stacked_panels.addWidget(self.order_history_panel)
-        self.stacked_panels.addWidget(self.profile_panel)
+        self.stacked_panels.show_panel('pets')
+        self.stacked_panels.prefetch(['products', 'cart'])
         
         main_layout.addWidget(self.stacked_panels, 1)
     
@@ -273,19 +269,7 @@ class CustomerDashboard(QMainWindow):
         
         button.setChecked(True)
         
-        panel_map = {
-            'pets': 0,
-            'products': 1,
-            'cart': 2,
-            'adoption': 3,
-            'surrender': 4,
-            'appointments': 5,
-            'order_history': 6,
-            'profile': 7
-        }
-        
-        if panel_name in panel_map:
-            self.stacked_panels.setCurrentIndex(panel_map[panel_name])
+        self.stacked_panels.show_panel(panel_name)
     
     def logout(self):
         reply = QMessageBox.question(self, 'Confirm Logout', 
@@ -0,0 +1,51 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QStackedWidget
+
+
+class LazyPanelStack(QStackedWidget):
+    """Stacked widget that builds each panel the first time it is shown"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.factories = {}
+        self.panels = {}
+        self.prefetch_queue = []
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def panel(self, name):
+        if name not in self.panels:
+            panel = self.factories[name]()
+            self.panels[name] = panel
+            self.addWidget(panel)
+        return self.panels[name]
+
+    def show_panel(self, name):
+        if name not in self.factories:
+            return None
+
+        # Loads still running for the panel being left are parked until it is shown again
+        previous = self.currentWidget()
+        if hasattr(previous, 'loader'):
+            previous.loader.suspend()
+
+        current = self.panel(name)
+        self.setCurrentWidget(current)
+        if hasattr(current, 'loader'):
+            current.loader.resume()
+        return current
+
+    def prefetch(self, names, delay_ms=1500):
+        # Build likely next panels one at a time once the window has gone idle
+        self.prefetch_queue = [name for name in names if name in self.factories]
+        QTimer.singleShot(delay_ms, self._prefetch_next)
+
+    def _prefetch_next(self):
+        while self.prefetch_queue:
+            name = self.prefetch_queue.pop(0)
+            if name not in self.panels:
+                self.panel(name)
+                break
+        if self.prefetch_queue:
+            QTimer.singleShot(0, self._prefetch_next)
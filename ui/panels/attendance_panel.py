@@ -1,9 +1,32 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton,
                              QDateEdit, QMessageBox, QHeaderView, QGroupBox)
 from PyQt6.QtCore import QDateTime, Qt
 from datetime import datetime
 from models.attendance_model import AttendanceModel
+from ui.panels.table_model import RowTableModel, Column, create_table_view
+
+# Status -> (label, text colour, cell colour)
+ATTENDANCE_STATUS = {
+    0: ("Absent", Qt.GlobalColor.white, Qt.GlobalColor.darkRed),
+    1: ("In Progress", Qt.GlobalColor.black, Qt.GlobalColor.yellow),
+    2: ("Completed", Qt.GlobalColor.white, Qt.GlobalColor.darkGreen),
+}
+
+def attendance_status(record):
+    if record['check_in'] and record['check_out']:
+        return 2
+    if record['check_in']:
+        return 1
+    return 0
+
+def format_clock(value):
+    # Handle datetime objects; TIME columns come back as timedelta
+    if not value:
+        return 'N/A'
+    if hasattr(value, 'strftime'):
+        return value.strftime('%H:%M')
+    return str(value)
 
 class AttendancePanel(QWidget):
     def __init__(self, db, user_id):
@@ -169,14 +192,23 @@ class AttendancePanel(QWidget):
         history_layout.addWidget(filter_widget)
         
         # Attendance table
-        self.attendance_table = QTableWidget()
-        self.attendance_table.setColumnCount(5)
-        self.attendance_table.setHorizontalHeaderLabels([
-            "Date", "Check In", "Check Out", "Hours Worked", "Status"
-        ])
+        self.attendance_rows = RowTableModel([
+            Column("Date", display=lambda r: r['date'].strftime('%Y-%m-%d'), sort_key=lambda r: r['date']),
+            Column("Check In", display=lambda r: format_clock(r['check_in']),
+                   sort_key=lambda r: str(r['check_in'] or '')),
+            Column("Check Out", display=lambda r: format_clock(r['check_out']),
+                   sort_key=lambda r: str(r['check_out'] or '')),
+            Column("Hours Worked", display=lambda r: f"{r['hours_worked'] or 0:.2f}",
+                   sort_key=lambda r: float(r['hours_worked'] or 0)),
+            Column("Status", display=lambda r: ATTENDANCE_STATUS[attendance_status(r)][0],
+                   sort_key=attendance_status,
+                   foreground=lambda r: ATTENDANCE_STATUS[attendance_status(r)][1],
+                   background=lambda r: ATTENDANCE_STATUS[attendance_status(r)][2]),
+        ], self)
+        self.attendance_table, self.attendance_proxy = create_table_view(self.attendance_rows, row_height=30)
         
         self.attendance_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -341,55 +373,4 @@ class AttendancePanel(QWidget):
         month_start = selected_date.replace(day=1)
         
         attendance = self.attendance_model.get_attendance_by_month(self.user_id, month_start)
-        self.attendance_table.setRowCount(len(attendance))
-        
-        for row, record in enumerate(attendance):
-            # Date
-            self.attendance_table.setItem(row, 0, QTableWidgetItem(record['date'].strftime('%Y-%m-%d')))
-            
-            # Check-in - Handle datetime objects
-            check_in = record['check_in']
-            if check_in:
-                if isinstance(check_in, datetime):
-                    check_in_str = check_in.strftime('%H:%M')
-                elif hasattr(check_in, 'strftime'):  # It's a datetime-like object
-                    check_in_str = check_in.strftime('%H:%M')
-                else:
-                    check_in_str = str(check_in)
-            else:
-                check_in_str = 'N/A'
-            self.attendance_table.setItem(row, 1, QTableWidgetItem(check_in_str))
-            
-            # Check-out - Handle datetime objects
-            check_out = record['check_out']
-            if check_out:
-                if isinstance(check_out, datetime):
-                    check_out_str = check_out.strftime('%H:%M')
-                elif hasattr(check_out, 'strftime'):  # It's a datetime-like object
-                    check_out_str = check_out.strftime('%H:%M')
-                else:
-                    check_out_str = str(check_out)
-            else:
-                check_out_str = 'N/A'
-            self.attendance_table.setItem(row, 2, QTableWidgetItem(check_out_str))
-            
-            # Hours worked
-            hours_worked = record['hours_worked'] or 0
-            self.attendance_table.setItem(row, 3, QTableWidgetItem(f"{hours_worked:.2f}"))
-            
-            # Status
-            status_item = QTableWidgetItem()
-            if record['check_in'] and record['check_out']:
-                status_item.setText("Completed")
-                status_item.setForeground(Qt.GlobalColor.white)
-                status_item.setBackground(Qt.GlobalColor.darkGreen)
-            elif record['check_in'] and not record['check_out']:
-                status_item.setText("In Progress")
-                status_item.setForeground(Qt.GlobalColor.black)
-                status_item.setBackground(Qt.GlobalColor.yellow)
-            else:
-                status_item.setText("Absent")
-                status_item.setForeground(Qt.GlobalColor.white)
-                status_item.setBackground(Qt.GlobalColor.darkRed)
-            
-            self.attendance_table.setItem(row, 4, status_item)
+        self.attendance_rows.set_rows(attendance)
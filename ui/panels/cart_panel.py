@@ -3,13 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QMessageBox, QHeaderView, QGroupBox, QSpinBox,
                              QDialog, QDialogButtonBox, QFormLayout, QComboBox,
                              QTextEdit, QScrollArea, QVBoxLayout)
-from PyQt6.QtCore import Qt, QTimer, QDateTime
+from PyQt6.QtCore import Qt, QDateTime
 from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 from PyQt6.QtGui import QTextDocument, QPageSize, QPageLayout
 from decimal import Decimal
 from models.cart_model import CartModel
 from models.order_model import OrderModel
 from models.user_model import UserModel
+from ui.panels.data_loader import DataLoader
 import os
 
 class CartPanel(QWidget):
@@ -21,7 +22,8 @@ class CartPanel(QWidget):
         self.order_model = OrderModel(db)
         self.user_model = UserModel(db)
         self.init_ui()
-        QTimer.singleShot(0, self.load_cart) 
+        self.loader = DataLoader(self, self.cart_table)
+        self.load_cart()
     
     def init_ui(self):
         self.setStyleSheet("background-color: white; color: black;")
@@ -162,7 +164,13 @@ class CartPanel(QWidget):
         self.setLayout(layout)
     
     def load_cart(self):
-        cart_items = self.cart_model.get_cart_items(self.user_id)
+        # Results land after the current signal handler returns, so rebuilding
+        # the table never deletes the widget that asked for the reload
+        self.loader.load('cart', self.cart_model.get_cart_items, self.user_id,
+                         on_result=self.display_cart)
+    
+    def display_cart(self, cart_items):
+        cart_items = cart_items or []
         self.cart_table.setRowCount(len(cart_items))
         
         subtotal = Decimal('0.00')
@@ -243,7 +251,7 @@ class CartPanel(QWidget):
     
     def update_quantity(self, cart_id, quantity):
         if self.cart_model.update_cart_quantity(cart_id, quantity):
-            QTimer.singleShot(0, self.load_cart)  
+            self.load_cart()  
         else:
             msg = QMessageBox(self)
             msg.setWindowTitle("Error")
@@ -338,7 +346,7 @@ class CartPanel(QWidget):
                     }
                 """)
                 success_msg.exec()
-                QTimer.singleShot(0, self.load_cart)
+                self.load_cart()
             else:
                 error_msg = QMessageBox(self)
                 error_msg.setWindowTitle("Error")
@@ -411,10 +419,10 @@ class CartPanel(QWidget):
         # Show checkout dialog
         dialog = CheckoutDialog(cart_items, user_info, self.order_model, self.cart_model, self.user_id)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            QTimer.singleShot(0, self.load_cart)
+            self.load_cart()
     
     def refresh_cart(self):
-        QTimer.singleShot(0, self.load_cart)
+        self.load_cart()
 
 
 class CheckoutDialog(QDialog):
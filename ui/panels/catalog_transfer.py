@@ -0,0 +1,111 @@
+from PyQt6.QtCore import QObject, Qt
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QPushButton
+from models.catalog_io import import_catalog, export_catalog
+from ui.panels.data_loader import DataLoader, ProgressRelay
+
+FILE_FILTER = "Catalog files (*.csv *.json *.jsonl);;CSV (*.csv);;JSON (*.json);;JSON lines (*.jsonl)"
+
+BUTTON_STYLE = """
+    QPushButton {{
+        background: {color};
+        color: white;
+        padding: 10px 20px;
+        border: none;
+        border-radius: 8px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background: {hover};
+    }}
+"""
+
+
+class CatalogTransfer(QObject):
+    """Import/export buttons' behaviour for the products or pets catalog"""
+
+    def __init__(self, panel, db, kind, created_by=None, on_imported=None):
+        super().__init__(panel)
+        self.panel = panel
+        self.db = db
+        self.kind = kind
+        self.created_by = created_by
+        self.on_imported = on_imported
+        # Its own loader, not the panel's: a write must never be suspended and re-run
+        # when the user switches panels
+        self.loader = DataLoader(self)
+        self.relay = ProgressRelay(self)
+        self.relay.changed.connect(self.update_progress)
+        self.progress = None
+
+    def buttons(self):
+        # Styled Import and Export buttons, wired up, for the panel's header
+        buttons = []
+        for text, color, hover, handler in (("Import", "#27ae60", "#219a52", self.import_file),
+                                            ("Export", "#95a5a6", "#7f8c8d", self.export_file)):
+            button = QPushButton(text)
+            button.setStyleSheet(BUTTON_STYLE.format(color=color, hover=hover))
+            button.clicked.connect(handler)
+            buttons.append(button)
+        return buttons
+
+    def import_file(self):
+        if self.loader.is_loading():
+            return
+        path, _ = QFileDialog.getOpenFileName(self.panel, f"Import {self.kind.title()}", "", FILE_FILTER)
+        if not path:
+            return
+        self.start(f"Importing {self.kind}...")
+        self.loader.load('transfer', import_catalog, self.db, self.kind, path,
+                         created_by=self.created_by, progress=self.relay.report,
+                         on_result=self.import_finished, on_error=self.failed)
+
+    def export_file(self):
+        if self.loader.is_loading():
+            return
+        path, _ = QFileDialog.getSaveFileName(self.panel, f"Export {self.kind.title()}",
+                                              f"{self.kind}.csv", FILE_FILTER)
+        if not path:
+            return
+        self.start(f"Exporting {self.kind}...")
+        self.loader.load('transfer', export_catalog, self.db, self.kind, path,
+                         progress=self.relay.report,
+                         on_result=self.export_finished, on_error=self.failed)
+
+    def start(self, label):
+        self.progress = QProgressDialog(label, None, 0, 0, self.panel)
+        self.progress.setWindowTitle(self.kind.title())
+        self.progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress.setMinimumDuration(300)
+        self.progress.setValue(0)
+
+    def update_progress(self, done, total):
+        if self.progress is not None and total:
+            self.progress.setMaximum(total)
+            self.progress.setValue(min(done, total))
+
+    def finish(self):
+        if self.progress is not None:
+            self.progress.close()
+            self.progress = None
+
+    def import_finished(self, result):
+        self.finish()
+        message = f"Read {result['read']} rows, saved {result['written']}."
+        if result['errors']:
+            shown = "\n".join(f"Line {line}: {error}" for line, error in result['errors'][:15])
+            more = len(result['errors']) - 15
+            if more > 0:
+                shown += f"\n...and {more} more"
+            QMessageBox.warning(self.panel, "Import Finished", f"{message}\n\n{shown}")
+        else:
+            QMessageBox.information(self.panel, "Import Finished", message)
+        if self.on_imported:
+            self.on_imported()
+
+    def export_finished(self, count):
+        self.finish()
+        QMessageBox.information(self.panel, "Export Finished", f"Exported {count} {self.kind}.")
+
+    def failed(self, message):
+        self.finish()
+        QMessageBox.critical(self.panel, "Error", f"An error occurred: {message}")
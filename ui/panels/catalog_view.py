@@ -0,0 +1,236 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QEvent, QRect, QSize, QTimer
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QListView, QAbstractItemView
+from ui.panels.search_index import SearchIndex
+from ui.panels.table_model import ROW_ROLE, RowFilterProxyModel
+
+# Most units of one product that can be added from a card in one go
+MAX_ADD_QUANTITY = 10
+
+
+class CatalogModel(QAbstractListModel):
+    """In-stock products and available pets for the POS, one entry per card"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self.positions = {}
+        self.search_index = SearchIndex()
+
+    def set_catalog(self, products, pets):
+        self.beginResetModel()
+        self.entries = [{'kind': 'product', 'item': product, 'qty': 1}
+                        for product in products or [] if product['quantity'] > 0]
+        self.entries += [{'kind': 'pet', 'item': pet, 'qty': 1} for pet in pets or []]
+        self._reindex()
+        self.search_index.rebuild(((entry['kind'], entry['item']['id']), entry['item'])
+                                  for entry in self.entries)
+        self.endResetModel()
+
+    def _reindex(self):
+        self.positions = {(entry['kind'], entry['item']['id']): row
+                          for row, entry in enumerate(self.entries)}
+
+    def row_at(self, row):
+        return self.entries[row]
+
+    def entry(self, kind, item_id):
+        row = self.positions.get((kind, item_id))
+        return self.entries[row] if row is not None else None
+
+    def sort_value(self, index):
+        return self.entries[index.row()]['item']['name']
+
+    def update_item(self, kind, item):
+        # Repaint one card with fresh data; products that sold out leave the catalog
+        row = self.positions.get((kind, item['id']))
+        if row is None:
+            return
+        if kind == 'product' and item['quantity'] <= 0:
+            self.remove_item(kind, item['id'])
+            return
+        entry = self.entries[row]
+        entry['item'] = item
+        self.search_index.update((kind, item['id']), item)
+        entry['qty'] = min(entry['qty'], max_quantity(entry))
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_item(self, kind, item_id):
+        row = self.positions.get((kind, item_id))
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.entries.pop(row)
+        self._reindex()
+        self.search_index.discard((kind, item_id))
+        self.endRemoveRows()
+
+    def search_filter(self, text):
+        # Proxy predicate for the typed text, or None to show everything
+        matches = self.search_index.search(text)
+        if matches is None:
+            return None
+        return lambda entry: (entry['kind'], entry['item']['id']) in matches
+
+    def step_quantity(self, entry, step):
+        row = self.positions.get((entry['kind'], entry['item']['id']))
+        qty = min(max(entry['qty'] + step, 1), max_quantity(entry))
+        if row is None or qty == entry['qty']:
+            return
+        entry['qty'] = qty
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == ROW_ROLE:
+            return entry
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry['item']['name']
+        return None
+
+
+def max_quantity(entry):
+    if entry['kind'] == 'pet':
+        return 1
+    return max(1, min(MAX_ADD_QUANTITY, entry['item']['quantity']))
+
+
+class CatalogDelegate(QStyledItemDelegate):
+    """Paints a catalog card and its add-to-cart controls; only visible cards are ever painted"""
+
+    CARD_SIZE = QSize(210, 130)
+    MARGIN = 5
+
+    def __init__(self, model, on_add, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.on_add = on_add
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setBold(True)
+        self.price_font = QFont()
+        self.price_font.setPixelSize(12)
+        self.price_font.setBold(True)
+        self.small_font = QFont()
+        self.small_font.setPixelSize(10)
+        self.button_font = QFont(self.small_font)
+        self.button_font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def _card(self, rect):
+        return rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def _controls(self, card, entry):
+        # Hit areas along the bottom of the card
+        y = card.bottom() - 28
+        if entry['kind'] == 'pet':
+            return {'add': QRect(card.center().x() - 45, y, 90, 20)}
+        left = card.center().x() - 75
+        return {
+            'minus': QRect(left, y, 20, 20),
+            'qty': QRect(left + 20, y, 30, 20),
+            'plus': QRect(left + 50, y, 20, 20),
+            'add': QRect(left + 80, y, 70, 20),
+        }
+
+    def paint(self, painter, option, index):
+        entry = index.data(ROW_ROLE)
+        item = entry['item']
+        is_pet = entry['kind'] == 'pet'
+        card = self._card(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QPen(QColor('#e1e1e1')))
+        painter.setBrush(QColor('#f8f9fa' if hovered else 'white'))
+        painter.drawRoundedRect(card, 5, 5)
+
+        text_rect = card.adjusted(8, 8, -8, 0)
+        painter.setPen(QColor('black'))
+        painter.setFont(self.name_font)
+        name = QFontMetrics(self.name_font).elidedText(item['name'], Qt.TextElideMode.ElideRight,
+                                                       text_rect.width())
+        painter.drawText(QRect(text_rect.left(), text_rect.top(), text_rect.width(), 20),
+                         Qt.AlignmentFlag.AlignCenter, name)
+
+        if is_pet:
+            detail = f"{item['species']} - {item['breed']}"
+        else:
+            detail = f"Stock: {item['quantity']}"
+        painter.setFont(self.small_font)
+        painter.drawText(QRect(text_rect.left(), text_rect.top() + 22, text_rect.width(), 16),
+                         Qt.AlignmentFlag.AlignCenter, detail)
+
+        painter.setPen(QColor('#e74c3c' if is_pet else '#27ae60'))
+        painter.setFont(self.price_font)
+        painter.drawText(QRect(text_rect.left(), text_rect.top() + 40, text_rect.width(), 20),
+                         Qt.AlignmentFlag.AlignCenter, f"₱{item['price']:.2f}")
+
+        controls = self._controls(card, entry)
+        painter.setFont(self.button_font)
+        for name in ('minus', 'plus'):
+            if name in controls:
+                painter.setPen(QPen(QColor('#ddd')))
+                painter.setBrush(QColor('white'))
+                painter.drawRoundedRect(controls[name], 3, 3)
+                painter.setPen(QColor('black'))
+                painter.drawText(controls[name], Qt.AlignmentFlag.AlignCenter,
+                                 '-' if name == 'minus' else '+')
+        if 'qty' in controls:
+            painter.drawText(controls['qty'], Qt.AlignmentFlag.AlignCenter, str(entry['qty']))
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor('#e74c3c' if is_pet else '#3498db'))
+        painter.drawRoundedRect(controls['add'], 3, 3)
+        painter.setPen(QColor('white'))
+        painter.drawText(controls['add'], Qt.AlignmentFlag.AlignCenter,
+                         "Add to Cart" if is_pet else "Add")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() != QEvent.Type.MouseButtonRelease
+                or event.button() != Qt.MouseButton.LeftButton):
+            return False
+        entry = index.data(ROW_ROLE)
+        position = event.position().toPoint()
+        for name, rect in self._controls(self._card(option.rect), entry).items():
+            if not rect.contains(position):
+                continue
+            if name == 'minus':
+                self.model.step_quantity(entry, -1)
+            elif name == 'plus':
+                self.model.step_quantity(entry, 1)
+            elif name == 'add':
+                # Run after the event returns: adding may open a message box
+                QTimer.singleShot(0, lambda: self.on_add(entry))
+            return True
+        return False
+
+
+def create_catalog_view(model, on_add):
+    view = QListView()
+    proxy = RowFilterProxyModel(view)
+    proxy.setSourceModel(model)
+    view.setModel(proxy)
+    view.setItemDelegate(CatalogDelegate(model, on_add, view))
+    view.setViewMode(QListView.ViewMode.IconMode)
+    view.setMovement(QListView.Movement.Static)
+    view.setResizeMode(QListView.ResizeMode.Adjust)
+    view.setWrapping(True)
+    # Every card is the same size, so the view lays out rows without measuring each item
+    view.setUniformItemSizes(True)
+    view.setSpacing(5)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setMouseTracking(True)
+    return view, proxy
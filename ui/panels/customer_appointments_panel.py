@@ -3,10 +3,12 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QComboBox, QDateEdit, QTimeEdit, QTextEdit,
                              QMessageBox, QHeaderView, QDialog, QFormLayout,
                              QDialogButtonBox, QGroupBox)
-from PyQt6.QtCore import QDateTime, Qt, QTimer
+from PyQt6.QtCore import QDate, QDateTime, QTime, Qt, QTimer
 from datetime import datetime
 from models.appointment_model import AppointmentModel
+from models.schedule import service_duration
 from models.user_model import UserModel
+from ui.panels.data_loader import DataLoader
 
 class CustomerAppointmentsPanel(QWidget):
     def __init__(self, db, user_id):
@@ -329,6 +331,8 @@ class BookAppointmentDialog(QDialog):
         super().__init__()
         self.appointment_model = appointment_model
         self.customer_id = customer_id
+        # The free-time search spans every staff member over a week; keep it off the GUI thread
+        self.loader = DataLoader(self)
         self.init_ui()
     
     def init_ui(self):
@@ -388,7 +392,23 @@ class BookAppointmentDialog(QDialog):
             }
         """)
         
+        # Earliest free times for the chosen service over the next week
+        self.suggestion_combo = QComboBox()
+        self.suggestion_combo.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: #f9fafb;
+            }
+        """)
+        self.suggestion_combo.activated.connect(self.use_suggestion)
+        self.service_combo.currentTextChanged.connect(self.load_suggestions)
+        self.suggested = None
+        self.load_suggestions()
+        
         layout.addRow("Service Type *:", self.service_combo)
+        layout.addRow("Next Available:", self.suggestion_combo)
         layout.addRow("Date *:", self.date_edit)
         layout.addRow("Time *:", self.time_edit)
         layout.addRow("Notes:", self.notes_input)
@@ -400,19 +420,51 @@ class BookAppointmentDialog(QDialog):
         layout.addRow(button_box)
         self.setLayout(layout)
     
+    def load_suggestions(self):
+        self.suggestion_combo.clear()
+        self.suggestion_combo.addItem("Finding free times...", None)
+        duration = service_duration(self.service_combo.currentText())
+        # One key: picking another service drops a search still running for the last one
+        self.loader.load('suggestions', self.appointment_model.find_next_free_slots,
+                         count=8, duration_minutes=duration, on_result=self.show_suggestions)
+    
+    def show_suggestions(self, suggestions):
+        self.suggestion_combo.clear()
+        self.suggestion_combo.addItem("Choose a suggested time...", None)
+        for slot, staff_id in suggestions:
+            self.suggestion_combo.addItem(slot.strftime('%a %b %d, %I:%M %p'), (slot, staff_id))
+        if self.suggestion_combo.count() == 1:
+            self.suggestion_combo.setItemText(0, "No free times in the next 7 days")
+    
+    def use_suggestion(self, index):
+        suggestion = self.suggestion_combo.itemData(index)
+        if not suggestion:
+            return
+        slot, staff_id = suggestion
+        self.time_edit.clearMinimumTime()
+        self.time_edit.clearMaximumTime()
+        self.date_edit.setDate(QDate(slot.year, slot.month, slot.day))
+        self.time_edit.setTime(QTime(slot.hour, slot.minute))
+        self.suggested = suggestion
+    
     def book_appointment(self):
         service_type = self.service_combo.currentText()
-        appointment_date = self.date_edit.dateTime().toString('yyyy-MM-dd HH:mm:ss')
+        appointment_date = QDateTime(self.date_edit.date(), self.time_edit.time()).toString('yyyy-MM-dd HH:mm:00')
         notes = self.notes_input.toPlainText().strip()
         
+        # Book the suggested staff member if the suggested time was kept
+        staff_id = None
+        if self.suggested and self.suggested[0].strftime('%Y-%m-%d %H:%M:%S') == appointment_date:
+            staff_id = self.suggested[1]
+        
         if not service_type:
             QMessageBox.warning(self, "Error", "Please select a service type")
             return
         
-        # Prepare appointment data with explicit staff_id as None
+        # Unassigned (None) unless a suggested staff/time pairing was picked
         appointment_data = {
             'customer_id': self.customer_id,
-            'staff_id': None,  # Explicitly set to None for customer bookings
+            'staff_id': staff_id,
             'service_type': service_type,
             'appointment_date': appointment_date,
             'notes': notes if notes else ''
@@ -423,11 +475,10 @@ class BookAppointmentDialog(QDialog):
             from datetime import datetime
             appt_datetime = datetime.strptime(appointment_date, '%Y-%m-%d %H:%M:%S')
             
-            # Check availability with staff_id=None
             is_available = self.appointment_model.check_appointment_availability(
                 appt_datetime, 
-                staff_id=None,
-                duration_minutes=30
+                staff_id=staff_id,
+                duration_minutes=service_duration(service_type)
             )
             
             if not is_available:
@@ -1,10 +1,19 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton,
                              QLineEdit, QMessageBox, QHeaderView, QDialog, 
                              QDialogButtonBox, QGroupBox, QScrollArea, QGridLayout)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from datetime import datetime
 from models.user_model import UserModel
+from ui.panels.table_model import (RowTableModel, Column, ActionButton, ButtonDelegate,
+                                   create_table_view)
+
+def is_active(user):
+    # is_active comes back as 1/0 from MySQL
+    return bool(user['is_active']) if isinstance(user['is_active'], (int, float)) else user['is_active']
+
+def format_join_date(user):
+    return user['created_at'].strftime('%Y-%m-%d') if isinstance(user['created_at'], datetime) else user['created_at']
 
 class AddEditCustomerDialog(QDialog):
     def __init__(self, user_model, customer=None):
@@ -281,10 +290,20 @@ class AddEditCustomerDialog(QDialog):
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
 class CustomerManagementPanel(QWidget):
+    PAGE_SIZE = 100
+    
     def __init__(self, db):
         super().__init__()
         self.db = db
         self.user_model = UserModel(db)
+        self.next_cursor = None
+        
+        # Searching goes to the database, so wait for a pause in typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.load_customers)
+        
         self.init_ui()
         self.load_customers()
     
@@ -354,15 +373,30 @@ class CustomerManagementPanel(QWidget):
         layout.addSpacing(20)
         
         # Customers table
-        self.customers_table = QTableWidget()
-        self.customers_table.setColumnCount(8)  # Changed from 7 to 8 columns
-        self.customers_table.setHorizontalHeaderLabels([
-            "ID", "Username", "Name", "Email", "Phone", "Status", "Joined", "Actions"
-        ])
+        self.customers_model = RowTableModel([
+            Column("ID", 'id'),
+            Column("Username", 'username'),
+            Column("Name", display=lambda u: f"{u['first_name']} {u['last_name']}"),
+            Column("Email", 'email'),
+            Column("Phone", display=lambda u: u['phone'] or 'N/A'),
+            Column("Status", display=lambda u: "Active" if is_active(u) else "Inactive",
+                   foreground=lambda u: Qt.GlobalColor.darkGreen if is_active(u) else Qt.GlobalColor.darkRed),
+            Column("Joined", display=format_join_date, sort_key=lambda u: str(u['created_at'])),
+            Column("Actions", sort_key=is_active),
+        ], self)
+        self.customers_model.fetcher = self.load_more_customers
+        self.customers_table, self.customers_proxy = create_table_view(self.customers_model)
+        self.customers_table.setItemDelegateForColumn(7, ButtonDelegate([
+            ActionButton("Deactivate", '#f39c12', lambda u: self.toggle_customer_status(u['id'], False),
+                         visible=is_active),
+            ActionButton("Activate", '#2ecc71', lambda u: self.toggle_customer_status(u['id'], True),
+                         visible=lambda u: not is_active(u)),
+            ActionButton("Edit", '#3498db', self.edit_customer),
+        ], self.customers_table))
         
         # Style the table
         self.customers_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -393,106 +427,24 @@ class CustomerManagementPanel(QWidget):
         self.setLayout(layout)
     
     def load_customers(self):
-        customers = self.user_model.get_all_users('customer')
-        self.customers_table.setRowCount(len(customers))
-        
-        for row, customer in enumerate(customers):
-            self.customers_table.setItem(row, 0, QTableWidgetItem(str(customer['id'])))
-            self.customers_table.setItem(row, 1, QTableWidgetItem(customer['username']))
-            self.customers_table.setItem(row, 2, QTableWidgetItem(f"{customer['first_name']} {customer['last_name']}"))
-            self.customers_table.setItem(row, 3, QTableWidgetItem(customer['email']))
-            self.customers_table.setItem(row, 4, QTableWidgetItem(customer['phone'] or 'N/A'))
-            
-            # Check if is_active is 1 (True) or 0 (False)
-            is_active = bool(customer['is_active']) if isinstance(customer['is_active'], (int, float)) else customer['is_active']
-            
-            # Status with color coding
-            status_item = QTableWidgetItem("Active" if is_active else "Inactive")
-            if is_active:
-                status_item.setForeground(Qt.GlobalColor.darkGreen)
-            else:
-                status_item.setForeground(Qt.GlobalColor.darkRed)
-            self.customers_table.setItem(row, 5, status_item)
-            
-            join_date = customer['created_at'].strftime('%Y-%m-%d') if isinstance(customer['created_at'], datetime) else customer['created_at']
-            self.customers_table.setItem(row, 6, QTableWidgetItem(join_date))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_widget.setStyleSheet("background-color: white;")
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(5, 5, 5, 5)
-            
-            edit_btn = QPushButton("Edit")
-            edit_btn.setMinimumHeight(20)
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background: #3498db;
-                    color: white;
-                    padding: 5px 10px;
-                    border: none;
-                    border-radius: 5px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background: #2980b9;
-                }
-            """)
-            edit_btn.clicked.connect(lambda checked, c=customer: self.edit_customer(c))
-            
-            if is_active:
-                deactivate_btn = QPushButton("Deactivate")
-                deactivate_btn.setMinimumHeight(20)
-                deactivate_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #f39c12;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #e67e22;
-                    }
-                """)
-                deactivate_btn.clicked.connect(lambda checked, c=customer: self.toggle_customer_status(c['id'], False))
-                actions_layout.addWidget(deactivate_btn)
-            else:
-                activate_btn = QPushButton("Activate")
-                activate_btn.setMinimumHeight(20)
-                activate_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #2ecc71;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #27ae60;
-                    }
-                """)
-                activate_btn.clicked.connect(lambda checked, c=customer: self.toggle_customer_status(c['id'], True))
-                actions_layout.addWidget(activate_btn)
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addStretch()
-            
-            actions_widget.setLayout(actions_layout)
-            self.customers_table.setCellWidget(row, 7, actions_widget)
+        # Start again from the first page with the current search
+        self.next_cursor = None
+        self.customers_model.has_more = False
+        self.customers_model.set_rows([])
+        self.load_more_customers()
+    
+    def load_more_customers(self):
+        # Also called by the view, through the model's fetcher, as it scrolls to the end
+        search_text = self.search_input.text().strip()
+        page = self.user_model.get_users_page(
+            'customer', page_size=self.PAGE_SIZE, after=self.next_cursor, search=search_text or None
+        )
+        self.next_cursor = page['next_cursor']
+        self.customers_model.append_rows(page['rows'])
+        self.customers_model.has_more = self.next_cursor is not None
     
     def search_customers(self):
-        search_text = self.search_input.text().lower()
-        for row in range(self.customers_table.rowCount()):
-            match = False
-            for col in range(4):  # Check ID, Username, Name, Email 
-                item = self.customers_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            self.customers_table.setRowHidden(row, not match)
+        self.search_timer.start()
     
     def add_customer(self):
         dialog = AddEditCustomerDialog(self.user_model)
@@ -4,10 +4,10 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QDialogButtonBox, QTextEdit, QGridLayout)
 from PyQt6.QtCore import Qt
 import os
-from PyQt6.QtGui import QPixmap
 from models.pet_model import PetModel
 from models.adoption_model import AdoptionModel
 from models.cart_model import CartModel
+from ui.panels.image_cache import set_label_image
 
 class CustomerPetsPanel(QWidget):
     def __init__(self, db, user_id):
@@ -242,12 +242,8 @@ class CustomerPetsPanel(QWidget):
             }
         """)
         
-        if pet['image_path'] and os.path.exists(pet['image_path']):
-            pixmap = QPixmap(pet['image_path'])
-            scaled_pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            image_label.setPixmap(scaled_pixmap)
-        else:
-            image_label.setText("No Image Available")
+        # Decoded off the GUI thread and cached, so re-filtering never decodes it again
+        set_label_image(image_label, pet['image_path'], 200, 200, "No Image Available")
         
         layout.addWidget(image_label, 0, Qt.AlignmentFlag.AlignCenter)
         
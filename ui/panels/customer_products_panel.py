@@ -3,9 +3,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QMessageBox, QGroupBox, QSpinBox, QGridLayout)
 from PyQt6.QtCore import Qt
 import os
-from PyQt6.QtGui import QPixmap
 from models.product_model import ProductModel
 from models.cart_model import CartModel
+from ui.panels.image_cache import set_label_image
 
 class CustomerProductsPanel(QWidget):
     def __init__(self, db, user_id):
@@ -236,12 +236,8 @@ class CustomerProductsPanel(QWidget):
             }
         """)
         
-        if product['image_path'] and os.path.exists(product['image_path']):
-            pixmap = QPixmap(product['image_path'])
-            scaled_pixmap = pixmap.scaled(150, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            image_label.setPixmap(scaled_pixmap)
-        else:
-            image_label.setText("No Image")
+        # Decoded off the GUI thread and cached, so re-filtering never decodes it again
+        set_label_image(image_label, product['image_path'], 150, 150)
         
         layout.addWidget(image_label, 0, Qt.AlignmentFlag.AlignCenter)
         
@@ -0,0 +1,159 @@
+import os
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QEvent, Qt, pyqtSignal
+from PyQt6.QtWidgets import QLabel
+
+_thread_pool = None
+
+
+def query_thread_pool():
+    # Leave one database connection free for writes made from the GUI thread
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(max(1, int(os.getenv('DB_POOL_SIZE', '5')) - 1))
+    return _thread_pool
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, str)
+
+
+class _QueryTask(QRunnable):
+    def __init__(self, key, generation, func, args, kwargs):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.key, self.generation, str(e))
+            return
+        self.signals.finished.emit(self.key, self.generation, result)
+
+
+class ProgressRelay(QObject):
+    # Pass report as a progress callback to a task; changed fires on the GUI thread
+    changed = pyqtSignal(int, int)
+
+    def report(self, done, total):
+        self.changed.emit(done, total)
+
+
+class LoadingOverlay(QLabel):
+    def __init__(self, target):
+        super().__init__("Loading...", target)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: rgba(255, 255, 255, 160);
+                color: #2c3e50;
+                font-size: 16px;
+                font-weight: bold;
+            }
+        """)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+        target.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.parent() and event.type() == QEvent.Type.Resize:
+            self.setGeometry(watched.rect())
+        return False
+
+    def set_visible(self, visible):
+        if visible:
+            self.setGeometry(self.parent().rect())
+            self.raise_()
+        self.setVisible(visible)
+
+
+class DataLoader(QObject):
+    """Runs model calls on the query thread pool and hands results back on the GUI thread"""
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent, overlay_target=None):
+        super().__init__(parent)
+        self.pool = query_thread_pool()
+        self._generations = {}
+        self._pending = {}
+        self._suspended = []
+        self.overlay = LoadingOverlay(overlay_target) if overlay_target is not None else None
+
+    def load(self, key, func, *args, on_result=None, on_error=None, **kwargs):
+        # A newer request under the same key makes any earlier one stale
+        self._drop(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+
+        task = _QueryTask(key, generation, func, args, kwargs)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self._pending[key] = (task, func, args, kwargs, on_result, on_error)
+        self._update_busy()
+        self.pool.start(task)
+
+    def cancel(self, key=None):
+        # Results of cancelled requests are dropped; a query already on the wire still finishes
+        for pending_key in [key] if key is not None else list(self._pending):
+            if pending_key in self._pending:
+                self._drop(pending_key)
+                self._generations[pending_key] = self._generations.get(pending_key, 0) + 1
+        self._update_busy()
+
+    def suspend(self):
+        # Cancel everything but remember it, so the panel can pick up where it left off
+        self._suspended = [(key,) + entry[1:] for key, entry in self._pending.items()]
+        self.cancel()
+
+    def resume(self):
+        suspended, self._suspended = self._suspended, []
+        for key, func, args, kwargs, on_result, on_error in suspended:
+            self.load(key, func, *args, on_result=on_result, on_error=on_error, **kwargs)
+
+    def is_loading(self, key=None):
+        return key in self._pending if key is not None else bool(self._pending)
+
+    def _drop(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            # Not started yet: take it off the queue so it never reaches the database
+            try:
+                self.pool.tryTake(entry[0])
+            except RuntimeError:
+                # Already run and deleted by the pool
+                pass
+
+    def _take(self, key, generation):
+        if self._generations.get(key) != generation:
+            return None
+        entry = self._pending.pop(key, None)
+        self._update_busy()
+        return entry
+
+    def _on_finished(self, key, generation, result):
+        entry = self._take(key, generation)
+        if entry is not None and entry[4] is not None:
+            entry[4](result)
+
+    def _on_failed(self, key, generation, message):
+        entry = self._take(key, generation)
+        if entry is None:
+            return
+        if entry[5] is not None:
+            entry[5](message)
+        else:
+            print(f"Error loading {key}: {message}")
+
+    def _update_busy(self):
+        busy = bool(self._pending)
+        if self.overlay is not None:
+            self.overlay.set_visible(busy)
+        self.busy_changed.emit(busy)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap
+from models.image_store import file_key, get_thumbnail
+
+_image_cache = None
+
+
+def image_cache():
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
+
+
+class _DecodeSignals(QObject):
+    decoded = pyqtSignal(object, object)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, cache_key, path, width, height):
+        super().__init__()
+        self.cache_key = cache_key
+        self.path = path
+        self.width = width
+        self.height = height
+        self.signals = _DecodeSignals()
+
+    def run(self):
+        try:
+            image = get_thumbnail(self.path, self.width, self.height, self.cache_key[0])
+        except Exception as e:
+            print(f"Error decoding image {self.path}: {e}")
+            image = None
+        self.signals.decoded.emit(self.cache_key, image)
+
+
+class ImageCache(QObject):
+    """Scaled pixmaps keyed by (file version, size); files are decoded off the GUI thread"""
+
+    def __init__(self, capacity=300):
+        super().__init__()
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+        self.waiting = {}
+        # Decoding is CPU-bound and independent of the database, so it gets its own pool
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThreadPool.globalInstance().maxThreadCount())))
+
+    def request(self, path, width, height, callback):
+        # callback(pixmap) runs on the GUI thread, immediately on a hit; never called for
+        # files that are missing or cannot be decoded
+        key = file_key(path) if path else None
+        if key is None:
+            return False
+        cache_key = (key, width, height)
+
+        pixmap = self.pixmaps.get(cache_key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(cache_key)
+            callback(pixmap)
+            return True
+
+        # Several cards showing one file share a single decode
+        if cache_key in self.waiting:
+            self.waiting[cache_key].append(callback)
+            return True
+        self.waiting[cache_key] = [callback]
+        task = _DecodeTask(cache_key, path, width, height)
+        task.signals.decoded.connect(self._on_decoded)
+        self.pool.start(task)
+        return True
+
+    def _on_decoded(self, cache_key, image):
+        callbacks = self.waiting.pop(cache_key, [])
+        if image is None:
+            return
+        # QPixmap may only be made on the GUI thread, which is where this slot runs
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps[cache_key] = pixmap
+        while len(self.pixmaps) > self.capacity:
+            self.pixmaps.popitem(last=False)
+        for callback in callbacks:
+            callback(pixmap)
+
+
+def set_label_image(label, path, width, height, placeholder="No Image"):
+    """Show path scaled into width x height on label once it is decoded"""
+    label.setText(placeholder)
+
+    def show(pixmap):
+        try:
+            label.setPixmap(pixmap)
+        except RuntimeError:
+            # The card was rebuilt (e.g. a filter changed) before the image arrived
+            pass
+
+    return image_cache().request(path, width, height, show)
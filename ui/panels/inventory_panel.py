@@ -1,13 +1,30 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton,
                              QLineEdit, QComboBox, QTextEdit, QDoubleSpinBox,
                              QSpinBox, QFileDialog, QMessageBox, QHeaderView,
                              QDialog, QDialogButtonBox, QGroupBox, QScrollArea, 
                              QGridLayout)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
 import os
 from models.product_model import ProductModel
+from ui.panels.catalog_transfer import CatalogTransfer
+from ui.panels.image_cache import image_cache
+from ui.panels.table_model import (RowTableModel, Column, ActionButton, ButtonDelegate,
+                                   create_table_view, text_filter)
+
+# Stock level -> (label, text colour, cell colour)
+STOCK_STATUS = {
+    0: ("Out of Stock", Qt.GlobalColor.white, Qt.GlobalColor.darkRed),
+    1: ("Low Stock", Qt.GlobalColor.black, Qt.GlobalColor.yellow),
+    2: ("In Stock", Qt.GlobalColor.darkGreen, Qt.GlobalColor.white),
+}
+
+def stock_level(product):
+    if product['quantity'] == 0:
+        return 0
+    if product['quantity'] <= product['reorder_level']:
+        return 1
+    return 2
 
 class InventoryPanel(QWidget):
     def __init__(self, db, user_role):
@@ -16,6 +33,7 @@ class InventoryPanel(QWidget):
         self.user_role = user_role
         self.product_model = ProductModel(db)
         self.current_image_path = None
+        self.transfer = CatalogTransfer(self, db, 'products', on_imported=self.load_products)
         self.init_ui()
         self.load_products()
     
@@ -32,8 +50,11 @@ class InventoryPanel(QWidget):
         header_layout.addSpacing(10)
         header_layout.addStretch()
         
-        # Show Add New Product button for both admin and staff
+        # Show catalog import/export and Add New Product buttons for both admin and staff
         if self.user_role in ['admin', 'staff']:
+            for transfer_btn in self.transfer.buttons():
+                header_layout.addWidget(transfer_btn)
+            
             add_btn = QPushButton("Add New Product")
             add_btn.setStyleSheet("""
                 QPushButton {
@@ -98,7 +119,7 @@ class InventoryPanel(QWidget):
         filter_layout.addWidget(search_label)
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search by name, category...")
+        self.search_input.setPlaceholderText("Search by name, SKU, category...")
         self.search_input.setStyleSheet("""
             QLineEdit {
                 color: black;
@@ -116,18 +137,34 @@ class InventoryPanel(QWidget):
         layout.addSpacing(20)
         
         # Products table
-        self.products_table = QTableWidget()
+        columns = [
+            Column("ID", 'id'),
+            Column("Name", 'name'),
+            Column("SKU", 'sku'),
+            Column("Category", 'category'),
+            Column("Price", display=lambda p: f"₱{p['price']:.2f}", sort_key=lambda p: float(p['price'])),
+            Column("Quantity", 'quantity'),
+            Column("Reorder Level", 'reorder_level'),
+            Column("Status", display=lambda p: STOCK_STATUS[stock_level(p)][0],
+                   sort_key=stock_level,
+                   foreground=lambda p: STOCK_STATUS[stock_level(p)][1],
+                   background=lambda p: STOCK_STATUS[stock_level(p)][2]),
+        ]
         # Show Actions column for both admin and staff
-        self.products_table.setColumnCount(8 if self.user_role in ['admin', 'staff'] else 7)
-        headers = ["ID", "Name", "Category", "Price", "Quantity", "Reorder Level", "Status"]
         if self.user_role in ['admin', 'staff']:
-            headers.append("Actions")
+            columns.append(Column("Actions", sort_key=lambda p: p['name']))
         
-        self.products_table.setHorizontalHeaderLabels(headers)
+        self.products_model = RowTableModel(columns, self)
+        self.products_table, self.products_proxy = create_table_view(self.products_model)
+        if self.user_role in ['admin', 'staff']:
+            self.products_table.setItemDelegateForColumn(len(columns) - 1, ButtonDelegate([
+                ActionButton("Edit", '#3498db', self.edit_product),
+                ActionButton("Delete", '#dc3545', lambda p: self.delete_product(p['id'])),
+            ], self.products_table))
         
         # Style the table
         self.products_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -146,118 +183,34 @@ class InventoryPanel(QWidget):
         header = self.products_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)  # ID
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Name
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # Category
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)  # Price
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Quantity
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)  # Reorder Level
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)  # Status
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # SKU
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)  # Category
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Price
+        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)  # Quantity
+        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)  # Reorder Level
+        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Stretch)  # Status
         
         if self.user_role in ['admin', 'staff']:
-            header.setSectionResizeMode(7, QHeaderView.ResizeMode.Stretch)  # Actions
+            header.setSectionResizeMode(8, QHeaderView.ResizeMode.Stretch)  # Actions
         
         layout.addWidget(self.products_table)
         
         self.setLayout(layout)
     
     def load_products(self):
-        products = self.product_model.get_all_products()
-        self.products_table.setRowCount(len(products))
-        
-        for row, product in enumerate(products):
-            self.products_table.setItem(row, 0, QTableWidgetItem(str(product['id'])))
-            self.products_table.setItem(row, 1, QTableWidgetItem(product['name']))
-            self.products_table.setItem(row, 2, QTableWidgetItem(product['category']))
-            self.products_table.setItem(row, 3, QTableWidgetItem(f"₱{product['price']:.2f}"))
-            self.products_table.setItem(row, 4, QTableWidgetItem(str(product['quantity'])))
-            self.products_table.setItem(row, 5, QTableWidgetItem(str(product['reorder_level'])))
-            
-            # Status with color coding
-            status_item = QTableWidgetItem()
-            if product['quantity'] == 0:
-                status_item.setText("Out of Stock")
-                status_item.setForeground(Qt.GlobalColor.white)
-                status_item.setBackground(Qt.GlobalColor.darkRed)
-            elif product['quantity'] <= product['reorder_level']:
-                status_item.setText("Low Stock")
-                status_item.setForeground(Qt.GlobalColor.black)
-                status_item.setBackground(Qt.GlobalColor.yellow)
-            else:
-                status_item.setText("In Stock")
-                status_item.setForeground(Qt.GlobalColor.darkGreen)
-                status_item.setBackground(Qt.GlobalColor.white)
-            
-            self.products_table.setItem(row, 6, status_item)
-            
-            # Actions for admin and staff
-            if self.user_role in ['admin', 'staff']:
-                actions_widget = QWidget()
-                actions_widget.setStyleSheet("background-color: white;")
-                actions_layout = QHBoxLayout()
-                actions_layout.setContentsMargins(5, 5, 5, 5)
-                
-                edit_btn = QPushButton("Edit")
-                edit_btn.setMinimumHeight(20)
-                edit_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #3498db;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #2980b9;
-                    }
-                """)
-                edit_btn.clicked.connect(lambda checked, p=product: self.edit_product(p))
-                
-                delete_btn = QPushButton("Delete")
-                delete_btn.setMinimumHeight(20)
-                delete_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #dc3545;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #c82333;
-                    }
-                """)
-                delete_btn.clicked.connect(lambda checked, p=product: self.delete_product(p['id']))
-                
-                actions_layout.addWidget(edit_btn)
-                actions_layout.addWidget(delete_btn)
-                actions_layout.addStretch()
-                
-                actions_widget.setLayout(actions_layout)
-                self.products_table.setCellWidget(row, 7, actions_widget)
+        self.products_model.set_rows(self.product_model.get_all_products())
     
     def search_products(self):
-        search_text = self.search_input.text().lower()
-        for row in range(self.products_table.rowCount()):
-            match = False
-            for col in range(3):  # Check ID, Name, Category
-                item = self.products_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            self.products_table.setRowHidden(row, not match)
+        # Check ID, Name, SKU, Category
+        self.products_proxy.set_filter(
+            'search', text_filter(self.search_input.text(), self.products_model.columns[:4])
+        )
     
     def filter_products(self, category):
         if category == "All":
-            for row in range(self.products_table.rowCount()):
-                self.products_table.setRowHidden(row, False)
+            self.products_proxy.set_filter('category', None)
         else:
-            for row in range(self.products_table.rowCount()):
-                category_item = self.products_table.item(row, 2)
-                if category_item and category_item.text() == category:
-                    self.products_table.setRowHidden(row, False)
-                else:
-                    self.products_table.setRowHidden(row, True)
+            self.products_proxy.set_filter('category', lambda product: product['category'] == category)
     
     def show_add_product_dialog(self):
         dialog = AddEditProductDialog(self.product_model)
@@ -556,6 +509,19 @@ class AddEditProductDialog(QDialog):
         """)
         basic_layout.addWidget(self.reorder_input, 2, 1)
         
+        basic_layout.addWidget(QLabel("SKU / Barcode:"), 2, 2)
+        self.sku_input = QLineEdit()
+        self.sku_input.setPlaceholderText("Scan or type code")
+        self.sku_input.setStyleSheet("""
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: #f9fafb;
+            }
+        """)
+        basic_layout.addWidget(self.sku_input, 2, 3)
+        
         basic_group.setLayout(basic_layout)
         container_layout.addWidget(basic_group)
         
@@ -615,6 +581,7 @@ class AddEditProductDialog(QDialog):
         self.price_input.setValue(float(self.product['price']))
         self.quantity_input.setValue(self.product['quantity'])
         self.reorder_input.setValue(self.product['reorder_level'])
+        self.sku_input.setText(self.product.get('sku') or '')
         self.description_input.setText(self.product['description'] or '')
         
         # Load image if exists
@@ -632,11 +599,15 @@ class AddEditProductDialog(QDialog):
             self.display_image(file_path)
     
     def display_image(self, file_path):
-        pixmap = QPixmap(file_path)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+        image_cache().request(file_path, 200, 200, self.show_image)
+    
+    def show_image(self, pixmap):
+        try:
+            self.image_label.setPixmap(pixmap)
             self.image_label.setText("")
+        except RuntimeError:
+            # Dialog closed before the image was decoded
+            pass
     
     def save_product(self):
         # Validate required fields
@@ -651,6 +622,7 @@ class AddEditProductDialog(QDialog):
             'price': self.price_input.value(),
             'quantity': self.quantity_input.value(),
             'reorder_level': self.reorder_input.value(),
+            'sku': self.sku_input.text().strip(),
             'description': self.description_input.toPlainText().strip(),
             'image_path': self.current_image_path or (self.product['image_path'] if self.product else None)
         }
@@ -662,14 +634,14 @@ class AddEditProductDialog(QDialog):
                     QMessageBox.information(self, "Success", "Product updated successfully")
                     self.accept()
                 else:
-                    QMessageBox.warning(self, "Error", "Failed to update product")
+                    QMessageBox.warning(self, "Error", "Failed to update product. Is the SKU already in use?")
             else:
                 # Add new product
                 if self.product_model.add_product(product_data):
                     QMessageBox.information(self, "Success", "Product added successfully")
                     self.accept()
                 else:
-                    QMessageBox.warning(self, "Error", "Failed to add product")
+                    QMessageBox.warning(self, "Error", "Failed to add product. Is the SKU already in use?")
                     
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
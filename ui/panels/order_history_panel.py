@@ -2,17 +2,22 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QTableWidget, QTableWidgetItem,
                              QComboBox, QMessageBox, QHeaderView, QDialog,
                              QFormLayout, QGroupBox)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from models.order_model import OrderModel
+from ui.panels.data_loader import DataLoader
 
 class OrderHistoryPanel(QWidget):
+    PAGE_SIZE = 50
+    
     def __init__(self, db, user_id):
         super().__init__()
         self.db = db
         self.user_id = user_id
         self.order_model = OrderModel(db)
+        self.last_order_key = None
         self.init_ui()
-        QTimer.singleShot(0, self.load_orders)
+        self.loader = DataLoader(self, self.orders_table)
+        self.load_orders()
     
     def init_ui(self):
         self.setStyleSheet("background-color: #f9d162;")
@@ -101,15 +106,60 @@ class OrderHistoryPanel(QWidget):
             }
         """)
         refresh_btn.clicked.connect(self.refresh_orders)  # Connect to new method
-        layout.addWidget(refresh_btn, alignment=Qt.AlignmentFlag.AlignRight)
+        
+        # Load more button for older orders
+        self.load_more_btn = QPushButton("Load More")
+        self.load_more_btn.setStyleSheet("""
+            QPushButton {
+                background: #95a5a6;
+                color: white;
+                padding: 10px 20px;
+                border: none;
+                border-radius: 5px;
+                font-weight: bold;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background: #7f8c8d;
+            }
+        """)
+        self.load_more_btn.clicked.connect(self.load_more_orders)
+        self.load_more_btn.hide()
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.load_more_btn)
+        buttons_layout.addWidget(refresh_btn)
+        layout.addLayout(buttons_layout)
         
         self.setLayout(layout)
     
     def load_orders(self):
-        orders = self.order_model.get_orders_by_customer(self.user_id)
-        self.orders_table.setRowCount(len(orders))
+        # First page only; older orders are fetched on demand
+        self.orders_table.setRowCount(0)
+        self.last_order_key = None
+        self.load_more_orders()
+    
+    def load_more_orders(self):
+        self.load_more_btn.setEnabled(False)
+        self.loader.load('orders', self.order_model.get_orders_by_customer, self.user_id,
+                         include_items=True, limit=self.PAGE_SIZE, after=self.last_order_key,
+                         on_result=self.on_orders_loaded)
+    
+    def on_orders_loaded(self, orders):
+        orders = orders or []
+        self.load_more_btn.setEnabled(True)
+        if orders:
+            self.last_order_key = (orders[-1]['order_date'], orders[-1]['id'])
+        self.load_more_btn.setVisible(len(orders) == self.PAGE_SIZE)
+        self.append_orders(orders)
+        self.filter_orders(self.status_combo.currentText())
+    
+    def append_orders(self, orders):
+        first_row = self.orders_table.rowCount()
+        self.orders_table.setRowCount(first_row + len(orders))
         
-        for row, order in enumerate(orders):
+        for row, order in enumerate(orders, start=first_row):
             self.orders_table.setItem(row, 0, QTableWidgetItem(str(order['id'])))
             
             # Format date
@@ -119,11 +169,13 @@ class OrderHistoryPanel(QWidget):
                 order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
             self.orders_table.setItem(row, 1, QTableWidgetItem(order_date.strftime('%Y-%m-%d %H:%M')))
             
-            # Get order items count
-            items = self.order_model.get_order_details(order['id'])
-            items_count = len(items)
+            # Items count comes pre-aggregated with the page
+            items_count = order.get('item_count', 0)
             items_text = f"{items_count} item{'s' if items_count != 1 else ''}"
-            self.orders_table.setItem(row, 2, QTableWidgetItem(items_text))
+            items_item = QTableWidgetItem(items_text)
+            if order.get('item_summary'):
+                items_item.setToolTip(order['item_summary'])
+            self.orders_table.setItem(row, 2, items_item)
             
             self.orders_table.setItem(row, 3, QTableWidgetItem(f"₱{float(order['total_amount']):.2f}"))
             
@@ -208,7 +260,7 @@ class OrderHistoryPanel(QWidget):
             self.orders_table.setCellWidget(row, 6, actions_widget)
     
     def refresh_orders(self):
-        QTimer.singleShot(0, self.load_orders)
+        self.load_orders()
     
     def filter_orders(self, status):
         if status == "All":
@@ -266,8 +318,7 @@ class OrderHistoryPanel(QWidget):
         reply = msg_box.exec()
 
         if reply == QMessageBox.StandardButton.Yes:
-            query = "UPDATE orders SET status = 'Cancelled' WHERE id = %s"
-            if self.db.execute_query(query, (order_id,)):
+            if self.order_model.update_order_status(order_id, 'Cancelled'):
                 # Success message
                 success_msg = QMessageBox(self)
                 success_msg.setWindowTitle("Success")
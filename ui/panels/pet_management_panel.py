@@ -1,13 +1,24 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QTableWidget, QTableWidgetItem,
+                             QPushButton,
                              QLineEdit, QComboBox, QTextEdit, QDoubleSpinBox,
                              QSpinBox, QFileDialog, QMessageBox, QHeaderView,
                              QDialog, QDialogButtonBox, QGroupBox, QScrollArea, 
                              QGridLayout)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
 import os
 from models.pet_model import PetModel
+from ui.panels.catalog_transfer import CatalogTransfer
+from ui.panels.data_loader import DataLoader
+from ui.panels.image_cache import image_cache
+from ui.panels.table_model import (RowTableModel, Column, ActionButton, ButtonDelegate,
+                                   create_table_view, text_filter)
+
+STATUS_COLORS = {
+    'Available': Qt.GlobalColor.darkGreen,
+    'Sold': Qt.GlobalColor.blue,
+    'Reserved': Qt.GlobalColor.darkYellow,
+    'Adopted': Qt.GlobalColor.darkMagenta,
+}
 
 class PetManagementPanel(QWidget):
     def __init__(self, db, user_id):
@@ -16,7 +27,9 @@ class PetManagementPanel(QWidget):
         self.user_id = user_id
         self.pet_model = PetModel(db)
         self.current_image_path = None
+        self.transfer = CatalogTransfer(self, db, 'pets', created_by=user_id, on_imported=self.load_pets)
         self.init_ui()
+        self.loader = DataLoader(self, self.pets_table)
         self.load_pets()
     
     def init_ui(self):
@@ -32,6 +45,9 @@ class PetManagementPanel(QWidget):
         header_layout.addSpacing(10)
         header_layout.addStretch()
         
+        for transfer_btn in self.transfer.buttons():
+            header_layout.addWidget(transfer_btn)
+        
         add_btn = QPushButton("Add New Pet")
         add_btn.setStyleSheet("""
             QPushButton {
@@ -114,15 +130,26 @@ class PetManagementPanel(QWidget):
         layout.addSpacing(20)
         
         # Pets table
-        self.pets_table = QTableWidget()
-        self.pets_table.setColumnCount(9)
-        self.pets_table.setHorizontalHeaderLabels([
-            "ID", "Name", "Species", "Breed", "Age", "Gender", "Price", "Status", "Actions"
-        ])
+        self.pets_model = RowTableModel([
+            Column("ID", 'id'),
+            Column("Name", 'name'),
+            Column("Species", 'species'),
+            Column("Breed", display=lambda p: p['breed'] or ''),
+            Column("Age", 'age'),
+            Column("Gender", 'gender'),
+            Column("Price", display=lambda p: f"₱{p['price']:.2f}", sort_key=lambda p: float(p['price'])),
+            Column("Status", 'status', foreground=lambda p: STATUS_COLORS.get(p['status'])),
+            Column("Actions", sort_key=lambda p: p['name']),
+        ], self)
+        self.pets_table, self.pets_proxy = create_table_view(self.pets_model)
+        self.pets_table.setItemDelegateForColumn(8, ButtonDelegate([
+            ActionButton("Edit", '#3498db', self.edit_pet),
+            ActionButton("Delete", '#dc3545', lambda p: self.delete_pet(p['id'])),
+        ], self.pets_table))
         
         # Style the table
         self.pets_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -154,99 +181,20 @@ class PetManagementPanel(QWidget):
         self.setLayout(layout)
     
     def load_pets(self):
-        pets = self.pet_model.get_all_pets()
-        self.pets_table.setRowCount(len(pets))
-        
-        for row, pet in enumerate(pets):
-            self.pets_table.setItem(row, 0, QTableWidgetItem(str(pet['id'])))
-            self.pets_table.setItem(row, 1, QTableWidgetItem(pet['name']))
-            self.pets_table.setItem(row, 2, QTableWidgetItem(pet['species']))
-            self.pets_table.setItem(row, 3, QTableWidgetItem(pet['breed'] or ''))
-            self.pets_table.setItem(row, 4, QTableWidgetItem(str(pet['age'])))
-            self.pets_table.setItem(row, 5, QTableWidgetItem(pet['gender']))
-            self.pets_table.setItem(row, 6, QTableWidgetItem(f"₱{pet['price']:.2f}"))
-            
-            # Status with color coding
-            status_item = QTableWidgetItem(pet['status'])
-            if pet['status'] == 'Available':
-                status_item.setForeground(Qt.GlobalColor.darkGreen)
-            elif pet['status'] == 'Sold':
-                status_item.setForeground(Qt.GlobalColor.blue)
-            elif pet['status'] == 'Reserved':
-                status_item.setForeground(Qt.GlobalColor.darkYellow)
-            elif pet['status'] == 'Adopted':
-                status_item.setForeground(Qt.GlobalColor.darkMagenta)
-            self.pets_table.setItem(row, 7, status_item)
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_widget.setStyleSheet("background-color: white;")
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(5, 5, 5, 5)
-            
-            edit_btn = QPushButton("Edit")
-            edit_btn.setMinimumHeight(20)
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background: #3498db;
-                    color: white;
-                    padding: 5px 10px;
-                    border: none;
-                    border-radius: 5px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background: #2980b9;
-                }
-            """)
-            edit_btn.clicked.connect(lambda checked, p=pet: self.edit_pet(p))
-            
-            delete_btn = QPushButton("Delete")
-            delete_btn.setMinimumHeight(20)
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background: #dc3545;
-                    color: white;
-                    padding: 5px 10px;
-                    border: none;
-                    border-radius: 5px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background: #c82333;
-                }
-            """)
-            delete_btn.clicked.connect(lambda checked, p=pet: self.delete_pet(p['id']))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addStretch()
-            
-            actions_widget.setLayout(actions_layout)
-            self.pets_table.setCellWidget(row, 8, actions_widget)
+        self.loader.load('pets', self.pet_model.get_all_pets, on_result=self.display_pets)
+    
+    def display_pets(self, pets):
+        self.pets_model.set_rows(pets)
     
     def search_pets(self):
-        search_text = self.search_input.text().lower()
-        for row in range(self.pets_table.rowCount()):
-            match = False
-            for col in range(7):  # Check first 7 columns
-                item = self.pets_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    match = True
-                    break
-            self.pets_table.setRowHidden(row, not match)
+        # Check first 7 columns
+        self.pets_proxy.set_filter('search', text_filter(self.search_input.text(), self.pets_model.columns[:7]))
     
     def filter_pets(self, status):
         if status == "All":
-            for row in range(self.pets_table.rowCount()):
-                self.pets_table.setRowHidden(row, False)
+            self.pets_proxy.set_filter('status', None)
         else:
-            for row in range(self.pets_table.rowCount()):
-                status_item = self.pets_table.item(row, 7)
-                if status_item and status_item.text() == status:
-                    self.pets_table.setRowHidden(row, False)
-                else:
-                    self.pets_table.setRowHidden(row, True)
+            self.pets_proxy.set_filter('status', lambda pet: pet['status'] == status)
     
     def show_add_pet_dialog(self):
         dialog = AddEditPetDialog(self.pet_model, self.user_id)
@@ -699,11 +647,15 @@ class AddEditPetDialog(QDialog):
             self.display_image(file_path)
     
     def display_image(self, file_path):
-        pixmap = QPixmap(file_path)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+        image_cache().request(file_path, 200, 200, self.show_image)
+    
+    def show_image(self, pixmap):
+        try:
+            self.image_label.setPixmap(pixmap)
             self.image_label.setText("")
+        except RuntimeError:
+            # Dialog closed before the image was decoded
+            pass
     
     def save_pet(self):
         # Validate required fields
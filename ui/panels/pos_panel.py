@@ -2,12 +2,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QTableWidget, QTableWidgetItem,
                              QLineEdit, QComboBox, QSpinBox, QMessageBox,
                              QHeaderView, QGroupBox, QDialog, QFormLayout,
-                             QDialogButtonBox, QScrollArea, QGridLayout)
-from PyQt6.QtCore import Qt
+                             QDialogButtonBox)
+from PyQt6.QtCore import Qt, QTimer
 from models.product_model import ProductModel
 from models.pet_model import PetModel
 from models.order_model import OrderModel
 from models.user_model import UserModel
+from ui.panels.data_loader import DataLoader
+from ui.panels.catalog_view import CatalogModel, create_catalog_view
 
 class POSPanel(QWidget):
     def __init__(self, db, user_id, user_role):
@@ -23,8 +25,8 @@ class POSPanel(QWidget):
         self.products = []
         self.pets = []
         self.init_ui()
-        self.load_products()
-        self.load_pets()
+        self.loader = DataLoader(self, self.items_view)
+        self.load_catalog()
     
     def init_ui(self):
         self.setStyleSheet("""
@@ -114,18 +116,57 @@ class POSPanel(QWidget):
                 background-color: white;
             }
         """)
-        self.search_input.textChanged.connect(self.search_items)
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.search_items)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        self.search_input.returnPressed.connect(self.search_items)
         filter_layout.addWidget(self.search_input)
 
         filter_layout.addStretch()
         left_layout.addWidget(filter_widget)
+        
+        # Barcode scanners type the code and press Enter, like a keyboard
+        scan_widget = QWidget()
+        scan_layout = QHBoxLayout(scan_widget)
+        scan_label = QLabel("Scan:")
+        scan_label.setStyleSheet("""
+            QLabel {    
+                background-color: white;
+                color: black;
+                padding: 5px 10px;
+            }
+        """)
+        scan_layout.addWidget(scan_label)
+        
+        self.scan_input = QLineEdit()
+        self.scan_input.setPlaceholderText("Scan barcode or type SKU and press Enter")
+        self.scan_input.setStyleSheet("""
+            QLineEdit {
+                color: black;
+                padding: 5px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        self.scan_input.returnPressed.connect(self.scan_item)
+        scan_layout.addWidget(self.scan_input)
+        
+        self.scan_status = QLabel("")
+        self.scan_status.setStyleSheet("color: black; padding: 5px 10px;")
+        scan_layout.addWidget(self.scan_status)
+        scan_layout.addStretch()
+        left_layout.addWidget(scan_widget)
         left_layout.addSpacing(20)
         
-        # Items grid with scroll area
-        self.items_scroll = QScrollArea()
-        self.items_scroll.setWidgetResizable(True)
-        self.items_scroll.setStyleSheet("""
-            QScrollArea {
+        # Catalog cards are painted by a delegate, so only the visible ones cost anything
+        self.catalog_model = CatalogModel(self)
+        self.items_view, self.items_proxy = create_catalog_view(self.catalog_model, self.add_entry_to_cart)
+        self.items_view.setStyleSheet("""
+            QListView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -145,13 +186,7 @@ class POSPanel(QWidget):
             }
         """)
         
-        # Create container widget for scroll area
-        scroll_widget = QWidget()
-        self.items_layout = QVBoxLayout(scroll_widget)
-        self.items_layout.setSpacing(10)
-        self.items_scroll.setWidget(scroll_widget)
-        
-        left_layout.addWidget(self.items_scroll)
+        left_layout.addWidget(self.items_view)
         
         # Right side - Cart and checkout
         right_container = QWidget()
@@ -412,334 +447,87 @@ class POSPanel(QWidget):
             customer_name = customer_text.split(' (ID:')[0].strip()
             self.customer_name_input.setText(customer_name)
     
-    def load_products(self):
-        self.products = self.product_model.get_all_products()
-        self.display_items()
+    def load_catalog(self):
+        self.loader.load('catalog', self.fetch_catalog, on_result=self.display_items)
+    
+    def fetch_catalog(self):
+        # Runs on the query pool; both lists arrive together so the view is built once
+        products = self.product_model.get_all_products() or []
+        pets = self.pet_model.get_all_pets('Available') or []
+        return products, pets
     
-    def load_pets(self):
-        self.pets = self.pet_model.get_all_pets('Available')
-        self.display_items()
+    def display_items(self, catalog):
+        products, pets = catalog
+        self.products = products
+        self.pets = pets
+        self.catalog_model.set_catalog(products, pets)
+        # The old matches refer to the previous catalog
+        self.search_items()
 
-    def search_items(self, text):
-        """Search items by name"""
-        text = text.lower()
-        
-        # Iterate through all group boxes
-        for i in range(self.items_layout.count()):
-            group_box = self.items_layout.itemAt(i).widget()
-            if group_box:
-                # Get the main layout of the group box
-                group_layout = group_box.layout()
-                if group_layout:
-                    # Get the grid layout inside the group box
-                    grid_layout = None
-                    for j in range(group_layout.count()):
-                        item = group_layout.itemAt(j)
-                        if item and item.layout():
-                            grid_layout = item.layout()
-                            break
-                    
-                    if grid_layout:
-                        # Search through grid items
-                        for j in range(grid_layout.count()):
-                            item_widget = grid_layout.itemAt(j).widget()
-                            if item_widget:
-                                # Find QLabel children to search in their text
-                                found = False
-                                for child in item_widget.findChildren(QLabel):
-                                    if child and child.text():
-                                        if text in child.text().lower():
-                                            found = True
-                                            break
-                                
-                                if found:
-                                    item_widget.show()
-                                else:
-                                    item_widget.hide()
+    def search_items(self):
+        """Search items by name, category, species or breed"""
+        self.search_timer.stop()
+        self.items_proxy.set_filter('search', self.catalog_model.search_filter(self.search_input.text()))
 
     def filter_items(self, category):
         # Filter items by category
-        for i in range(self.items_layout.count()):
-            group_box = self.items_layout.itemAt(i).widget()
-            if group_box:
-                group_name = group_box.title().lower()
-                
-                if category == "All Items":
-                    group_box.show()
-                elif category == "Products":
-                    if "products" in group_name:
-                        group_box.show()
-                    else:
-                        group_box.hide()
-                elif category == "Pets":
-                    if "pets" in group_name:
-                        group_box.show()
-                    else:
-                        group_box.hide()
+        if category == "Products":
+            self.items_proxy.set_filter('category', lambda entry: entry['kind'] == 'product')
+        elif category == "Pets":
+            self.items_proxy.set_filter('category', lambda entry: entry['kind'] == 'pet')
+        else:
+            self.items_proxy.set_filter('category', None)
     
-    def display_items(self):
-        # Display all items in the grid
-        # Clear existing items
-        for i in reversed(range(self.items_layout.count())): 
-            widget = self.items_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        # Display products in grid layout
-        products_group = QGroupBox("Products")
-        products_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #e1e1e1;
-                border-radius: 8px;
-                margin-top: 10px;
-                background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: black;
-            }
-        """)
-        
-        products_main_layout = QVBoxLayout(products_group)
-        products_grid = QGridLayout()
-        products_grid.setHorizontalSpacing(10)
-        products_grid.setVerticalSpacing(10)
-        products_grid.setContentsMargins(10, 10, 10, 10)
-        
-        row = 0
-        col = 0
-        for product in self.products:
-            if product['quantity'] > 0:
-                item_widget = self.create_product_item(product)
-                if item_widget:
-                    products_grid.addWidget(item_widget, row, col)
-                    col += 1
-                    if col == 3:
-                        col = 0
-                        row += 1
-        
-        products_main_layout.addLayout(products_grid)
-        self.items_layout.addWidget(products_group)
-        
-        # Display pets in grid layout
-        pets_group = QGroupBox("Available Pets")
-        pets_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #e1e1e1;
-                border-radius: 8px;
-                margin-top: 10px;
-                background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: black;
-            }
-        """)
-        
-        pets_main_layout = QVBoxLayout(pets_group)
-        pets_grid = QGridLayout()
-        pets_grid.setHorizontalSpacing(10)
-        pets_grid.setVerticalSpacing(10)
-        pets_grid.setContentsMargins(10, 10, 10, 10)
+    def scan_item(self):
+        sku = self.scan_input.text().strip()
+        self.scan_input.clear()
+        if not sku:
+            return
         
-        row = 0
-        col = 0
-        for pet in self.pets:
-            item_widget = self.create_pet_item(pet)
-            if item_widget:
-                pets_grid.addWidget(item_widget, row, col)
-                col += 1
-                if col == 3:
-                    col = 0
-                    row += 1
+        product_id = self.product_model.find_product_id_by_sku(sku)
+        entry = self.catalog_model.entry('product', product_id) if product_id else None
+        if entry is None:
+            self.show_scan_status(f"No product in stock for {sku}", '#e74c3c')
+            return
         
-        pets_main_layout.addLayout(pets_grid)
-        self.items_layout.addWidget(pets_group)
+        # No confirmation pop-up, so the next scan can follow straight away
+        if self.add_product_to_cart(entry['item'], 1, notify=False):
+            self.show_scan_status(f"Added {entry['item']['name']}", '#27ae60')
     
-    def create_product_item(self, product):
-        # Create a widget for a product item
-        widget = QWidget()
-        widget.setFixedWidth(200)
-        
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(3)
-        
-        # Product info
-        name_label = QLabel(product['name'])
-        name_label.setStyleSheet("""
-            font-weight: bold; 
-            font-size: 13px; 
-            color: black;
-            qproperty-wordWrap: true;
-        """)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name_label.setObjectName("item_name")  # Add object name for searching
-        
-        price_label = QLabel(f"₱{product['price']:.2f}")
-        price_label.setStyleSheet("""
-            color: #27ae60; 
-            font-weight: bold; 
-            font-size: 12px;
-        """)
-        price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        stock_label = QLabel(f"Stock: {product['quantity']}")
-        stock_label.setStyleSheet("""
-            color: black; 
-            font-size: 10px;
-        """)
-        stock_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Add to cart section
-        cart_widget = QWidget()
-        cart_layout = QHBoxLayout(cart_widget)
-        cart_layout.setSpacing(3)
-        cart_layout.setContentsMargins(0, 0, 0, 0)
-        
-        qty_label = QLabel("Qty:")
-        qty_label.setStyleSheet("""
-            color: black; 
-            font-size: 10px;
-        """)
-        qty_label.setMaximumHeight(20)
-        
-        quantity_spin = QSpinBox()
-        quantity_spin.setRange(1, min(10, product['quantity']))
-        quantity_spin.setValue(1)
-        quantity_spin.setStyleSheet("""
-            QSpinBox {
-                padding: 2px;
-                border: 1px solid #ddd;
-                border-radius: 3px;
-                background-color: white;
-                color: black;
-                max-height: 20px;
-            }
-        """)
-        quantity_spin.setMaximumHeight(20)
-        
-        add_btn = QPushButton("Add")
-        add_btn.setStyleSheet("""
-            QPushButton {
-                background: #3498db;
-                color: white;
-                padding: 3px 8px;
-                border: none;
-                border-radius: 3px;
-                font-size: 10px;
-                font-weight: bold;
-                max-height: 20px;
-            }
-            QPushButton:hover {
-                background: #2980b9;
-            }
-        """)
-        add_btn.setMaximumHeight(20)
-        add_btn.clicked.connect(lambda: self.add_product_to_cart(product, quantity_spin.value()))
-        
-        cart_layout.addWidget(qty_label)
-        cart_layout.addWidget(quantity_spin)
-        cart_layout.addWidget(add_btn)
-        
-        layout.addWidget(name_label)
-        layout.addWidget(price_label)
-        layout.addWidget(stock_label)
-        layout.addWidget(cart_widget)
-        
-        widget.setStyleSheet("""
-            QWidget {
-                border: 1px solid #e1e1e1;
-                border-radius: 5px;
-                background-color: white;
-            }
-            QWidget:hover {
-                background: #f8f9fa;
-            }
-        """)
-        
-        return widget
+    def show_scan_status(self, text, color):
+        self.scan_status.setText(text)
+        self.scan_status.setStyleSheet(f"color: {color}; font-weight: bold; padding: 5px 10px;")
     
-    def create_pet_item(self, pet):
-        # Create a widget for a pet item
-        widget = QWidget()
-        widget.setFixedWidth(200)
-        
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(3)
-        
-        # Pet info
-        name_label = QLabel(pet['name'])
-        name_label.setStyleSheet("""
-            font-weight: bold; 
-            font-size: 13px; 
-            color: black;
-            qproperty-wordWrap: true;
-        """)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name_label.setObjectName("item_name")  # Add object name for searching
-        
-        breed_label = QLabel(f"{pet['species']} - {pet['breed']}")
-        breed_label.setStyleSheet("""
-            color: black; 
-            font-size: 10px;
-        """)
-        breed_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        price_label = QLabel(f"₱{pet['price']:.2f}")
-        price_label.setStyleSheet("""
-            color: #e74c3c; 
-            font-weight: bold; 
-            font-size: 12px;
-        """)
-        price_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Add to cart button
-        add_btn = QPushButton("Add to Cart")
-        add_btn.setStyleSheet("""
-            QPushButton {
-                background: #e74c3c;
-                color: white;
-                padding: 4px 10px;
-                border: none;
-                border-radius: 3px;
-                font-weight: bold;
-                font-size: 11px;
-                max-height: 20px;
-            }
-            QPushButton:hover {
-                background: #c0392b;
-            }
-        """)
-        add_btn.setMaximumHeight(20)
-        add_btn.clicked.connect(lambda: self.add_pet_to_cart(pet))
-        
-        layout.addWidget(name_label)
-        layout.addWidget(breed_label)
-        layout.addWidget(price_label)
-        layout.addWidget(add_btn, 0, Qt.AlignmentFlag.AlignCenter)
-        
-        widget.setStyleSheet("""
-            QWidget {
-                border: 1px solid #e1e1e1;
-                border-radius: 5px;
-                background-color: white;
-            }
-            QWidget:hover {
-                background: #f8f9fa;
-            }
-        """)
-        
-        return widget
+    def add_entry_to_cart(self, entry):
+        if entry['kind'] == 'pet':
+            self.add_pet_to_cart(entry['item'])
+        else:
+            self.add_product_to_cart(entry['item'], entry['qty'])
+    
+    def refresh_sold_items(self, sold_items):
+        # Update just the cards that changed instead of reloading the whole catalog
+        product_ids = []
+        for item in sold_items:
+            if item['type'] == 'pet':
+                self.catalog_model.remove_item('pet', item['id'])
+            elif item['id'] not in product_ids:
+                product_ids.append(item['id'])
+        if product_ids:
+            self.loader.load('stock', self.product_model.get_products_by_ids, product_ids,
+                             on_result=lambda products: self.update_stock(product_ids, products))
     
-    def add_product_to_cart(self, product, quantity):
+    def update_stock(self, product_ids, products):
+        if products is False:
+            return
+        found = set()
+        for product in products:
+            found.add(product['id'])
+            self.catalog_model.update_item('product', product)
+        for product_id in product_ids:
+            if product_id not in found:
+                self.catalog_model.remove_item('product', product_id)
+    
+    def add_product_to_cart(self, product, quantity, notify=True):
         cart_item = {
             'type': 'product',
             'id': product['id'],
@@ -748,7 +536,7 @@ class POSPanel(QWidget):
             'quantity': quantity,
             'max_quantity': product['quantity']
         }
-        self.add_to_cart(cart_item)
+        return self.add_to_cart(cart_item, notify)
     
     def add_pet_to_cart(self, pet):
         cart_item = {
@@ -761,7 +549,7 @@ class POSPanel(QWidget):
         }
         self.add_to_cart(cart_item)
     
-    def add_to_cart(self, item):
+    def add_to_cart(self, item, notify=True):
         # Check if item already in cart
         for i, cart_item in enumerate(self.current_cart):
             if cart_item['type'] == item['type'] and cart_item['id'] == item['id']:
@@ -769,17 +557,20 @@ class POSPanel(QWidget):
                     new_quantity = cart_item['quantity'] + item['quantity']
                     if new_quantity <= cart_item['max_quantity']:
                         self.current_cart[i]['quantity'] = new_quantity
-                    else:
-                        QMessageBox.warning(self, "Stock Limit", 
-                                          f"Cannot add more than {cart_item['max_quantity']} units")
+                        self.update_cart_display()
+                        return True
+                    QMessageBox.warning(self, "Stock Limit", 
+                                        f"Cannot add more than {cart_item['max_quantity']} units")
                 else:
                     QMessageBox.warning(self, "Already in Cart", "This pet is already in your cart")
                 self.update_cart_display()
-                return
+                return False
         
         self.current_cart.append(item)
         self.update_cart_display()
-        QMessageBox.information(self, "Added to Cart", f"{item['name']} added to cart")
+        if notify:
+            QMessageBox.information(self, "Added to Cart", f"{item['name']} added to cart")
+        return True
     
     def update_cart_display(self):
         self.cart_table.setRowCount(len(self.current_cart))
@@ -886,11 +677,11 @@ class POSPanel(QWidget):
         dialog = CheckoutDialog(self.current_cart, self.user_id, self.order_model, 
                                self.user_model, customer_name)
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            sold_items = list(self.current_cart)
             self.current_cart.clear()
             self.customer_name_input.clear()
             self.update_cart_display()
-            self.load_products()
-            self.load_pets()
+            self.refresh_sold_items(sold_items)
             self.load_existing_customers()
 
 
@@ -308,9 +308,6 @@ class ProfilePanel(QWidget):
             
             # Update password
             if self.user_model.update_password(self.user_id, new_password):
-                if hasattr(self.user_model, 'close'):
-                    self.user_model.close()
-                self.user_model = UserModel(self.db)
                 self.show_styled_message("Success", 
                                       "Password changed successfully!")
                 
@@ -8,8 +8,13 @@ from models.order_model import OrderModel
 from models.appointment_model import AppointmentModel
 from models.pet_model import PetModel
 from models.product_model import ProductModel
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from ui.panels.data_loader import DataLoader
+
+def load_pyplot():
+    # matplotlib takes longer to import than the rest of the app; load it with the first chart
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    return plt, FigureCanvas
 
 class ReportsPanel(QWidget):
     def __init__(self, db):
@@ -20,6 +25,7 @@ class ReportsPanel(QWidget):
         self.pet_model = PetModel(db)
         self.product_model = ProductModel(db)
         self.init_ui()
+        self.loader = DataLoader(self, self.scroll_area)
         self.load_sales_report()  # Start with sales report by default
     
     def init_ui(self):
@@ -213,23 +219,26 @@ class ReportsPanel(QWidget):
         start_date = self.start_date.date().toString('yyyy-MM-dd')
         end_date = self.end_date.date().toString('yyyy-MM-dd')
         
-        # Get sales data
-        orders = self.order_model.get_all_orders()
-        
-        # Filter orders by date
-        filtered_orders = []
+        # Every report shares one key, so picking another report drops this one
+        self.loader.load('report', self.fetch_sales_report, start_date, end_date,
+                         on_result=self.show_sales_report)
+    
+    def fetch_sales_report(self, start_date, end_date):
+        # Read the per-day series from the daily_sales rollup; one row per day in range
+        daily_sales = {}
         total_revenue = 0
         total_orders = 0
-        
-        for order in orders:
-            order_date = order['order_date']
-            if isinstance(order_date, str):
-                order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
-            
-            if start_date <= order_date.strftime('%Y-%m-%d') <= end_date:
-                filtered_orders.append(order)
-                total_revenue += float(order['total_amount'])
-                total_orders += 1
+        for day in self.order_model.get_rollup_daily_sales(start_date, end_date):
+            sales_date = day['sales_date']
+            if not isinstance(sales_date, str):
+                sales_date = sales_date.strftime('%Y-%m-%d')
+            daily_sales[sales_date] = float(day['revenue'] or 0)
+            total_revenue += float(day['revenue'] or 0)
+            total_orders += int(day['order_count'] or 0)
+        return start_date, end_date, daily_sales, total_revenue, total_orders
+    
+    def show_sales_report(self, report):
+        start_date, end_date, daily_sales, total_revenue, total_orders = report
         
         # Calculate average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
@@ -265,11 +274,11 @@ class ReportsPanel(QWidget):
         self.report_layout.addWidget(stats_container)
         
         # Show sales chart
-        self.create_sales_chart(filtered_orders)
+        self.create_sales_chart(daily_sales)
         
         # NO Recent Orders table - Removed as requested
         
-        if not filtered_orders:
+        if not daily_sales:
             no_data_label = QLabel("No sales data found for the selected period")
             no_data_label.setStyleSheet("""
                 QLabel {
@@ -293,21 +302,44 @@ class ReportsPanel(QWidget):
         start_date = self.start_date.date().toString('yyyy-MM-dd')
         end_date = self.end_date.date().toString('yyyy-MM-dd')
         
-        appointments = self.appointment_model.get_all_appointments()
-        
-        # Filter and count by status
+        # A stream cut short raises instead of returning partial totals
+        self.loader.load('report', self.fetch_appointment_report, start_date, end_date,
+                         on_result=self.show_appointment_report, on_error=self.show_report_error)
+    
+    def show_report_error(self, message):
+        self.clear_report_content()
+        error_label = QLabel(f"Could not load the report: {message}")
+        error_label.setWordWrap(True)
+        error_label.setStyleSheet("""
+            QLabel {
+                background-color: #f9fafb;
+                color: #c0392b;
+                font-size: 16px;
+                padding: 20px;
+                border-radius: 5px;
+            }
+        """)
+        self.report_layout.addWidget(error_label)
+        self.report_layout.addStretch()
+    
+    def fetch_appointment_report(self, start_date, end_date):
+        # Filter and count by status while streaming appointments
         status_count = {'Pending': 0, 'Approved': 0, 'Completed': 0, 'Cancelled': 0}
         service_count = {}
         
-        for apt in appointments:
-            apt_date = apt['appointment_date']
-            if isinstance(apt_date, str):
-                apt_date = datetime.strptime(apt_date, '%Y-%m-%d %H:%M:%S')
-            
-            if start_date <= apt_date.strftime('%Y-%m-%d') <= end_date:
-                status_count[apt['status']] += 1
-                service_count[apt['service_type']] = service_count.get(apt['service_type'], 0) + 1
-        
+        for appointments in self.appointment_model.iter_all_appointments():
+            for apt in appointments:
+                apt_date = apt['appointment_date']
+                if isinstance(apt_date, str):
+                    apt_date = datetime.strptime(apt_date, '%Y-%m-%d %H:%M:%S')
+                
+                if start_date <= apt_date.strftime('%Y-%m-%d') <= end_date:
+                    status_count[apt['status']] += 1
+                    service_count[apt['service_type']] = service_count.get(apt['service_type'], 0) + 1
+        return status_count, service_count
+    
+    def show_appointment_report(self, report):
+        status_count, service_count = report
         total_appointments = sum(status_count.values())
         
         # Report title
@@ -364,7 +396,11 @@ class ReportsPanel(QWidget):
         """Load inventory report"""
         self.clear_report_content()
         
-        products = self.product_model.get_all_products()
+        self.loader.load('report', self.product_model.get_all_products,
+                         on_result=self.show_inventory_report)
+    
+    def show_inventory_report(self, products):
+        products = products or []
         
         # Calculate inventory stats
         total_products = len(products)
@@ -428,10 +464,10 @@ class ReportsPanel(QWidget):
         """Load pet report"""
         self.clear_report_content()
         
-        start_date = self.start_date.date().toString('yyyy-MM-dd')
-        end_date = self.end_date.date().toString('yyyy-MM-dd')
-        
-        pets = self.pet_model.get_all_pets()
+        self.loader.load('report', self.pet_model.get_all_pets, on_result=self.show_pet_report)
+    
+    def show_pet_report(self, pets):
+        pets = pets or []
         
         # Count pets by status and species
         status_count = {'Available': 0, 'Sold': 0, 'Adopted': 0, 'Reserved': 0}
@@ -539,15 +575,8 @@ class ReportsPanel(QWidget):
         
         layout.addWidget(card)
     
-    def create_sales_chart(self, orders):
-        # Group orders by date
-        daily_sales = {}
-        for order in orders:
-            order_date = order['order_date']
-            if isinstance(order_date, str):
-                order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
-            date_str = order_date.strftime('%Y-%m-%d')
-            daily_sales[date_str] = daily_sales.get(date_str, 0) + float(order['total_amount'])
+    def create_sales_chart(self, daily_sales):
+        plt, FigureCanvas = load_pyplot()
         
         # Create matplotlib figure with smaller fonts
         fig, ax = plt.subplots(figsize=(10, 4))
@@ -593,6 +622,8 @@ class ReportsPanel(QWidget):
         plt.rcParams.update(plt.rcParamsDefault)
     
     def create_appointment_chart(self, status_count, service_count):
+        plt, FigureCanvas = load_pyplot()
+        
         # Set smaller font sizes for chart
         plt.rcParams.update({
             'font.size': 9,
@@ -694,6 +725,8 @@ class ReportsPanel(QWidget):
         self.report_layout.addWidget(table)
     
     def create_pets_chart(self, status_count, species_count):
+        plt, FigureCanvas = load_pyplot()
+        
         # Set smaller font sizes for chart
         plt.rcParams.update({
             'font.size': 9,
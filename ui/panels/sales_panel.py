@@ -6,15 +6,31 @@ from PyQt6.QtCore import QDateTime, Qt
 from datetime import datetime
 from models.order_model import OrderModel
 from models.user_model import UserModel
+from ui.panels.data_loader import DataLoader
+from ui.panels.table_model import (RowTableModel, Column, ActionButton, ButtonDelegate,
+                                   create_table_view)
+
+STATUS_COLORS = {
+    'Pending': Qt.GlobalColor.darkYellow,
+    'Confirmed': Qt.GlobalColor.darkBlue,
+    'Shipped': Qt.GlobalColor.darkCyan,
+    'Delivered': Qt.GlobalColor.darkGreen,
+    'Cancelled': Qt.GlobalColor.darkRed,
+}
 
 class SalesPanel(QWidget):
+    PAGE_SIZE = 100
+    
     def __init__(self, db, user_role):
         super().__init__()
         self.db = db
         self.user_role = user_role
         self.order_model = OrderModel(db)
         self.user_model = UserModel(db)
+        self.next_cursor = None
+        self.date_filtered = False
         self.init_ui()
+        self.loader = DataLoader(self, self.orders_table)
         self.load_orders()
     
     def init_ui(self):
@@ -186,21 +202,41 @@ class SalesPanel(QWidget):
         layout.addLayout(stats_layout)
         layout.addSpacing(20)
         
-        # Orders table
-        self.orders_table = QTableWidget()
+        # Orders table: rows are formatted only when painted, actions drawn by a delegate
+        columns = [
+            Column("Order ID", 'id'),
+            Column("Customer", 'customer_display'),
+            Column("Date", display=self.format_order_date, sort_key=lambda o: self.order_datetime(o)),
+            Column("Items", display=lambda o: f"{o.get('item_count', 0)} item{'s' if o.get('item_count', 0) != 1 else ''}",
+                   sort_key=lambda o: o.get('item_count', 0)),
+            Column("Amount", display=lambda o: f"₱{float(o['total_amount']):.2f}",
+                   sort_key=lambda o: float(o['total_amount'])),
+            Column("Status", 'status', foreground=lambda o: STATUS_COLORS.get(o['status'])),
+            Column("Payment", display=lambda o: o.get('payment_method') or 'N/A'),
+        ]
         if self.user_role == 'admin':
-            self.orders_table.setColumnCount(9)
-            self.orders_table.setHorizontalHeaderLabels([
-                "Order ID", "Customer", "Date", "Items", "Amount", "Status", "Payment", "Staff", "Actions"
-            ])
-        else:
-            self.orders_table.setColumnCount(8)
-            self.orders_table.setHorizontalHeaderLabels([
-                "Order ID", "Customer", "Date", "Items", "Amount", "Status", "Payment", "Actions"
-            ])
+            columns.append(Column("Staff", 'staff_display'))
+        columns.append(Column("Actions", sort_key=lambda o: o['status']))
+        
+        self.orders_model = RowTableModel(columns, self)
+        self.orders_model.fetcher = self.load_more_orders
+        self.orders_table, self.orders_proxy = create_table_view(self.orders_model)
+        self.orders_table.setItemDelegateForColumn(len(columns) - 1, ButtonDelegate([
+            ActionButton("View", '#3498db', self.view_order_details),
+            ActionButton("Confirm", '#28a745',
+                         lambda o: self.update_order_status(o['id'], 'Confirmed'),
+                         visible=lambda o: o['status'] == 'Pending'),
+            ActionButton(lambda o: 'Shipped' if o['status'] == 'Confirmed' else 'Delivered', '#17a2b8',
+                         lambda o: self.update_order_status(
+                             o['id'], 'Shipped' if o['status'] == 'Confirmed' else 'Delivered'),
+                         visible=lambda o: o['status'] in ['Confirmed', 'Shipped']),
+            ActionButton("Cancel", '#dc3545',
+                         lambda o: self.update_order_status(o['id'], 'Cancelled'),
+                         visible=lambda o: o['status'] in ['Pending', 'Confirmed']),
+        ], self.orders_table))
         
         self.orders_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e1e1e1;
                 border-radius: 8px;
                 background: white;
@@ -235,17 +271,57 @@ class SalesPanel(QWidget):
         self.setLayout(layout)
     
     def load_orders(self):
-        orders = self.order_model.get_all_orders()
-        self.display_orders(orders)
-        self.update_stats(orders)
+        # Stats are aggregated in SQL; the table starts with the newest page only
+        self.loader.load('stats', self.order_model.get_order_stats, on_result=self.show_stats)
+        self.date_filtered = False
+        self.reload_orders()
     
-    def display_orders(self, orders):
-        self.orders_table.setRowCount(len(orders))
-        
-        for row, order in enumerate(orders):
-            # Order ID
-            self.orders_table.setItem(row, 0, QTableWidgetItem(str(order['id'])))
-            
+    def reload_orders(self):
+        # Back to page 1; sharing the 'orders' key drops any page still loading
+        self.next_cursor = None
+        self.orders_model.has_more = False
+        self.orders_model.set_rows([])
+        self.load_more_orders()
+    
+    def selected_status(self):
+        status = self.status_combo.currentText()
+        return None if status == "All" else status
+    
+    def show_stats(self, stats):
+        self.total_sales_label.setText(f"Total Sales: ₱{stats['total_sales']:,.2f}")
+        self.total_orders_label.setText(f"Total Orders: {stats['total_orders']}")
+        self.pending_orders_label.setText(f"Pending Orders: {stats['pending_orders']}")
+    
+    def load_more_orders(self):
+        # Called again by the view (through the model's fetcher) as it scrolls to the end
+        self.loader.load('orders', self.fetch_orders_page, self.next_cursor, self.selected_status(),
+                         on_result=self.on_orders_page)
+    
+    def fetch_orders_page(self, after, status):
+        # Runs on a worker thread: nothing here may touch widgets
+        page = self.order_model.get_orders_page(page_size=self.PAGE_SIZE, after=after, status=status)
+        self.prepare_orders(page['rows'])
+        return page
+    
+    def on_orders_page(self, page):
+        self.next_cursor = page['next_cursor']
+        self.orders_model.append_rows(page['rows'])
+        self.orders_model.has_more = self.next_cursor is not None
+    
+    def prepare_orders(self, orders):
+        # Resolve everything the rows need up front: one query for item counts and
+        # at most one for any customer/staff names the order query did not join in
+        if orders and 'item_count' not in orders[0]:
+            self.order_model.attach_item_summaries(orders)
+        missing_user_ids = []
+        for order in orders:
+            if order.get('customer_id') and 'customer_first_name' not in order:
+                missing_user_ids.append(order['customer_id'])
+            if order.get('staff_id') and 'staff_first_name' not in order:
+                missing_user_ids.append(order['staff_id'])
+        users = self.user_model.get_users_by_ids(missing_user_ids)
+        
+        for order in orders:
             # Customer Name 
             customer_id = order.get('customer_id')
             customer_name = 'N/A'
@@ -253,149 +329,43 @@ class SalesPanel(QWidget):
                 # Check if customer name is in order data
                 if 'customer_name' in order:
                     customer_name = order['customer_name']
-                elif 'customer_first_name' in order and 'customer_last_name' in order:
-                    customer_name = f"{order.get('customer_first_name', '')} {order.get('customer_last_name', '')}".strip()
+                elif 'customer_first_name' in order:
+                    customer_name = f"{order.get('customer_first_name') or ''} {order.get('customer_last_name') or ''}".strip()
+                    if not customer_name:
+                        customer_name = order.get('customer_email') or 'N/A'
                 else:
-                    # Fetch from database
-                    customer = self.user_model.get_user_by_id(customer_id)
+                    customer = users.get(customer_id)
                     if customer:
-                        customer_name = f"{customer.get('first_name', '')} {customer.get('last_name', '')}".strip()
-                        if not customer_name.strip():
-                            customer_name = customer.get('email', 'N/A')
-            self.orders_table.setItem(row, 1, QTableWidgetItem(customer_name))
-            
-            # Date
-            order_date = order['order_date']
-            if isinstance(order_date, str):
-                order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
-            self.orders_table.setItem(row, 2, QTableWidgetItem(order_date.strftime('%Y-%m-%d %H:%M')))
-            
-            # Items count
-            items = self.order_model.get_order_details(order['id'])
-            items_count = len(items)
-            items_text = f"{items_count} item{'s' if items_count != 1 else ''}"
-            self.orders_table.setItem(row, 3, QTableWidgetItem(items_text))
+                        customer_name = f"{customer.get('first_name') or ''} {customer.get('last_name') or ''}".strip()
+                        if not customer_name:
+                            customer_name = customer.get('email') or 'N/A'
+            order['customer_display'] = customer_name
             
-            # Amount
-            self.orders_table.setItem(row, 4, QTableWidgetItem(f"₱{float(order['total_amount']):.2f}"))
-            
-            # Status
-            status_item = QTableWidgetItem(order['status'])
-            if order['status'] == 'Pending':
-                status_item.setForeground(Qt.GlobalColor.darkYellow)
-            elif order['status'] == 'Confirmed':
-                status_item.setForeground(Qt.GlobalColor.darkBlue)
-            elif order['status'] == 'Shipped':
-                status_item.setForeground(Qt.GlobalColor.darkCyan)
-            elif order['status'] == 'Delivered':
-                status_item.setForeground(Qt.GlobalColor.darkGreen)
-            elif order['status'] == 'Cancelled':
-                status_item.setForeground(Qt.GlobalColor.darkRed)
-            self.orders_table.setItem(row, 5, status_item)
-            
-            # Payment Method
-            self.orders_table.setItem(row, 6, QTableWidgetItem(order.get('payment_method', 'N/A')))
-            
-            col_offset = 0
-            if self.user_role == 'admin':
-                # Staff Name 
-                staff_id = order.get('staff_id')
-                staff_name = "Not Assigned"
-                if staff_id:
-                    staff = self.user_model.get_user_by_id(staff_id)
+            # Staff Name 
+            staff_id = order.get('staff_id')
+            staff_name = "Not Assigned"
+            if staff_id:
+                if 'staff_first_name' in order:
+                    staff_name = f"{order.get('staff_first_name') or ''} {order.get('staff_last_name') or ''}".strip()
+                else:
+                    staff = users.get(staff_id)
                     if staff:
-                        staff_name = f"{staff.get('first_name', '')} {staff.get('last_name', '')}".strip()
-                        if not staff_name.strip():
-                            staff_name = staff.get('email', 'Not Assigned')
-                
-                self.orders_table.setItem(row, 7, QTableWidgetItem(staff_name))
-                col_offset = 1
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_widget.setStyleSheet("background-color: white;")
-            actions_layout = QHBoxLayout()
-            actions_layout.setContentsMargins(5, 5, 5, 5)
-            
-            view_btn = QPushButton("View")
-            view_btn.setMinimumHeight(20)
-            view_btn.setStyleSheet("""
-                QPushButton {
-                    background: #3498db;
-                    color: white;
-                    padding: 5px 10px;
-                    border: none;
-                    border-radius: 5px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background: #2980b9;
-                }
-            """)
-            view_btn.clicked.connect(lambda checked, o=order: self.view_order_details(o))
-            actions_layout.addWidget(view_btn)
-            
-            if order['status'] == 'Pending':
-                confirm_btn = QPushButton("Confirm")
-                confirm_btn.setMinimumHeight(20)
-                confirm_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #28a745;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #218838;
-                    }
-                """)
-                confirm_btn.clicked.connect(lambda checked, o=order: self.update_order_status(o['id'], 'Confirmed'))
-                actions_layout.addWidget(confirm_btn)
-            
-            if order['status'] in ['Confirmed', 'Shipped']:
-                next_status = 'Shipped' if order['status'] == 'Confirmed' else 'Delivered'
-                status_btn = QPushButton(next_status)
-                status_btn.setMinimumHeight(20)
-                status_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #17a2b8;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #138496;
-                    }
-                """)
-                status_btn.clicked.connect(lambda checked, o=order, s=next_status: self.update_order_status(o['id'], s))
-                actions_layout.addWidget(status_btn)
-            
-            if order['status'] in ['Pending', 'Confirmed']:
-                cancel_btn = QPushButton("Cancel")
-                cancel_btn.setMinimumHeight(20)
-                cancel_btn.setStyleSheet("""
-                    QPushButton {
-                        background: #dc3545;
-                        color: white;
-                        padding: 5px 10px;
-                        border: none;
-                        border-radius: 5px;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background: #c82333;
-                    }
-                """)
-                cancel_btn.clicked.connect(lambda checked, o=order: self.update_order_status(o['id'], 'Cancelled'))
-                actions_layout.addWidget(cancel_btn)
-            
-            actions_layout.addStretch()
-            actions_widget.setLayout(actions_layout)
-            self.orders_table.setCellWidget(row, 7 + col_offset, actions_widget)
+                        staff_name = f"{staff.get('first_name') or ''} {staff.get('last_name') or ''}".strip()
+                        if not staff_name:
+                            staff_name = staff.get('email') or 'Not Assigned'
+                if not staff_name:
+                    staff_name = "Not Assigned"
+            order['staff_display'] = staff_name
+        return orders
+    
+    def order_datetime(self, order):
+        order_date = order['order_date']
+        if isinstance(order_date, str):
+            order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
+        return order_date
+    
+    def format_order_date(self, order):
+        return self.order_datetime(order).strftime('%Y-%m-%d %H:%M')
     
     def update_stats(self, orders):
         total_sales = sum(float(order['total_amount']) for order in orders)
@@ -407,33 +377,30 @@ class SalesPanel(QWidget):
         self.pending_orders_label.setText(f"Pending Orders: {pending_orders}")
     
     def filter_orders(self, status):
-        if status == "All":
-            for row in range(self.orders_table.rowCount()):
-                self.orders_table.setRowHidden(row, False)
+        # Filtered in the query: a paged list only holds the rows scrolled in so far
+        if self.date_filtered:
+            self.apply_date_filter()
         else:
-            for row in range(self.orders_table.rowCount()):
-                status_item = self.orders_table.item(row, 5)
-                if status_item and status_item.text() == status:
-                    self.orders_table.setRowHidden(row, False)
-                else:
-                    self.orders_table.setRowHidden(row, True)
+            self.reload_orders()
     
     def apply_date_filter(self):
         start_date = self.start_date.date().toString('yyyy-MM-dd')
         end_date = self.end_date.date().toString('yyyy-MM-dd')
         
-        all_orders = self.order_model.get_all_orders()
-        filtered_orders = []
-        
-        for order in all_orders:
-            order_date = order['order_date']
-            if isinstance(order_date, str):
-                order_date = datetime.strptime(order_date, '%Y-%m-%d %H:%M:%S')
-            
-            if start_date <= order_date.strftime('%Y-%m-%d') <= end_date:
-                filtered_orders.append(order)
-        
-        self.display_orders(filtered_orders)
+        # Only orders inside the range come over the wire; no further pages to fetch.
+        # Sharing the 'orders' key drops any page still loading for the unfiltered list
+        self.date_filtered = True
+        self.orders_model.has_more = False
+        self.loader.cancel('stats')
+        self.loader.load('orders', self.fetch_orders_in_range, start_date, end_date,
+                         self.selected_status(), on_result=self.on_orders_in_range)
+    
+    def fetch_orders_in_range(self, start_date, end_date, status):
+        return self.prepare_orders(
+            self.order_model.get_orders_in_range(start_date, end_date, status) or [])
+    
+    def on_orders_in_range(self, filtered_orders):
+        self.orders_model.set_rows(filtered_orders)
         self.update_stats(filtered_orders)
     
     def view_order_details(self, order):
@@ -479,8 +446,7 @@ class SalesPanel(QWidget):
         reply = msg_box.exec()
 
         if reply == QMessageBox.StandardButton.Yes:
-            query = "UPDATE orders SET status = %s WHERE id = %s"
-            if self.db.execute_query(query, (new_status, order_id)):
+            if self.order_model.update_order_status(order_id, new_status):
                 success_msg = QMessageBox(self)
                 success_msg.setWindowTitle("Success")
                 success_msg.setText(f"Order status updated to {new_status}")
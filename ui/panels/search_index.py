@@ -0,0 +1,68 @@
+import re
+from bisect import bisect_left, insort
+
+# Fields the POS search looks at
+SEARCH_FIELDS = ('name', 'category', 'species', 'breed')
+
+
+def tokenize(text):
+    return re.findall(r"\w+", str(text).lower())
+
+
+class SearchIndex:
+    """Token -> item keys, with the tokens kept sorted for prefix lookups"""
+
+    def __init__(self):
+        self.postings = {}
+        self.tokens = []
+        self.keys_tokens = {}
+
+    def rebuild(self, items):
+        # items: iterable of (key, record)
+        self.postings = {}
+        self.keys_tokens = {}
+        for key, record in items:
+            tokens = self._record_tokens(record)
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(key)
+            self.keys_tokens[key] = tokens
+        self.tokens = sorted(self.postings)
+
+    def update(self, key, record):
+        self.discard(key)
+        tokens = self._record_tokens(record)
+        for token in tokens:
+            if token not in self.postings:
+                self.postings[token] = set()
+                insort(self.tokens, token)
+            self.postings[token].add(key)
+        self.keys_tokens[key] = tokens
+
+    def discard(self, key):
+        # Emptied tokens stay in the sorted list; lookups skip them
+        for token in self.keys_tokens.pop(key, ()):
+            self.postings[token].discard(key)
+
+    def search(self, text):
+        # Every word typed must be the start of some token of the item; None means no filter
+        terms = tokenize(text)
+        if not terms:
+            return None
+        matches = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            keys = set()
+            position = bisect_left(self.tokens, term)
+            while position < len(self.tokens) and self.tokens[position].startswith(term):
+                keys |= self.postings[self.tokens[position]]
+                position += 1
+            matches = keys if matches is None else matches & keys
+            if not matches:
+                break
+        return matches
+
+    def _record_tokens(self, record):
+        tokens = set()
+        for field in SEARCH_FIELDS:
+            if record.get(field):
+                tokens.update(tokenize(record[field]))
+        return tokens
@@ -7,6 +7,7 @@ from PyQt6.QtCore import Qt, QDateTime
 from datetime import datetime
 from models.surrender_model import SurrenderModel
 from models.pet_model import PetModel
+from ui.panels.data_loader import DataLoader
 
 class SurrenderManagementPanel(QWidget):
     def __init__(self, db, user_type='admin'):
@@ -16,6 +17,7 @@ class SurrenderManagementPanel(QWidget):
         self.surrender_model = SurrenderModel(db)
         self.pet_model = PetModel(db)
         self.init_ui()
+        self.loader = DataLoader(self, self.requests_table)
         self.load_surrender_requests()
     
     def init_ui(self):
@@ -231,23 +233,24 @@ class SurrenderManagementPanel(QWidget):
         self.setLayout(layout)
     
     def load_surrender_requests(self):
-        try:
-            # Get filter status
-            status_filter = self.status_combo.currentText()
-            status = None if status_filter == "All" else status_filter
-            
-            # Get all surrender requests using the model
-            requests = self.surrender_model.get_all_surrender_requests(status)
-            
-            if requests is False:
-                QMessageBox.warning(self, "Error", "Failed to load surrender requests.")
-                return
-            
-            self.display_requests(requests)
-            self.update_stats(requests)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load surrender requests: {str(e)}")
+        # Get filter status
+        status_filter = self.status_combo.currentText()
+        status = None if status_filter == "All" else status_filter
+        
+        # A newer filter replaces any request still loading
+        self.loader.load('requests', self.surrender_model.get_all_surrender_requests, status,
+                         on_result=self.on_requests_loaded, on_error=self.on_requests_failed)
+    
+    def on_requests_loaded(self, requests):
+        if requests is False:
+            QMessageBox.warning(self, "Error", "Failed to load surrender requests.")
+            return
+        
+        self.display_requests(requests)
+        self.update_stats(requests)
+    
+    def on_requests_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to load surrender requests: {message}")
     
     def display_requests(self, requests):
         self.requests_table.setRowCount(len(requests))
@@ -474,11 +477,10 @@ class SurrenderManagementPanel(QWidget):
                         
                         # Optional: Update surrender request with the new pet ID
                         try:
-                            # Get the last inserted pet ID
-                            pet_id_query = "SELECT LAST_INSERT_ID() as pet_id"
-                            pet_id_result = self.db.execute_query(pet_id_query)
-                            if pet_id_result and pet_id_result[0]['pet_id']:
-                                new_pet_id = pet_id_result[0]['pet_id']
+                            # add_pet returns the inserted pet ID; LAST_INSERT_ID() would
+                            # depend on which pooled connection the next query lands on
+                            if pet_result and pet_result is not True:
+                                new_pet_id = pet_result
                                 # Update surrender request with pet_id
                                 update_query = "UPDATE surrender_requests SET pet_id = %s WHERE id = %s"
                                 self.db.execute_query(update_query, (new_pet_id, request['id']))
@@ -3,9 +3,10 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QComboBox, QMessageBox, QHeaderView, QDialog,
                              QFormLayout, QDialogButtonBox, QTextEdit,
                              QLineEdit, QSpinBox, QGroupBox)
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
 from models.surrender_model import SurrenderModel
+from ui.panels.data_loader import DataLoader
 
 class SurrenderPanel(QWidget):
     def __init__(self, db, user_id):
@@ -14,7 +15,8 @@ class SurrenderPanel(QWidget):
         self.user_id = user_id
         self.surrender_model = SurrenderModel(db)
         self.init_ui()
-        QTimer.singleShot(0, self.load_surrender_requests) 
+        self.loader = DataLoader(self, self.requests_table)
+        self.load_surrender_requests()
     
     def init_ui(self):
         self.setStyleSheet("background-color: #f9d162;")
@@ -77,7 +79,11 @@ class SurrenderPanel(QWidget):
         self.setLayout(layout)
     
     def load_surrender_requests(self):
-        requests = self.surrender_model.get_surrender_requests_by_customer(self.user_id)
+        self.loader.load('requests', self.surrender_model.get_surrender_requests_by_customer,
+                         self.user_id, on_result=self.display_requests)
+    
+    def display_requests(self, requests):
+        requests = requests or []
         self.requests_table.setRowCount(len(requests))
     
         for row, request in enumerate(requests):
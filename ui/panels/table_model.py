@@ -0,0 +1,246 @@
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                          QEvent, QRect, QSize, QTimer)
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate, QTableView, QAbstractItemView, QHeaderView
+
+# The row dict behind a cell, for delegates and click handlers
+ROW_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class Column:
+    def __init__(self, title, key=None, display=None, sort_key=None, foreground=None,
+                 background=None, tooltip=None, align=None):
+        self.title = title
+        self.key = key
+        self.display = display
+        self.sort_key = sort_key
+        self.foreground = foreground
+        self.background = background
+        self.tooltip = tooltip
+        self.align = align
+
+    def text(self, row):
+        if self.display is not None:
+            return self.display(row)
+        if self.key is None:
+            return ''
+        value = row.get(self.key)
+        return '' if value is None else str(value)
+
+    def sort_value(self, row):
+        if self.sort_key is not None:
+            return self.sort_key(row)
+        if self.key is not None:
+            return row.get(self.key)
+        return self.text(row)
+
+
+class RowTableModel(QAbstractTableModel):
+    """Serves a list of row dicts to a QTableView, formatting cells only when they are painted"""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.rows = []
+        # Set fetcher and has_more to let the view pull further pages as it scrolls
+        self.fetcher = None
+        self.has_more = False
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = list(rows or [])
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        rows = list(rows or [])
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def row_at(self, row):
+        return self.rows[row]
+
+    def sort_value(self, index):
+        return self.columns[index.column()].sort_value(self.rows[index.row()])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = self.columns[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return column.text(row)
+        if role == ROW_ROLE:
+            return row
+        if role == Qt.ItemDataRole.ForegroundRole and column.foreground is not None:
+            color = column.foreground(row)
+            return QColor(color) if color is not None else None
+        if role == Qt.ItemDataRole.BackgroundRole and column.background is not None:
+            color = column.background(row)
+            return QColor(color) if color is not None else None
+        if role == Qt.ItemDataRole.ToolTipRole and column.tooltip is not None:
+            return column.tooltip(row)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column.align is not None:
+            return column.align
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section].title
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetcher is not None and self.has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        # Cleared until the page arrives so scrolling cannot request it twice
+        self.has_more = False
+        self.fetcher()
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """Sorts on each column's raw value and filters rows through named predicates"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filters = {}
+        self.setDynamicSortFilter(True)
+
+    def set_filter(self, name, predicate):
+        # predicate(row) -> bool; None removes the filter
+        if predicate is None:
+            self.filters.pop(name, None)
+        else:
+            self.filters[name] = predicate
+        self.invalidateFilter()
+
+    def row_at(self, proxy_row):
+        source = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().row_at(source.row())
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.filters:
+            return True
+        row = self.sourceModel().row_at(source_row)
+        return all(predicate(row) for predicate in self.filters.values())
+
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        left_value = model.sort_value(left)
+        right_value = model.sort_value(right)
+        if left_value is None or right_value is None:
+            return left_value is None and right_value is not None
+        try:
+            return left_value < right_value
+        except TypeError:
+            return str(left_value) < str(right_value)
+
+
+def text_filter(text, columns):
+    # Case-insensitive match of text against the displayed value of any of the columns
+    text = text.strip().lower()
+    if not text:
+        return None
+    return lambda row: any(text in column.text(row).lower() for column in columns)
+
+
+class ActionButton:
+    def __init__(self, label, color, callback, visible=None):
+        # label may be a string or a function of the row; visible(row) hides the button
+        self.label = label
+        self.color = color
+        self.callback = callback
+        self.visible = visible
+
+    def label_for(self, row):
+        return self.label(row) if callable(self.label) else self.label
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Paints a row's action buttons and dispatches clicks, without a widget per row"""
+
+    PADDING = 5
+    SPACING = 5
+
+    def __init__(self, buttons, parent=None):
+        super().__init__(parent)
+        self.buttons = buttons
+
+    def _layout(self, rect, row, metrics):
+        x = rect.left() + self.PADDING
+        height = min(rect.height() - 2 * self.PADDING, 26)
+        y = rect.top() + (rect.height() - height) // 2
+        for button in self.buttons:
+            if button.visible is not None and not button.visible(row):
+                continue
+            label = button.label_for(row)
+            width = metrics.horizontalAdvance(label) + 20
+            yield button, label, QRect(x, y, width, height)
+            x += width + self.SPACING
+
+    def _font(self, option):
+        font = QFont(option.font)
+        font.setPixelSize(12)
+        return font
+
+    def paint(self, painter, option, index):
+        row = index.data(ROW_ROLE)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(option.rect, QColor('white'))
+        font = self._font(option)
+        painter.setFont(font)
+        for button, label, rect in self._layout(option.rect, row, QFontMetrics(font)):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(button.color))
+            painter.drawRoundedRect(rect, 5, 5)
+            painter.setPen(QColor('white'))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        row = index.data(ROW_ROLE)
+        font = self._font(option)
+        width = self.PADDING
+        for button, label, rect in self._layout(QRect(0, 0, 0, 36), row, QFontMetrics(font)):
+            width = rect.right() + self.SPACING
+        return QSize(width + self.PADDING, 36)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() != QEvent.Type.MouseButtonRelease
+                or event.button() != Qt.MouseButton.LeftButton):
+            return False
+        row = index.data(ROW_ROLE)
+        metrics = QFontMetrics(self._font(option))
+        for button, label, rect in self._layout(option.rect, row, metrics):
+            if rect.contains(event.position().toPoint()):
+                # Run after the event returns: handlers often reload the model under us
+                QTimer.singleShot(0, lambda callback=button.callback, r=row: callback(r))
+                return True
+        return False
+
+
+def create_table_view(model, proxy=None, row_height=40):
+    view = QTableView()
+    proxy = proxy or RowFilterProxyModel(view)
+    proxy.setSourceModel(model)
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    # Uniform row heights let the view skip measuring rows it is not showing
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.verticalHeader().setDefaultSectionSize(row_height)
+    view.verticalHeader().setVisible(False)
+    return view, proxy
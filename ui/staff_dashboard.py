@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QStackedWidget, QFrame,
+                             QLabel, QPushButton, QFrame,
                              QMessageBox, QSizePolicy)
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QFont, QIcon, QPalette, QBrush, QPixmap
@@ -12,6 +12,7 @@ from ui.panels.attendance_panel import AttendancePanel
 from ui.panels.customer_management_panel import CustomerManagementPanel
 from ui.panels.pos_panel import POSPanel
 from ui.panels.surrender_management_panel import SurrenderManagementPanel
+from ui.lazy_panel_stack import LazyPanelStack
 
 class StaffDashboard(QMainWindow):
     logout_signal = pyqtSignal()
@@ -211,7 +212,7 @@ class StaffDashboard(QMainWindow):
     
     def create_main_content(self, main_layout):
         # Create stacked widget for panels
-        self.stacked_panels = QStackedWidget()
+        self.stacked_panels = LazyPanelStack()
         self.stacked_panels.setStyleSheet("""
             QStackedWidget {
                 background: #f8f9fa;
@@ -219,24 +220,18 @@ class StaffDashboard(QMainWindow):
             }
         """)
         
-        # Create staff-specific panels
-        self.pet_panel = PetManagementPanel(self.db, 'staff')
-        self.inventory_panel = InventoryPanel(self.db, 'staff')
-        self.pos_panel = POSPanel(self.db, self.user_id, 'staff')
-        self.appointment_panel = AppointmentPanel(self.db, 'staff')
-        self.sales_panel = SalesPanel(self.db, 'staff')
-        self.customer_panel = CustomerManagementPanel(self.db)
-        self.attendance_panel = AttendancePanel(self.db, self.user_id)
-        self.surrender_panel = SurrenderManagementPanel(self.db, self.user_id) 
+        # Panels are built on first visit, so login only waits for the landing panel
+        self.stacked_panels.register('pet_management', lambda: PetManagementPanel(self.db, 'staff'))
+        self.stacked_panels.register('inventory', lambda: InventoryPanel(self.db, 'staff'))
+        self.stacked_panels.register('pos', lambda: POSPanel(self.db, self.user_id, 'staff'))
+        self.stacked_panels.register('appointments', lambda: AppointmentPanel(self.db, 'staff'))
+        self.stacked_panels.register('sales', lambda: SalesPanel(self.db, 'staff'))
+        self.stacked_panels.register('customer_management', lambda: CustomerManagementPanel(self.db))
+        self.stacked_panels.register('attendance', lambda: AttendancePanel(self.db, self.user_id))
+        self.stacked_panels.register('surrender', lambda: SurrenderManagementPanel(self.db, self.user_id))
         
-        self.stacked_panels.addWidget(self.pet_panel)
-        self.stacked_panels.addWidget(self.inventory_panel)
-        self.stacked_panels.addWidget(self.pos_panel)
-        self.stacked_panels.addWidget(self.appointment_panel)
-        self.stacked_panels.addWidget(self.sales_panel)
-        self.stacked_panels.addWidget(self.customer_panel)
-        self.stacked_panels.addWidget(self.attendance_panel)
-        self.stacked_panels.addWidget(self.surrender_panel) 
+        self.stacked_panels.show_panel('pet_management')
+        self.stacked_panels.prefetch(['pos', 'appointments'])
         
         main_layout.addWidget(self.stacked_panels, 1)
     
@@ -252,19 +247,7 @@ class StaffDashboard(QMainWindow):
         button.setChecked(True)
         
         # Switch to corresponding panel
-        panel_map = {
-            'pet_management': 0,
-            'inventory': 1,
-            'pos': 2,
-            'appointments': 3,
-            'sales': 4,
-            'customer_management': 5,
-            'attendance': 6,
-            'surrender': 7  
-        }
-        
-        if panel_name in panel_map:
-            self.stacked_panels.setCurrentIndex(panel_map[panel_name])
+        self.stacked_panels.show_panel(panel_name)
     
     def logout(self):
         reply = QMessageBox.question(self, 'Confirm Logout', 